@@ -0,0 +1,72 @@
+"""Show an animated loading screen while images load in the background.
+
+The images are loaded by an AssetLoader, on other threads, so this program keeps
+drawing frames while they load: a spinning dot and a progress bar. As soon as the
+background is loaded the scene starts, and the other images appear as they
+finish loading.
+"""
+
+import math
+from pathlib import Path
+
+import pygame
+
+from jtlgames.assets import ASSET_LOADED, AssetLoader
+
+ASSETS = Path(__file__).parent / 'assets'
+WIDTH, HEIGHT = 600, 400
+
+
+def draw_loading_screen(screen, progress, t):
+    """Draws a dot going around a circle, and a bar filled to progress."""
+    screen.fill((0, 0, 0))
+    angle = t / 150
+    center = (WIDTH // 2 + 30 * math.cos(angle), HEIGHT // 2 - 40 + 30 * math.sin(angle))
+    pygame.draw.circle(screen, (255, 255, 255), center, 8)
+    pygame.draw.rect(screen, (255, 255, 255), (100, HEIGHT // 2 + 20, WIDTH - 200, 20), 1)
+    pygame.draw.rect(screen, (0, 200, 0), (102, HEIGHT // 2 + 22, (WIDTH - 204) * progress, 16))
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    clock = pygame.time.Clock()
+
+    loader = AssetLoader()
+    for path in sorted(ASSETS.glob('*')):
+        loader.image(path.stem, path)
+
+    background = None
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == ASSET_LOADED:
+                print(f"Loaded {event.name} ({event.done} of {event.total})")
+
+        loader.update(max_ms=5)
+
+        if background is None and loader.ready('background'):
+            background = pygame.transform.scale(loader['background'], (WIDTH, HEIGHT))
+
+        if background is None:
+            draw_loading_screen(screen, loader.progress, pygame.time.get_ticks())
+        else:
+            screen.blit(background, (0, 0))
+            # Draw the images that have finished loading in a row
+            x = 10
+            for name, future in loader.futures.items():
+                if name != 'background' and future.done() and not future.exception():
+                    screen.blit(future.result(), (x, HEIGHT - 100))
+                    x += future.result().get_width() + 10
+
+        pygame.display.flip()
+        clock.tick(60)
+
+    loader.shutdown(wait=False)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
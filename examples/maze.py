@@ -1,61 +1,24 @@
-from mazelib import Maze
-from mazelib.generate.Prims import Prims
-from mazelib.generate.DungeonRooms import DungeonRooms
-from dataclasses import dataclass
-from guizero import App, Waffle
-import numpy as np
-from typing import List, Tuple
-from mazelib.solve.BacktrackingSolver import BacktrackingSolver
-
-
-
-def make_maze(x_size=15, y_size=15):
-    """Generate the maze using the maze library"""
-    m = Maze()
-    m.generator =DungeonRooms(x_size, y_size, rooms=[[(3,3), (7,7)], [(21,21), (28,28)]])
-    m.generate()
-    m.generate_entrances()
-    # copy the grid to a numpy array
-
-    m.solver = BacktrackingSolver()
-    print(m.solve())
-
-    g = np.array(m.grid)
-    
-    g[m.start] = 0
-    g[m.end] = 0
+"""Walk from the green start to the red end of a maze with the arrow keys.
 
-    return 2*x_size+1, 2*y_size+1, m, g
+Press S to show the way out from where you are. The maze size can be given on the command line, e.g. `python maze.py 500 500`.
+Big mazes scroll to follow the player.
+"""
 
-x_size, y_size, m, g = make_maze()
-
-for p in m.solutions[0]:   
-    g[p] = 4
-
-
-dim = 11
-pad = 0
-w = (x_size+2)*(dim+pad)
-h = (y_size+2)*(dim+pad)
-
-def build_waffle(app, g, x_size, y_size, dim, pad):
-    """Build the waffle grid based on the maze"""
-
-    waffle = Waffle(app, width=x_size, height=y_size, dim=dim, pad=pad)
-    waffle.set_all("black")  # Set initial grid to black
+import sys
+from dataclasses import dataclass
 
-    colors = ['white', 'black', 'green', 'red', 'blue']
+import pygame
 
-    for (x, y), value in np.ndenumerate(g):
-            waffle.set_pixel(x, y, colors[value]) 
-           
+from jtlgames.maze import END, OPEN, PATH, PLAYER, START, WALL, MazeView, add_entrances, generate
+from jtlgames.pathfinding import PathFinder
 
-    # set the start to gree and the end to red
-    waffle.set_pixel(*m.start, "green")
-    waffle.set_pixel(*m.end, "red")
 
+def make_maze(x_size=15, y_size=15, seed=None):
+    """Generate a maze of x_size by y_size rooms, with a way in and a way out"""
+    g = generate(x_size, y_size, seed)
+    start, end = add_entrances(g)
+    return g, start, end
 
-    return waffle
 
 @dataclass
 class Player:
@@ -74,41 +37,65 @@ class Player:
         return f"Player({self.x}, {self.y})"
 
 
-
-
-app = App("Maze Generator", width=w, height=h)
-
-waffle = build_waffle(app, g, x_size, y_size, dim, pad)
-
-
-player = Player(*m.start)
-
-waffle.set_pixel(*player.pos, "yellow")  # Place the player
-
-# Function to move the player
-def move_player(event):
-    
-    new_x, new_y = player.pos
-    key = event.tk_event.keysym
-
-    if key == "Up":
-        new_y -= 1
-    elif key == "Down":
-        new_y += 1
-    elif key == "Left":
-        new_x -= 1
-    elif key == "Right":
-        new_x += 1
-    
-    p = g[new_x][new_y]
-
-    # Ensure the player stays within bounds and moves only on white spaces
-    if 0 <= new_x < x_size and 0 <= new_y < y_size and p == 0:
-        waffle.set_pixel(*player.pos, "white")  # Clear previous position
-        waffle.set_pixel(new_x, new_y, "yellow")  # Move to new position
-        player.move(new_x, new_y)
-
-# Bind keys to move the player
-app.when_key_pressed = move_player
-
-app.display()
+def main(x_size=15, y_size=15):
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    pygame.display.set_caption("Maze")
+
+    g, start, end = make_maze(x_size, y_size)
+    w, h = g.shape
+
+    # Fit small mazes on the screen, and scroll big ones
+    dim = max(4, min(800 // w, 600 // h, 20))
+    view = MazeView(g, cell_size=dim)
+    cols, rows = 800 // dim, 600 // dim
+
+    player = Player(*start)
+    marks = {start: START, end: END}
+    finder = PathFinder(g == WALL)
+    solution = []
+    view.set_cell(*player.pos, PLAYER)  # Place the player
+
+    moves = {pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1), pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0)}
+
+    clock = pygame.time.Clock()
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_s:
+                # Show the way out, or hide it again
+                for p in solution:
+                    view.set_cell(*p, marks.get(p, OPEN))
+                if solution:
+                    solution = []
+                else:
+                    solution = finder.path(player.pos, end)[1:-1]
+                    for p in solution:
+                        view.set_cell(*p, PATH)
+            elif event.type == pygame.KEYDOWN and event.key in moves:
+                dx, dy = moves[event.key]
+                new_x, new_y = player.x + dx, player.y + dy
+
+                # Ensure the player stays within bounds and moves only on open spaces
+                if 0 <= new_x < w and 0 <= new_y < h and g[new_x, new_y] != WALL:
+                    view.set_cell(*player.pos, PATH if player.pos in solution else marks.get(player.pos, OPEN))
+                    player.move(new_x, new_y)
+                    view.set_cell(*player.pos, PLAYER)
+                    if player.pos == end:
+                        pygame.display.set_caption("Maze: you made it out!")
+
+        # Keep the player in the middle of the screen
+        camera = (min(max(player.x - cols // 2, 0), max(w - cols, 0)),
+                  min(max(player.y - rows // 2, 0), max(h - rows, 0)))
+        screen.fill((0, 0, 0))
+        view.draw(screen, camera)
+        pygame.display.flip()
+        clock.tick(60)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
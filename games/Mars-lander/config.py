@@ -12,10 +12,26 @@ GREEN = (100, 255, 100)
 
 # Landing Pads
 NUMBER_OF_PADS = 3
+# Area the pad centers are placed in, (x0, y0, x1, y1) with x1 and y1 excluded
+PAD_AREA = (79, HEIGHT - 200, WIDTH - 79, HEIGHT)
 
 # Obstacles
 MIN_OBSTACLES = 5
 MAX_OBSTACLES = 15
+OBSTACLE_AREA = (0, HEIGHT - 500, WIDTH, HEIGHT)
+# The images in resources/obstacles, without .png
+OBSTACLES_LIST = [
+    'building_dome',
+    'building_station_NE',
+    'building_station_SW',
+    'pipe_ramp_NE',
+    'pipe_stand_SE',
+    'rocks_NW',
+    'rocks_ore_SW',
+    'rocks_small_SE',
+    'satellite_SE',
+    'satellite_SW'
+]
 
 # Meteors
 MIN_METEORS = 5
@@ -35,3 +51,7 @@ NO_COLLISION_DURATION = 60
 # Chance of a failure in every frame e.g. if set to 0.001 lander should fail once every 1000 frames (game runs @ 30fps)
 FAILURE_CHANCE = 0.001
 FAILURE_DURATION = 60  # frames
+
+# Ticks of the game per second of mission time. The game does not cap its frame rate, as it
+# never has, so this is only what the time on the instruments counts in.
+TICKS_PER_SECOND = 30
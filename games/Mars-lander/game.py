@@ -1,9 +1,19 @@
-import sys
+import collections
+import logging
+from jtlgames.images import load_image
+from jtlgames.layers import StaticLayers
+from menus import *
 from lander import *
 from pad import *
 from obstacle import *
 from meteor import *
 from config import *
+from placement import *
+
+# Game states, see Game.step()
+PLAYING, PAUSED, GAME_OVER = 'playing', 'paused', 'game over'
+
+_logger = logging.getLogger(__name__)
 
 
 class Game:
@@ -13,41 +23,74 @@ class Game:
         pygame.display.set_caption('Mars Lander')
         self.ticks, self.time, self.score, self.failure_ticks, self.non_collision_ticks, self.failure = 0, 0, 0, 0, 0, 0
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        self.background_image = pygame.image.load("resources/mars_background.png")
-        self.instruments = pygame.image.load("resources/instruments.png")
-        self.alert_instruments = pygame.image.load("resources/instruments_alert.png")
+        # Images are converted to the display format when they are loaded, see jtlgames.images
+        self.background_image = load_image("resources/mars_background.png")
+        self.instruments = load_image("resources/instruments.png")
+        self.alert_instruments = load_image("resources/instruments_alert.png")
         # I made the thrust_image same resolution as lander image. As a result,
         # they rotate around the same axis and the flame is always where it should be.
-        self.thrust_image_original = pygame.image.load('resources/thrust.png')
+        self.thrust_image_original = load_image('resources/thrust.png')
         self.pad_sprites = pygame.sprite.Group()
         self.obstacle_sprites = pygame.sprite.Group()
         self.meteor_sprites = pygame.sprite.Group()
         self.player_sprite = pygame.sprite.GroupSingle()
+        # The background, pads and obstacles do not move during a mission, so they are drawn once,
+        # and drawn again only when an obstacle is destroyed or a new mission starts.
+        self.static_layers = StaticLayers((WIDTH, HEIGHT))
+        self.static_layers.add('background', lambda surface: surface.blit(self.background_image, (0, 0)))
+        self.static_layers.add('terrain', self.draw_terrain)
         self.lander = Lander()
         self.lander_lives = 0
         self.player_sprite.add(self.lander)
+        self.state = None
+        self.on_continue = None
+        self.running = True
+        # The menus are drawn once here and reused, so pausing only costs a blit.
+        self.pause_menu = Menu((WIDTH, HEIGHT), (255, 255, 255, 128), [
+            ("PAUSED", (500, 600), 50, WHITE),
+            ("Press Enter to continue", (500, 650), 30, WHITE),
+            ("Press ESC to finish game", (500, 680), 30, WHITE),
+        ], keys={pygame.K_RETURN: self.resume, pygame.K_KP_ENTER: self.resume, pygame.K_ESCAPE: self.end_game})
+        self.game_over_menu = Menu((WIDTH, HEIGHT), BLACK, [
+            ("GAME OVER", (500, 600), 50, WHITE),
+            ("Press \"N\" to start a new game", (500, 650), 30, WHITE),
+            ("Press \"ESC\" to exit", (500, 710), 30, WHITE),
+        ], keys={pygame.K_n: self.new_game, pygame.K_ESCAPE: self.quit})
+        self.menu = None
 
     def spawn_pads(self):
         """NUMBER_OF_PADS times spawns a pad randomly on the screen. The pad may be tall or regular.
            It does not overlap with previously spawned pads."""
         self.pad_sprites.empty()
-        while len(self.pad_sprites) < NUMBER_OF_PADS:
-            tall = random.choice([True, False])
-            pad = Pad(random.randrange(79, WIDTH - 79), random.randrange(HEIGHT - 200, HEIGHT), tall=tall)
-            pad_collision = pygame.sprite.spritecollide(pad, self.pad_sprites, False)
-            if not pad_collision:
-                self.pad_sprites.add(pad)
+        sizes = [Pad.image_for(tall).get_size() for tall in (False, True)]
+        for tall, center in self.place_sprites(NUMBER_OF_PADS, sizes, PAD_AREA):
+            self.pad_sprites.add(Pad(*center, tall=bool(tall)))
+        self.static_layers.invalidate('terrain')
 
     def spawn_obstacles(self):
         """NUMBER_OF_OBSTACLES times spawns an obstacle randomly on screen.
            It does not overlap with previously spawned obstacles."""
         self.obstacle_sprites.empty()
         number_of_obstacles = random.randint(MIN_OBSTACLES, MAX_OBSTACLES)
-        while len(self.obstacle_sprites) < number_of_obstacles:
-            obstacle = Obstacle(random.randrange(0, WIDTH), random.randrange(HEIGHT - 500, HEIGHT))
-            obstacle_collision = pygame.sprite.spritecollide(obstacle, self.obstacle_sprites, False)
-            if not obstacle_collision:
-                self.obstacle_sprites.add(obstacle)
+        sizes = [Obstacle.image_for(name).get_size() for name in OBSTACLES_LIST]
+        for kind, center in self.place_sprites(number_of_obstacles, sizes, OBSTACLE_AREA):
+            self.obstacle_sprites.add(Obstacle(*center, OBSTACLES_LIST[kind]))
+        self.static_layers.invalidate('terrain')
+
+    def draw_terrain(self, surface):
+        """Draws the pads and obstacles, the static layer above the background."""
+        self.pad_sprites.draw(surface)
+        self.obstacle_sprites.draw(surface)
+
+    @staticmethod
+    def place_sprites(count, sizes, area):
+        """Picks count non-overlapping positions in area, see placement.Placer. If they do not
+           all fit, the ones that do are used, so a crowded configuration cannot hang the game."""
+        try:
+            return Placer(random).place_many(count, sizes, area)
+        except PlacementError as e:
+            _logger.warning(e)
+            return e.placed
 
     def spawn_meteors(self, count=random.randint(MIN_METEORS, MAX_METEORS), random_height=False):
         """Spawns a number of meteors, defaultsto a random number between MIN_METEORS and MAX_METEORS.
@@ -90,11 +133,31 @@ class Game:
         self.reset_lander("Lander crashed!")
 
     def reset_lander(self, msg=""):
-        """Destroys the current lander object, creates a new instance of lander, pauses the game."""
+        """Destroys the current lander object, creates a new instance of lander, pauses the game.
+           After the pause a new mission starts, or the game is over if the player has no lives left."""
+        self.new_lander()
+        self.pause(msg, then=self.new_mission if self.lander_lives > 0 else self.end_game)
+
+    def new_lander(self):
+        """Replaces the lander with a new one, with full fuel and no damage, at the starting position."""
         self.player_sprite.remove(self.lander)
         self.lander = Lander()
         self.player_sprite.add(self.lander)
-        self.pause(msg)
+
+    def new_game(self):
+        """Starts a new game with a new lander, LANDER_LIVES_START lives and no score."""
+        self.new_lander()
+        self.lander_lives = LANDER_LIVES_START
+        self.score = 0
+        self.new_mission()
+
+    def new_mission(self):
+        """Spawns static sprites and a set of meteors. The game is paused, a message is displayed."""
+        self.spawn_pads()
+        self.spawn_obstacles()
+        self.meteor_sprites.empty()
+        self.spawn_meteors(random_height=True)
+        self.pause("New game")
 
     def lander_failure(self):
         """Unless the lander has already a failure, there is a FAILURE_CHANCE that the lander will suffer a failure
@@ -134,16 +197,14 @@ class Game:
     def show_on_screen(self, string, location, font='Arial', font_size=20, colour=WHITE):
         """Shortcut do display a string on a location, with the possibility
            to modify font-face, font-size, and colour."""
-        msg = pygame.font.SysFont(font, font_size).render(str(string), True, colour)
-        self.screen.blit(msg, location)
+        self.screen.blit(render(string, font_size, colour, font), location)
 
     def update_all_elements(self):
         """Renders background image, draws every group of sprites on the screen and calls update method where necessary.
+           The background, pads and obstacles are drawn with one blit of the static layers.
            If the lander is faulty or uncontrollable, an error message is displayed and red instrument panel
            is rendered. If the lander is fully functional, the panel is grey. Finally, all instruments are displayed."""
-        self.screen.blit(self.background_image, (0, 0))
-        self.pad_sprites.draw(self.screen)
-        self.obstacle_sprites.draw(self.screen)
+        self.static_layers.draw(self.screen)
         self.meteor_sprites.update()
         self.meteor_sprites.draw(self.screen)
         self.player_sprite.update()
@@ -158,160 +219,158 @@ class Game:
             self.screen.blit(self.instruments, (0, 0))
         self.update_lander_meters()
 
-    def pause(self, msg=""):
+    def pause(self, msg="", then=None):
         """Pauses the game. A small 'menu' is displayed on a transparent overlay. The player has two options:
-           press Enter to continue the game, or press ESC to end the current session."""
+           press Enter to continue the game, or press ESC to end the current session. The menu is drawn once,
+           and stays on the screen until the player chooses. When the player continues, then() is called if it
+           is given, otherwise the current mission goes on."""
         pygame.event.clear()
         self.update_all_elements()
-
-        # transparent overlay
-        s = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        s.fill((255, 255, 255, 128))
-        self.screen.blit(s, (0, 0))
-
-        self.show_on_screen(msg, (400, 360), font_size=60, colour=RED)
-        self.show_on_screen("PAUSED", (500, 600), font_size=50)
-        self.show_on_screen("Press Enter to continue", (500, 650), font_size=30)
-        self.show_on_screen("Press ESC to finish game", (500, 680), font_size=30)
-
+        self.pause_menu.draw(self.screen, [(msg, (400, 360), 60, RED)])
         pygame.display.flip()
-        while True:
-            e = pygame.event.wait()
-            if e.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif e.type == pygame.KEYDOWN:
-                if e.key == pygame.K_RETURN or e.key == pygame.K_KP_ENTER:
-                    break
-                elif e.key == pygame.K_ESCAPE:
-                    self.end_game()
+        self.state = PAUSED
+        self.menu = self.pause_menu
+        self.on_continue = then
+
+    def resume(self):
+        """Closes the pause menu, and calls what pause() was given to do next, if anything."""
+        then, self.on_continue = self.on_continue, None
+        self.state = PLAYING
+        self.menu = None
+        if then is not None:
+            then()
 
     def end_game(self):
         """A menu with black background displayed when the player ends the game manually from pause menu or loses every
            life. Previous score is displayed along with a menu which allows the player to start a new game or exit
            the game completely."""
         pygame.event.clear()
-        self.screen.fill(BLACK)
-        self.show_on_screen("GAME OVER", (500, 600), font_size=50)
-        self.show_on_screen("Press \"N\" to start a new game", (500, 650), font_size=30)
-        self.show_on_screen("Press \"ESC\" to exit", (500, 710), font_size=30)
-        self.show_on_screen("SCORE: " + str(self.score), (500, 560), font_size=50)
+        self.game_over_menu.draw(self.screen, [("SCORE: " + str(self.score), (500, 560), 50, WHITE)])
         pygame.display.flip()
+        self.state = GAME_OVER
+        self.menu = self.game_over_menu
 
-        # clears previously pressed key
-        pygame.event.wait()
-        while True:
-            event = pygame.event.wait()
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
-                elif event.key == pygame.K_n:
-                    self.reset_lander()
-                    self.play()
+    def quit(self):
+        """Ends the game loop."""
+        self.running = False
 
     def lander_collided(self, dmg):
         """Deals damage to the lander and makes it immune to environmental collisions for NO_COLLISION_DURATION."""
         self.lander.deal_damage(dmg)
         self.lander.set_no_collision_duration(NO_COLLISION_DURATION)
 
-    def play(self):
-        """"Main game loop."""
+    def handle_event(self, event):
+        """Reacts to one event. While a menu is open, its keys are used: in the pause menu, Enter continues and ESC
+           ends the game, and in the game over menu, N starts a new game and ESC exits. While playing, P pauses."""
+        if event.type == pygame.QUIT:
+            self.quit()
+        elif self.menu is not None:
+            self.menu.handle_event(event)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+            self.pause()
+
+    def tick(self, key):
+        """One tick of a game, with key the state of the keyboard, as from pygame.key.get_pressed()."""
+        # This block denotes one tick of a game.
+        self.update_all_elements()
+        self.replace_off_screen_meteors()
+
+        # when meteor collides with a landing pad, the meteor gets destroyed and replaced.
+        self.spawn_meteors(len(pygame.sprite.groupcollide(self.pad_sprites, self.meteor_sprites, False, True)))
+        # when meteor collides with an obstacle, the meteor gets destroyed and replaced.
+        self.spawn_meteors(
+            len(pygame.sprite.groupcollide(self.obstacle_sprites, self.meteor_sprites, False, True)))
+
+        # right rotation
+        if key[pygame.K_RIGHT] and self.lander.is_controllable() and self.failure != "Right Rotation":
+            self.lander.rotate_right()
+        # left rotation
+        if key[pygame.K_LEFT] and self.lander.is_controllable() and self.failure != "Left Rotation":
+            self.lander.rotate_left()
+        # thrust
+        if key[pygame.K_SPACE] and self.lander.is_controllable() and self.failure != "Thrust" \
+                and self.lander.current_fuel() >= THRUST_COST:
+            self.lander.thrust()
+            # rotates thrust_image so it corresponds to lander sprite, then displays it.
+            thrust_image = pygame.transform.rotozoom(self.thrust_image_original, self.lander.get_rotation(), 1)
+            self.screen.blit(thrust_image, (self.lander.rect.x, self.lander.rect.y))
+
+        # check whether the lander has collided with an obstacle
+        if self.lander.can_collide():
+            # if lander collides with an environmental object: destroys the obstacle/meteor hit,
+            # deals damage, makes lander briefly invincible
+            obstacle_collision = pygame.sprite.spritecollide(self.lander, self.obstacle_sprites, True)
+            if obstacle_collision:
+                self.static_layers.invalidate('terrain')
+                # 10 damage for obstacle collision
+                self.lander_collided(10)
+            # If a meteor is hit by the player, it is not replaced.
+            # This is done on purpose as it lowers the game's difficulty
+            # as the lander gets damaged. Otherwise it was too complicated to land safely.
+            meteor_collision = pygame.sprite.spritecollide(self.lander, self.meteor_sprites, True)
+            if meteor_collision:
+                # 25 damage for meteor collision
+                self.lander_collided(25)
+        else:
+            # decrease lander's invincibility ticks.
+            self.lander.decrease_no_collision_duration()
+
+        # Displays 'NOCOL' on the instruments panel if the lander has recently hit an object
+        # and is still immune to collisions.
+        if not self.lander.can_collide() and self.lander.is_controllable():
+            self.show_on_screen("NOCOL", (290, 10), colour=GREEN)
+
+        # checks whether the lander has landed
+        landed = pygame.sprite.spritecollide(self.lander, self.pad_sprites, False)
+        if landed:
+            if self.lander.has_safe_landing_speed() and self.lander.is_horizontal() \
+                    and self.lander_has_both_legs_on_pad(landed):
+                self.successful_landing()
+            else:
+                self.unsuccessful_landing()
+            return
+        # Check if lander has hit lower bound of the screen.
+        elif self.lander.is_crashed():
+            self.lander_crashed()
+            return
+
+        # Significantly increases gravity once the lander has reached 100% damage. This is done so the
+        # player doesn't have to wait ages for a new mission once their lander has been destroyed.
+        if not self.lander.is_controllable():
+            for _ in range(3):
+                self.lander.count_for_gravity()
 
-        # set player lives to LANDER_LIVES_START
-        self.lander_lives = LANDER_LIVES_START
-        # game runs while the player has at least on life.
-        while self.lander_lives > 0:
-            # Spawn static sprites and a set of meteors. The game is paused, a message is displayed.
-            self.spawn_pads()
-            self.spawn_obstacles()
-            self.meteor_sprites.empty()
-            self.spawn_meteors(random_height=True)
-            self.pause("New game")
-            while True:
-                # This block denotes one tick of a game.
-                self.update_all_elements()
-                self.replace_off_screen_meteors()
-
-                # when meteor collides with a landing pad, the meteor gets destroyed and replaced.
-                self.spawn_meteors(len(pygame.sprite.groupcollide(self.pad_sprites, self.meteor_sprites, False, True)))
-                # when meteor collides with an obstacle, the meteor gets destroyed and replaced.
-                self.spawn_meteors(
-                    len(pygame.sprite.groupcollide(self.obstacle_sprites, self.meteor_sprites, False, True)))
-
-                # checks for pressed keys
-                pygame.event.pump()
-                key = pygame.key.get_pressed()
-                if key[pygame.K_p]:
-                    self.pause()
-                # right rotation
-                if key[pygame.K_RIGHT] and self.lander.is_controllable() and self.failure != "Right Rotation":
-                    self.lander.rotate_right()
-                # left rotation
-                if key[pygame.K_LEFT] and self.lander.is_controllable() and self.failure != "Left Rotation":
-                    self.lander.rotate_left()
-                # thrust
-                if key[pygame.K_SPACE] and self.lander.is_controllable() and self.failure != "Thrust" \
-                        and self.lander.current_fuel() >= THRUST_COST:
-                    self.lander.thrust()
-                    # rotates thrust_image so it corresponds to lander sprite, then displays it.
-                    thrust_image = pygame.transform.rotozoom(self.thrust_image_original, self.lander.get_rotation(), 1)
-                    self.screen.blit(thrust_image, (self.lander.rect.x, self.lander.rect.y))
-                # checks for exit command
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        sys.exit()
-
-                # check whether the lander has collided with an obstacle
-                if self.lander.can_collide():
-                    # if lander collides with an environmental object: destroys the obstacle/meteor hit,
-                    # deals damage, makes lander briefly invincible
-                    obstacle_collision = pygame.sprite.spritecollide(self.lander, self.obstacle_sprites, True)
-                    if obstacle_collision:
-                        # 10 damage for obstacle collision
-                        self.lander_collided(10)
-                    # If a meteor is hit by the player, it is not replaced.
-                    # This is done on purpose as it lowers the game's difficulty
-                    # as the lander gets damaged. Otherwise it was too complicated to land safely.
-                    meteor_collision = pygame.sprite.spritecollide(self.lander, self.meteor_sprites, True)
-                    if meteor_collision:
-                        # 25 damage for meteor collision
-                        self.lander_collided(25)
-                else:
-                    # decrease lander's invincibility ticks.
-                    self.lander.decrease_no_collision_duration()
-
-                # Displays 'NOCOL' on the instruments panel if the lander has recently hit an object
-                # and is still immune to collisions.
-                if not self.lander.can_collide() and self.lander.is_controllable():
-                    self.show_on_screen("NOCOL", (290, 10), colour=GREEN)
-
-                # checks whether the lander has landed
-                landed = pygame.sprite.spritecollide(self.lander, self.pad_sprites, False)
-                if landed:
-                    if self.lander.has_safe_landing_speed() and self.lander.is_horizontal() \
-                            and self.lander_has_both_legs_on_pad(landed):
-                        self.successful_landing()
-                    else:
-                        self.unsuccessful_landing()
-                    break
-                # Check if lander has hit lower bound of the screen.
-                elif self.lander.is_crashed():
-                    self.lander_crashed()
-                    break
-
-                # Significantly increases gravity once the lander has reached 100% damage. This is done so the
-                # player doesn't have to wait ages for a new mission once their lander has been destroyed.
-                if not self.lander.is_controllable():
-                    for _ in range(3):
-                        self.lander.count_for_gravity()
-
-                # Update the displayed image, increase ticks counter and update time counter which is based on it.
-                pygame.display.flip()
-                self.ticks += 1
-                self.time = self.ticks / 30
-        # conclude game
-        self.end_game()
+        # Update the displayed image, increase ticks counter and update time counter which is based on it.
+        pygame.display.flip()
+        self.ticks += 1
+        self.time = self.ticks / TICKS_PER_SECOND
+
+    def step(self, events=None, keys=None):
+        """Runs one frame in whatever state the game is in, and returns False once the player has quit.
+           The events and keys default to pygame's. A test or a replay can pass its own instead, e.g.
+           keys={pygame.K_SPACE: True}, to run the game without anyone at the keyboard."""
+        for event in pygame.event.get() if events is None else events:
+            state = self.state
+            self.handle_event(event)
+            if not self.running:
+                return False
+            if self.state != state:
+                # A menu was opened or closed. Like a key press that is cleared, the rest are dropped.
+                break
+        if self.state == PLAYING:
+            if keys is None:
+                keys = pygame.key.get_pressed()
+            elif isinstance(keys, dict):
+                keys = collections.defaultdict(bool, keys)
+            self.tick(keys)
+        return True
+
+    def play(self):
+        """Main game loop. Every frame goes through step(), so menus and new games do not nest
+            inside each other, however long the session is. Missions run as fast as they can, as
+            they always have, and an open menu waits for the next event instead of redrawing."""
+        self.new_game()
+        events = None
+        while self.step(events):
+            events = None if self.state == PLAYING else [pygame.event.wait()]
+        pygame.quit()
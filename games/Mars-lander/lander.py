@@ -1,5 +1,6 @@
 import pygame
 import math
+from jtlgames.images import load_image
 import random
 from config import *
 
@@ -7,7 +8,7 @@ from config import *
 class Lander(pygame.sprite.Sprite):
     def __init__(self):
         pygame.sprite.Sprite.__init__(self)
-        self._original_image = pygame.image.load('resources/lander.png')
+        self._original_image = load_image('resources/lander.png')
         self.image = self._original_image
         self.rect = self.image.get_rect()
         self.rect.center = (600, 60)
@@ -0,0 +1,45 @@
+import functools
+import pygame
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(name, size):
+    """Returns the system font name in size. Finding a system font is slow, so each one is only made once."""
+    return pygame.font.SysFont(name, size)
+
+
+def render(string, font_size=20, colour=(255, 255, 255), font='Arial'):
+    """Returns a surface with string drawn on it."""
+    return get_font(font, font_size).render(str(string), True, colour)
+
+
+class Menu:
+    """A menu shown over the game, like the pause menu. Its background and the text that does not change
+       are drawn once, when the menu is made, onto a surface that is reused every time the menu is shown.
+       The menu does not run a loop of its own: the game keeps running frames while it is open, and passes
+       its events to handle_event(), which calls the action of the key that was pressed."""
+
+    def __init__(self, size, fill, texts=(), keys=None):
+        """fill is the background colour, which can have an alpha to show the game through the menu.
+           texts are (string, location, font_size, colour) and keys maps pygame keys to actions."""
+        translucent = len(fill) == 4 and fill[3] < 255
+        self.surface = pygame.Surface(size, pygame.SRCALPHA if translucent else 0)
+        try:
+            self.surface = self.surface.convert_alpha() if translucent else self.surface.convert()
+        except pygame.error:
+            pass  # The display is not set up, so the surface is kept in its own format
+        self.surface.fill(fill)
+        for string, location, font_size, colour in texts:
+            self.surface.blit(render(string, font_size, colour), location)
+        self.keys = keys or {}
+
+    def draw(self, screen, texts=()):
+        """Draws the menu over what is on the screen, with texts, like a score, that change each time."""
+        screen.blit(self.surface, (0, 0))
+        for string, location, font_size, colour in texts:
+            screen.blit(render(string, font_size, colour), location)
+
+    def handle_event(self, event):
+        """Calls the action for the key pressed, if the menu has one."""
+        if event.type == pygame.KEYDOWN and event.key in self.keys:
+            self.keys[event.key]()
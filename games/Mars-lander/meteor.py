@@ -1,20 +1,24 @@
 import pygame
 import random
+from jtlgames.images import load_image
 from config import *
 
 
 class Meteor(pygame.sprite.Sprite):
-    # all meteor images are loaded here, so the game does not load an image on every meteor spawn.
-    meteors = [
-        pygame.image.load('resources/meteors/spaceMeteors_001.png'),
-        pygame.image.load('resources/meteors/spaceMeteors_002.png'),
-        pygame.image.load('resources/meteors/spaceMeteors_003.png'),
-        pygame.image.load('resources/meteors/spaceMeteors_004.png'),
-    ]
+    # images are loaded once and shared, so the game does not load an image on every meteor spawn.
+    meteors = []
+
+    @classmethod
+    def load_images(cls):
+        """Returns the meteor images, loading them the first time they are needed, when the
+           display is set up, so they can be converted to its format."""
+        if not cls.meteors:
+            cls.meteors = [load_image('resources/meteors/spaceMeteors_00%d.png' % i) for i in range(1, 5)]
+        return cls.meteors
 
     def __init__(self, x, y):
         pygame.sprite.Sprite.__init__(self)
-        self.image = random.choice(Meteor.meteors)
+        self.image = random.choice(Meteor.load_images())
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
         self._off_screen = False
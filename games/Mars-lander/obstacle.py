@@ -1,22 +1,22 @@
 import pygame
 import random
+from jtlgames.images import load_image
+from config import OBSTACLES_LIST
 
 
 class Obstacle(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        obstacles_list = [
-            'building_dome',
-            'building_station_NE',
-            'building_station_SW',
-            'pipe_ramp_NE',
-            'pipe_stand_SE',
-            'rocks_NW',
-            'rocks_ore_SW',
-            'rocks_small_SE',
-            'satellite_SE',
-            'satellite_SW'
-        ]
+    # images are loaded once and shared, so the game does not load an image on every obstacle spawn.
+    images = {}
+
+    @classmethod
+    def image_for(cls, name):
+        """Returns the image of the named obstacle, loading it the first time it is needed."""
+        if name not in cls.images:
+            cls.images[name] = load_image('resources/obstacles/' + name + '.png')
+        return cls.images[name]
+
+    def __init__(self, x, y, name=None):
         pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.image.load('resources/obstacles/' + random.choice(obstacles_list) + '.png')
+        self.image = Obstacle.image_for(name or random.choice(OBSTACLES_LIST))
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
@@ -1,9 +1,20 @@
 import pygame
+from jtlgames.images import load_image
 
 
 class Pad(pygame.sprite.Sprite):
+    # images are loaded once and shared, so the game does not load an image on every pad spawn.
+    images = {}
+
+    @classmethod
+    def image_for(cls, tall=False):
+        """Returns the regular or tall pad image, loading it the first time it is needed."""
+        if tall not in cls.images:
+            cls.images[tall] = load_image('resources/landing_pads/pad' + ('_tall' if tall else '') + '.png')
+        return cls.images[tall]
+
     def __init__(self, x, y, tall=False):
         pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.image.load('resources/landing_pads/pad' + ('_tall' if tall else '') + '.png')
+        self.image = Pad.image_for(tall)
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
@@ -0,0 +1,132 @@
+"""Random placement of sprites that must not overlap, such as pads and obstacles.
+
+The game used to pick a random position, build the sprite, and throw it away if
+it overlapped anything already placed. On a crowded screen that loop can spin
+for a very long time, and forever when the sprites simply do not fit.
+
+A Placer keeps, for every sprite size it has been asked about, a map of the
+centre positions where a sprite of that size would overlap something already
+placed. A position is first drawn at random and checked in the map, which is
+usually enough. If a few draws in a row hit occupied positions, the free
+positions are listed from the map and one of them is picked, so a placement
+always succeeds in bounded time when there is room, and fails straight away
+when there is none.
+"""
+
+import numpy as np
+
+
+class PlacementError(Exception):
+    """Raised when the requested sprites do not all fit.
+
+    Attributes:
+        placed (list): The (choice, center) pairs that were placed before running out of room.
+    """
+
+    def __init__(self, message, placed):
+        super().__init__(message)
+        self.placed = placed
+
+
+class Placer:
+    """Places rects at random so that they do not overlap each other.
+
+    Args:
+        rng: A random.Random, the random module, or a numpy.random.Generator.
+        spacing (int, optional): Minimum gap in pixels between placed rects. Defaults to 0,
+            which allows rects to touch, like pygame's colliderect().
+        tries (int, optional): Random draws to try before listing the free positions.
+    """
+
+    def __init__(self, rng, spacing=0, tries=20):
+        self._randrange = rng.integers if hasattr(rng, 'integers') else rng.randrange
+        self.spacing = spacing
+        self.tries = tries
+        self.rects = []
+        self._maps = {}
+
+    def _blocked(self, size, area):
+        """Returns the map of blocked centers for a size within area, creating it if needed."""
+        key = (size, area)
+        if key not in self._maps:
+            x0, y0, x1, y1 = area
+            self._maps[key] = np.zeros((x1 - x0, y1 - y0), dtype=bool)
+            for rect in self.rects:
+                self._block(key, rect)
+        return self._maps[key]
+
+    def _block(self, key, rect):
+        """Marks the centers where a rect of the key's size would overlap rect."""
+        (w, h), (x0, y0, x1, y1) = key
+        left, top, rw, rh = rect
+        gap = self.spacing
+        # A rect centered on cx spans [cx - w // 2, cx - w // 2 + w)
+        xa = max(left - w + w // 2 + 1 - gap, x0)
+        xb = min(left + rw + w // 2 - 1 + gap, x1 - 1)
+        ya = max(top - h + h // 2 + 1 - gap, y0)
+        yb = min(top + rh + h // 2 - 1 + gap, y1 - 1)
+        if xa <= xb and ya <= yb:
+            self._maps[key][xa - x0:xb - x0 + 1, ya - y0:yb - y0 + 1] = True
+
+    def add(self, rect):
+        """Records a rect as placed. rect is (left, top, width, height)."""
+        rect = tuple(int(v) for v in rect)
+        self.rects.append(rect)
+        for key in self._maps:
+            self._block(key, rect)
+
+    def place(self, size, area):
+        """Finds a random free center for a rect of the given size and records the rect.
+
+        Args:
+            size (tuple): (width, height) of the rect.
+            area (tuple): (x0, y0, x1, y1), the center may be from (x0, y0) up to but
+                not including (x1, y1), like random.randrange().
+
+        Returns:
+            tuple: The (x, y) center, or None if there is no free position.
+        """
+        size, area = tuple(size), tuple(area)
+        blocked = self._blocked(size, area)
+        x0, y0, x1, y1 = area
+
+        for _ in range(self.tries):
+            x, y = int(self._randrange(x0, x1)), int(self._randrange(y0, y1))
+            if not blocked[x - x0, y - y0]:
+                break
+        else:
+            free = np.flatnonzero(~blocked)
+            if len(free) == 0:
+                return None
+            x, y = np.unravel_index(free[int(self._randrange(0, len(free)))], blocked.shape)
+            x, y = int(x) + x0, int(y) + y0
+
+        w, h = size
+        self.add((x - w // 2, y - h // 2, w, h))
+        return x, y
+
+    def place_many(self, count, sizes, area):
+        """Places count rects, each with a size picked at random from sizes.
+
+        When the picked size does not fit anywhere, the other sizes are tried
+        before giving up.
+
+        Returns:
+            list: (index into sizes, (x, y) center) for every rect placed.
+
+        Raises:
+            PlacementError: If the rects do not all fit. Its `placed` attribute
+                holds the rects that were placed.
+        """
+        placed = []
+        for _ in range(count):
+            first = int(self._randrange(0, len(sizes)))
+            order = [first] + [i for i in range(len(sizes)) if i != first]
+            for choice in order:
+                center = self.place(sizes[choice], area)
+                if center is not None:
+                    placed.append((choice, center))
+                    break
+            else:
+                raise PlacementError(f"Only {len(placed)} of {count} sprites fit in the area {area}", placed)
+        return placed
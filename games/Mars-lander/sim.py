@@ -0,0 +1,479 @@
+"""Headless Mars Lander simulation for autopilots and difficulty sweeps.
+
+This is the physics and the landing rules of the game without the drawing and
+the pause screens. The rules follow Lander.update(), Meteor.update() and one
+tick of the loop in Game.play(): failures, meteor replacement, controls,
+collisions with obstacles and meteors, and the landing and crash checks.
+
+LanderBatch advances many landers at once. Each lander flies its own mission,
+with its own pads, obstacles and meteors, and all the state is kept in NumPy
+arrays so one call to step() moves every lander. LanderSim is a single lander
+with the same interface. Missions are generated from a seeded NumPy random
+generator, so a run can be repeated exactly.
+
+The simulation reads config.py and the image sizes, and does not import the
+game's sprites, so it needs only pygame and NumPy, not jtlgames.
+
+Run this file to fly a simple autopilot and measure the simulation speed:
+
+    python sim.py
+"""
+
+import time
+import warnings
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pygame
+
+import config
+from placement import Placer, PlacementError
+
+dd = Path(__file__).parent
+
+# Action bits, combine them with |
+THRUST, LEFT, RIGHT = 1, 2, 4
+
+# Failure codes, in the order of failures_list in Game.lander_failure()
+NO_FAILURE, RIGHT_ROTATION, LEFT_ROTATION, THRUST_FAILURE = range(4)
+
+# Outcome of a mission, reported by step()
+FLYING, LANDED, BAD_LANDING, CRASHED = range(4)
+
+# Index of each value in an observation row
+(OBS_X, OBS_ALTITUDE, OBS_VX, OBS_VY, OBS_ROTATION, OBS_FUEL, OBS_DAMAGE,
+ OBS_PAD_DX, OBS_PAD_DY, OBS_FAILURE) = range(10)
+
+_sizes = None
+
+
+def settings(**overrides):
+    """Returns the game settings from config.py, with some values replaced by overrides."""
+    values = {name: getattr(config, name) for name in dir(config) if name.isupper()}
+    for name in overrides:
+        if name not in values:
+            raise ValueError(f"Unknown Mars Lander setting: {name}")
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def sprite_sizes():
+    """Returns the sizes of the lander, pad, obstacle and meteor images. The game
+    collides sprites by their rects, so the sizes are all the simulation needs."""
+    global _sizes
+    if _sizes is None:
+        def size(name):
+            return pygame.image.load(str(dd / 'resources' / name)).get_size()
+
+        _sizes = SimpleNamespace(
+            lander=size('lander.png'),
+            pads=[size('landing_pads/pad.png'), size('landing_pads/pad_tall.png')],
+            obstacles=[size(f'obstacles/{name}.png') for name in config.OBSTACLES_LIST],
+            meteors=[size(f'meteors/spaceMeteors_00{i}.png') for i in range(1, 5)],
+        )
+    return _sizes
+
+
+def centered(cx, cy, size):
+    """Returns the (left, top, width, height) of a rect of the given size centered on (cx, cy)."""
+    w, h = size
+    return cx - w // 2, cy - h // 2, w, h
+
+
+def overlaps(a, b):
+    """True where rect a overlaps rect b. Both are (..., 4) arrays of (left, top, width, height)."""
+    return ((a[..., 0] < b[..., 0] + b[..., 2]) & (b[..., 0] < a[..., 0] + a[..., 2]) &
+            (a[..., 1] < b[..., 1] + b[..., 3]) & (b[..., 1] < a[..., 1] + a[..., 3]))
+
+
+class Mission:
+    """The pads, obstacles and meteors of one mission, as in Game.spawn_pads(),
+    Game.spawn_obstacles() and Game.spawn_meteors(random_height=True).
+
+    Attributes:
+        pads (numpy.ndarray): Pad rects, shape (NUMBER_OF_PADS, 4).
+        obstacles (numpy.ndarray): Obstacle rects, shape (number of obstacles, 4).
+        meteors (numpy.ndarray): Meteor rects, shape (number of meteors, 4).
+        meteor_velocity (numpy.ndarray): Meteor velocities, shape (number of meteors, 2).
+    """
+
+    def __init__(self, rng, s):
+        sizes = sprite_sizes()
+        self.pads = self.place(rng, s.NUMBER_OF_PADS, sizes.pads, s.PAD_AREA)
+        count = rng.integers(s.MIN_OBSTACLES, s.MAX_OBSTACLES + 1)
+        self.obstacles = self.place(rng, count, sizes.obstacles, s.OBSTACLE_AREA)
+        count = rng.integers(s.MIN_METEORS, s.MAX_METEORS + 1)
+        self.meteors, self.meteor_velocity = new_meteors(rng, s, count, random_height=True)
+
+    @staticmethod
+    def place(rng, count, sizes, area):
+        """Returns the rects of count non-overlapping sprites. Like the game, a mission
+        that is too crowded gets the sprites that fit, with a warning."""
+        try:
+            placed = Placer(rng).place_many(count, sizes, area)
+        except PlacementError as e:
+            warnings.warn(str(e))
+            placed = e.placed
+        rects = [centered(x, y, sizes[kind]) for kind, (x, y) in placed]
+        return np.array(rects, dtype=np.int64).reshape(-1, 4)
+
+
+def new_meteors(rng, s, count, random_height=False):
+    """Returns the rects and velocities of count new meteors, as created by Meteor()."""
+    sizes = sprite_sizes().meteors
+    cx = rng.integers(0, s.WIDTH, count)
+    cy = rng.integers(0, s.HEIGHT - 400, count) if random_height else np.zeros(count, dtype=np.int64)
+    w, h = np.array(sizes, dtype=np.int64)[rng.integers(len(sizes), size=count)].T
+    rects = np.stack([cx - w // 2, cy - h // 2, w, h], axis=-1).reshape(-1, 4)
+    velocity = np.stack([rng.uniform(-3, 3, count), rng.uniform(0, 3, count)], axis=-1).reshape(-1, 2)
+    return rects, velocity
+
+
+def move_by_whole_pixels(pos, acc, velocity, allow_negative=True):
+    """Lander.move() and Meteor.move(): velocity is added up, and once the total passes
+    one pixel the sprite moves by the whole part of it. Updates the arrays in place."""
+    acc += velocity
+    moving = acc > 1
+    if allow_negative:
+        moving |= acc < -1
+    whole = np.where(moving, np.trunc(acc), 0)
+    pos += whole.astype(np.int64)
+    acc -= whole
+
+
+class LanderBatch:
+    """Many landers, each flying its own game of Mars Lander.
+
+    A lander that lands or crashes starts a new mission inside step(), and a
+    lander that runs out of lives starts a new game, so the batch always holds
+    n landers in flight.
+
+    Attributes:
+        n (int): Number of landers.
+        rect (numpy.ndarray): Lander rects, shape (n, 4). The game never resizes the
+            rect when the image rotates, so this is also the collision rect.
+        velocity (numpy.ndarray): Horizontal and vertical velocity, shape (n, 2).
+        rotation (numpy.ndarray): Rotation in degrees, counterclockwise.
+        fuel (numpy.ndarray): Remaining fuel.
+        damage (numpy.ndarray): Damage, 100 or more makes the lander uncontrollable.
+        lives (numpy.ndarray): Lives left in the current game.
+        score (numpy.ndarray): Score of the current game.
+    """
+
+    def __init__(self, n, seed=None, **overrides):
+        """
+        Args:
+            n (int): Number of landers to fly.
+            seed (int or numpy.random.SeedSequence, optional): Seed for the missions and failures.
+            **overrides: Values that replace settings from config.py, e.g. GRAVITY=0.2 / 30.
+        """
+        self.n = n
+        self.s = settings(**overrides)
+        self.rng = np.random.default_rng(seed)
+        s = self.s
+
+        self.rect = np.zeros((n, 4), dtype=np.int64)
+        self.velocity = np.zeros((n, 2))
+        self._acc = np.zeros((n, 2))
+        self.rotation = np.zeros(n, dtype=np.int64)
+        self.fuel = np.zeros(n, dtype=np.int64)
+        self.damage = np.zeros(n, dtype=np.int64)
+        self.controllable = np.ones(n, dtype=bool)
+        self.no_collision = np.zeros(n, dtype=np.int64)
+        self.failure = np.zeros(n, dtype=np.int64)
+        self.failure_ticks = np.zeros(n, dtype=np.int64)
+        self.lives = np.full(n, s.LANDER_LIVES_START, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.ticks = np.zeros(n, dtype=np.int64)
+
+        # Objects are kept in fixed size arrays, the alive masks say which slots are used
+        self.pads = np.zeros((n, s.NUMBER_OF_PADS, 4), dtype=np.int64)
+        self.obstacles = np.zeros((n, s.MAX_OBSTACLES, 4), dtype=np.int64)
+        self.obstacle_alive = np.zeros((n, s.MAX_OBSTACLES), dtype=bool)
+        self.meteors = np.zeros((n, s.MAX_METEORS, 4), dtype=np.int64)
+        self.meteor_velocity = np.zeros((n, s.MAX_METEORS, 2))
+        self._meteor_acc = np.zeros((n, s.MAX_METEORS, 2))
+        self.meteor_alive = np.zeros((n, s.MAX_METEORS), dtype=bool)
+
+        self.new_mission(np.ones(n, dtype=bool))
+
+    def new_mission(self, which):
+        """Gives the selected landers a new lander and a new set of pads, obstacles and meteors."""
+        s = self.s
+        idx = np.flatnonzero(which)
+        count = len(idx)
+
+        self.rect[idx] = centered(600, 60, sprite_sizes().lander)
+        self.velocity[idx, 0] = self.rng.uniform(-1, 1, count)
+        self.velocity[idx, 1] = self.rng.uniform(0, 1, count)
+        self._acc[idx] = 0
+        self.rotation[idx] = 0
+        self.fuel[idx] = s.START_FUEL
+        self.damage[idx] = 0
+        self.controllable[idx] = True
+        self.no_collision[idx] = 0
+        self.ticks[idx] = 0
+
+        for i in idx:
+            mission = Mission(self.rng, s)
+            self.pads[i] = mission.pads
+            k = len(mission.obstacles)
+            self.obstacles[i, :k] = mission.obstacles
+            self.obstacle_alive[i] = np.arange(s.MAX_OBSTACLES) < k
+            k = len(mission.meteors)
+            self.meteors[i, :k] = mission.meteors
+            self.meteor_velocity[i, :k] = mission.meteor_velocity
+            self._meteor_acc[i] = 0
+            self.meteor_alive[i] = np.arange(s.MAX_METEORS) < k
+
+    def spawn_meteors(self, counts):
+        """Adds counts[i] meteors at the top of the screen for lander i, in free slots."""
+        if not counts.any():
+            return
+        free = ~self.meteor_alive
+        slots = free & (np.cumsum(free, axis=1) <= counts[:, None])
+        rects, velocity = new_meteors(self.rng, self.s, int(slots.sum()))
+        self.meteors[slots] = rects
+        self.meteor_velocity[slots] = velocity
+        self._meteor_acc[slots] = 0
+        self.meteor_alive |= slots
+
+    def observe(self):
+        """Returns one row per lander, index the columns with OBS_*. The pad
+        values are the distances from the lander to the horizontally nearest pad."""
+        s = self.s
+        rect = self.rect
+        cx = rect[:, 0] + rect[:, 2] / 2
+        bottom = rect[:, 1] + rect[:, 3]
+        pad_cx = self.pads[:, :, 0] + self.pads[:, :, 2] / 2
+        nearest = np.abs(pad_cx - cx[:, None]).argmin(axis=1)
+        rows = np.arange(self.n)
+
+        obs = np.empty((self.n, 10), dtype=np.float32)
+        obs[:, OBS_X] = cx
+        obs[:, OBS_ALTITUDE] = s.HEIGHT - bottom
+        obs[:, OBS_VX] = self.velocity[:, 0]
+        obs[:, OBS_VY] = self.velocity[:, 1]
+        obs[:, OBS_ROTATION] = self.rotation
+        obs[:, OBS_FUEL] = self.fuel
+        obs[:, OBS_DAMAGE] = self.damage
+        obs[:, OBS_PAD_DX] = pad_cx[rows, nearest] - cx
+        obs[:, OBS_PAD_DY] = self.pads[rows, nearest, 1] - bottom
+        obs[:, OBS_FAILURE] = self.failure
+        return obs
+
+    def _update_meteors(self):
+        """Meteor.update() and Game.replace_off_screen_meteors()."""
+        s = self.s
+        m = self.meteors
+        move_by_whole_pixels(m[..., 0], self._meteor_acc[..., 0], self.meteor_velocity[..., 0])
+        move_by_whole_pixels(m[..., 1], self._meteor_acc[..., 1], self.meteor_velocity[..., 1], allow_negative=False)
+        off = self.meteor_alive & ((m[..., 1] > s.HEIGHT) | (m[..., 0] > s.WIDTH) | (m[..., 0] + m[..., 2] < 0))
+        self.meteor_alive &= ~off
+        self.spawn_meteors(off.sum(axis=1))
+
+    def _update_landers(self):
+        """Lander.update()."""
+        s = self.s
+        v = self.velocity
+        vx = v[:, 0]
+        vx[:] = np.where(vx > s.AIR_RESISTANCE, vx - s.AIR_RESISTANCE,
+                         np.where(vx < -s.AIR_RESISTANCE, vx + s.AIR_RESISTANCE, vx))
+        v[:, 1] += s.GRAVITY
+        move_by_whole_pixels(self.rect[:, 0], self._acc[:, 0], v[:, 0])
+        move_by_whole_pixels(self.rect[:, 1], self._acc[:, 1], v[:, 1])
+
+        left, top, w, h = self.rect.T
+        above = top < 0
+        if above.any():
+            top[above] = 1
+            self.damage[above] += 5
+            v[above, 1] = self.rng.uniform(0, 1, int(above.sum()))
+        crashed = ~above & (top + h > s.HEIGHT)
+
+        left[:] = np.where(left < 0, s.WIDTH - w, np.where(left + w > s.WIDTH, 0, left))
+        self.controllable &= self.damage < 100
+        return crashed
+
+    def _update_failures(self):
+        """Game.lander_failure(), which the game only calls for controllable landers."""
+        s = self.s
+        check = self.controllable
+        ready = check & (self.failure_ticks == 0)
+        self.failure[ready] = NO_FAILURE
+        fail = ready & (self.rng.random(self.n) < s.FAILURE_CHANCE)
+        if fail.any():
+            self.failure_ticks[fail] += s.FAILURE_DURATION
+            self.failure[fail] = self.rng.integers(RIGHT_ROTATION, THRUST_FAILURE + 1, int(fail.sum()))
+        self.failure_ticks[check & ~ready] -= 1
+
+    def _destroy_meteors_on(self, rects, alive=None):
+        """Destroys meteors touching any of rects, returns how many of rects were hit per lander."""
+        hits = overlaps(rects[:, :, None, :], self.meteors[:, None, :, :]) & self.meteor_alive[:, None, :]
+        if alive is not None:
+            hits &= alive[:, :, None]
+        self.meteor_alive &= ~hits.any(axis=1)
+        return hits.any(axis=2).sum(axis=1)
+
+    def step(self, actions):
+        """Advances every lander by one tick of the game.
+
+        Args:
+            actions (array-like): Integer per lander, a combination of THRUST, LEFT and RIGHT.
+
+        Returns:
+            tuple: (observations, rewards, dones, info). The reward is the score earned
+            on this tick. A lander is done when its mission ends; info['outcome'] says how
+            (LANDED, BAD_LANDING or CRASHED), info['game_over'] marks landers that lost
+            their last life and info['final_score'] holds the score of those games.
+            Finished missions and games have already been restarted.
+        """
+        s = self.s
+        actions = np.asarray(actions, dtype=np.int64)
+        self._update_meteors()
+        crashed = self._update_landers()
+        self._update_failures()
+
+        # Meteors that hit a pad or an obstacle are replaced, one per object hit
+        self.spawn_meteors(self._destroy_meteors_on(self.pads))
+        self.spawn_meteors(self._destroy_meteors_on(self.obstacles, self.obstacle_alive))
+
+        control = self.controllable
+        right = control & (actions & RIGHT > 0) & (self.failure != RIGHT_ROTATION)
+        left = control & (actions & LEFT > 0) & (self.failure != LEFT_ROTATION)
+        self.rotation += left.astype(np.int64) - right
+        thrust = control & (actions & THRUST > 0) & (self.failure != THRUST_FAILURE) & (self.fuel >= s.THRUST_COST)
+        if thrust.any():
+            angle = np.radians(self.rotation[thrust])
+            self.velocity[thrust, 0] -= 0.33 * np.sin(angle)
+            self.velocity[thrust, 1] -= 0.33 * np.cos(angle)
+            self.fuel[thrust] -= s.THRUST_COST
+
+        # Obstacles and meteors the lander hits are destroyed, and it becomes briefly immune
+        can_collide = self.no_collision == 0
+        lander = self.rect[:, None, :]
+        obstacle_hit = can_collide[:, None] & self.obstacle_alive & overlaps(lander, self.obstacles)
+        meteor_hit = can_collide[:, None] & self.meteor_alive & overlaps(lander, self.meteors)
+        self.obstacle_alive &= ~obstacle_hit
+        self.meteor_alive &= ~meteor_hit
+        obstacle_hit, meteor_hit = obstacle_hit.any(axis=1), meteor_hit.any(axis=1)
+        self.damage += 10 * obstacle_hit + 25 * meteor_hit
+        np.minimum(self.damage, 100, out=self.damage)
+        self.no_collision[obstacle_hit | meteor_hit] = s.NO_COLLISION_DURATION
+        immune = ~can_collide & (self.no_collision > 0)
+        self.no_collision[immune] -= 1
+
+        # Landing checks, the first pad in the group is the one the legs are checked on
+        on_pad = overlaps(lander, self.pads)
+        landed = on_pad.any(axis=1)
+        pad = self.pads[np.arange(self.n), on_pad.argmax(axis=1)]
+        l_left, l_right = self.rect[:, 0], self.rect[:, 0] + self.rect[:, 2]
+        both_legs = (pad[:, 0] <= l_left) & (pad[:, 0] + pad[:, 2] >= l_right)
+        safe = landed & (self.velocity[:, 0] < s.SAFE_LANDING_SPEED) & (self.velocity[:, 1] < s.SAFE_LANDING_SPEED) \
+            & (np.abs(self.rotation) < 5) & both_legs
+        crashed &= ~landed
+
+        outcome = np.full(self.n, FLYING, dtype=np.int64)
+        outcome[safe] = LANDED
+        outcome[landed & ~safe] = BAD_LANDING
+        outcome[crashed] = CRASHED
+
+        rewards = np.where(safe, 150 - self.damage, 0)
+        self.score += rewards
+        self.lives -= (outcome == BAD_LANDING) | (outcome == CRASHED)
+
+        # Uncontrollable landers fall much faster so the mission ends sooner
+        self.velocity[~self.controllable, 1] += 3 * s.GRAVITY
+        self.ticks += 1
+
+        done = outcome != FLYING
+        game_over = self.lives <= 0
+        info = {'outcome': outcome, 'game_over': game_over, 'final_score': np.where(game_over, self.score, 0),
+                'ticks': self.ticks.copy()}
+        if done.any():
+            self.lives[game_over] = s.LANDER_LIVES_START
+            self.score[game_over] = 0
+            self.new_mission(done)
+        return self.observe(), rewards, done, info
+
+
+class LanderSim:
+    """A single lander with a reset()/step() interface. The game continues over
+    missions until the lander runs out of lives, then reset() starts a new one."""
+
+    def __init__(self, seed=None, **overrides):
+        self.batch = LanderBatch(1, seed, **overrides)
+        self.game_over = False
+
+    def reset(self):
+        """Starts a new game and returns the first observation."""
+        b = self.batch
+        b.lives[:] = b.s.LANDER_LIVES_START
+        b.score[:] = 0
+        b.new_mission(np.ones(1, dtype=bool))
+        self.game_over = False
+        return b.observe()[0]
+
+    def step(self, action):
+        """Advances the game by one tick. Returns (observation, reward, done, info),
+        where done is True when a mission ends."""
+        if self.game_over:
+            raise RuntimeError("The game is over, call reset() to start a new one")
+        obs, rewards, dones, info = self.batch.step([action])
+        info = {k: v[0].item() for k, v in info.items()}
+        self.game_over = info['game_over']
+        return obs[0], rewards[0].item(), bool(dones[0]), info
+
+
+def autopilot(obs):
+    """A simple autopilot: keeps upright, steers over the nearest pad and brakes near the ground."""
+    actions = np.zeros(len(obs), dtype=np.int64)
+    rotation, vx, vy = obs[:, OBS_ROTATION], obs[:, OBS_VX], obs[:, OBS_VY]
+    # Lean into the direction we want to go, a few degrees at most
+    target = np.clip(-obs[:, OBS_PAD_DX] / 40 + vx * 8, -20, 20)
+    target = np.where(obs[:, OBS_PAD_DY] < 120, 0, target)
+    actions[rotation < target - 1] |= LEFT
+    actions[rotation > target + 1] |= RIGHT
+    max_vy = np.clip(obs[:, OBS_PAD_DY] / 100, 0.4, 2.5)
+    actions[vy > max_vy] |= THRUST
+    return actions
+
+
+def sweep_session(params, seed, max_ticks=100000):
+    """Plays one game with the autopilot until it runs out of lives, for jtlgames.sweep.
+
+    Args:
+        params (dict): Settings that replace values from config.py.
+        seed (int): Seed for the missions and failures.
+        max_ticks (int): Ticks after which a game that is still going is stopped.
+
+    Returns:
+        dict: Ticks played, missions flown, safe landings and the final score.
+    """
+    sim = LanderSim(seed, **params)
+    obs = sim.reset()
+    missions = landings = ticks = 0
+    info = {'game_over': False, 'final_score': 0}
+    while ticks < max_ticks and not info['game_over']:
+        obs, _, done, info = sim.step(int(autopilot(obs[None])[0]))
+        ticks += 1
+        missions += done
+        landings += info['outcome'] == LANDED
+    score = info['final_score'] if info['game_over'] else int(sim.batch.score[0])
+    return {'ticks': ticks, 'missions': missions, 'landings': landings, 'score': score}
+
+
+if __name__ == "__main__":
+    batch = LanderBatch(1000, seed=1)
+    obs = batch.observe()
+    landed = missions = 0
+    start = time.perf_counter()
+    ticks = 3000
+    for _ in range(ticks):
+        obs, _, done, info = batch.step(autopilot(obs))
+        missions += int(done.sum())
+        landed += int((info['outcome'] == LANDED).sum())
+    elapsed = time.perf_counter() - start
+    print(f"{batch.n * ticks:,} lander ticks in {elapsed:.1f}s, {batch.n * ticks / elapsed:,.0f} per second")
+    print(f"{missions:,} missions, {landed / max(missions, 1):.0%} landed safely")
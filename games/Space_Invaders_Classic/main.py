@@ -5,7 +5,7 @@ Main module for the Space Invaders game using Pygame.
 import sys
 
 from pygame import sprite, transform, mixer, time, Surface, font, K_RIGHT, K_LEFT, display, image, \
-    event, KEYUP, KEYDOWN, K_ESCAPE, K_SPACE, QUIT, init, key
+    event, KEYUP, KEYDOWN, K_ESCAPE, K_SPACE, QUIT, init, key, error
 
 from os.path import abspath, dirname
 from random import choice
@@ -27,27 +27,46 @@ PURPLE = (203, 0, 255)
 RED = (237, 28, 36)
 ORANGE = (255, 149, 14)
 
-SCREEN = display.set_mode((800, 600))
 FONT = FONT_PATH + "space_invaders.ttf"
-IMG_NAMES = [
-    "ship",
-    "mystery",
-    "enemy1_1",
-    "enemy1_2",
-    "enemy2_1",
-    "enemy2_2",
-    "enemy3_1",
-    "enemy3_2",
-    "explosionblue",
-    "explosiongreen",
-    "explosionpurple",
-    "laser",
-    "enemylaser",
-]
-IMAGES = {
-    name: image.load(IMAGE_PATH + "{}.png".format(name)).convert_alpha()
-    for name in IMG_NAMES
-}
+
+
+class Assets(object):
+    """The window and the images, set up the first time they are used.
+
+    Importing this module does not open a window or load anything. A headless
+    harness can replace `assets` before it makes a game, e.g. with
+    Assets(screen=Surface((800, 600))), to draw somewhere other than a window.
+    """
+
+    def __init__(self, screen=None):
+        self._screen = screen
+        self._images = {}
+
+    @property
+    def screen(self):
+        if self._screen is None:
+            self._screen = display.set_mode((800, 600))
+        return self._screen
+
+    def image(self, name, alpha=True):
+        """Returns an image from the images directory, loaded and converted only once."""
+        if name not in self._images:
+            self.screen  # Open the window first, so the image can be converted
+            img = image.load(IMAGE_PATH + name)
+            try:
+                img = img.convert_alpha() if alpha else img.convert()
+            except error:
+                pass  # No window, as with a screen given by a headless harness
+            self._images[name] = img
+        return self._images[name]
+
+    def update(self):
+        """Shows the frame, when the screen is the window."""
+        if self._screen is display.get_surface():
+            display.update()
+
+
+assets = Assets()
 
 BLOCKERS_POSITION = 450
 ENEMY_DEFAULT_POSITION = 65  # Initial value for a new game
@@ -58,7 +77,7 @@ DIFFICULTY_LEVEL = 5  # a value between 1 to 10 - number of enemy bullets
 class Ship(sprite.Sprite):
     def __init__(self):
         sprite.Sprite.__init__(self)
-        self.image = IMAGES["ship"]
+        self.image = assets.image("ship.png")
         self.rect = self.image.get_rect(topleft=(375, 540))
         self.speed = 5
 
@@ -73,7 +92,7 @@ class Ship(sprite.Sprite):
 class Bullet(sprite.Sprite):
     def __init__(self, xpos, ypos, direction, speed, filename, side):
         sprite.Sprite.__init__(self)
-        self.image = IMAGES[filename]
+        self.image = assets.image(filename + ".png")
         self.rect = self.image.get_rect(topleft=(xpos, ypos))
         self.speed = speed
         self.direction = direction
@@ -115,7 +134,7 @@ class Enemy(sprite.Sprite):
             3: ["3_1", "3_2"],
             4: ["3_1", "3_2"],
         }
-        img1, img2 = (IMAGES["enemy{}".format(img_num)] for img_num in images[self.row])
+        img1, img2 = (assets.image("enemy{}.png".format(img_num)) for img_num in images[self.row])
         self.images.append(transform.scale(img1, (40, 35)))
         self.images.append(transform.scale(img2, (40, 35)))
 
@@ -229,7 +248,7 @@ class Blocker(sprite.Sprite):
 class Mystery(sprite.Sprite):
     def __init__(self):
         sprite.Sprite.__init__(self)
-        self.image = IMAGES["mystery"]
+        self.image = assets.image("mystery.png")
         self.image = transform.scale(self.image, (75, 35))
         self.rect = self.image.get_rect(topleft=(-80, 45))
         self.row = 5
@@ -279,7 +298,7 @@ class EnemyExplosion(sprite.Sprite):
     @staticmethod
     def get_image(row):
         img_colors = ["purple", "blue", "blue", "green", "green"]
-        return IMAGES["explosion{}".format(img_colors[row])]
+        return assets.image("explosion{}.png".format(img_colors[row]))
 
     def update(self, current_time, *args):
         passed = current_time - self.timer
@@ -310,7 +329,7 @@ class MysteryExplosion(sprite.Sprite):
 class ShipExplosion(sprite.Sprite):
     def __init__(self, ship, *groups):
         super(ShipExplosion, self).__init__(*groups)
-        self.image = IMAGES["ship"]
+        self.image = assets.image("ship.png")
         self.rect = self.image.get_rect(topleft=(ship.rect.x, ship.rect.y))
         self.timer = time.get_ticks()
 
@@ -325,7 +344,7 @@ class ShipExplosion(sprite.Sprite):
 class Life(sprite.Sprite):
     def __init__(self, xpos, ypos):
         sprite.Sprite.__init__(self)
-        self.image = IMAGES["ship"]
+        self.image = assets.image("ship.png")
         self.image = transform.scale(self.image, (23, 23))
         self.rect = self.image.get_rect(topleft=(xpos, ypos))
 
@@ -351,8 +370,8 @@ class SpaceInvaders(object):
         init()
         self.clock = time.Clock()
         self.caption = display.set_caption("Space Invaders")
-        self.screen = SCREEN
-        self.background = image.load(IMAGE_PATH + "background.jpg").convert()
+        self.screen = assets.screen
+        self.background = assets.image("background.jpg", alpha=False)
         self.startGame = False
         self.mainScreen = True
         self.gameOver = False
@@ -372,6 +391,11 @@ class SpaceInvaders(object):
         self.creator_name = Text(FONT, 20, "Sandy Inspires", GREEN, 600, 570)
         self.jtl = Text(FONT, 20, "THE LEAGUE", ORANGE, 10, 570)
 
+        # Screens start from a copy of the background with the texts that never change already on it
+        self.titleScreen = None
+        self.playBackground = self.bake(self.scoreText, self.livesText)
+        self.scoreTextValue = None
+
         self.life1 = Life(715, 3)
         self.life2 = Life(742, 3)
         self.life3 = Life(769, 3)
@@ -549,19 +573,33 @@ class SpaceInvaders(object):
         self.score += score
         return score
 
+    def bake(self, *texts):
+        """Returns a copy of the background with the texts drawn on it."""
+        surface = self.background.copy()
+        for text in texts:
+            text.draw(surface)
+        return surface
+
     def create_main_menu(self):
-        self.enemy1 = IMAGES["enemy3_1"]
-        self.enemy1 = transform.scale(self.enemy1, (40, 40))
-        self.enemy2 = IMAGES["enemy2_2"]
-        self.enemy2 = transform.scale(self.enemy2, (40, 40))
-        self.enemy3 = IMAGES["enemy1_2"]
-        self.enemy3 = transform.scale(self.enemy3, (40, 40))
-        self.enemy4 = IMAGES["mystery"]
-        self.enemy4 = transform.scale(self.enemy4, (80, 40))
-        self.screen.blit(self.enemy1, (318, 270))
-        self.screen.blit(self.enemy2, (318, 320))
-        self.screen.blit(self.enemy3, (318, 370))
-        self.screen.blit(self.enemy4, (299, 420))
+        """Draws the title screen. Nothing on it moves, so it is drawn once and then blitted every frame."""
+        if self.titleScreen is None:
+            self.titleScreen = self.bake(self.titleText, self.titleText2, self.enemy1Text, self.enemy2Text,
+                                         self.enemy3Text, self.enemy4Text, self.creator_name, self.jtl)
+            self.enemy1 = transform.scale(assets.image("enemy3_1.png"), (40, 40))
+            self.enemy2 = transform.scale(assets.image("enemy2_2.png"), (40, 40))
+            self.enemy3 = transform.scale(assets.image("enemy1_2.png"), (40, 40))
+            self.enemy4 = transform.scale(assets.image("mystery.png"), (80, 40))
+            self.titleScreen.blit(self.enemy1, (318, 270))
+            self.titleScreen.blit(self.enemy2, (318, 320))
+            self.titleScreen.blit(self.enemy3, (318, 370))
+            self.titleScreen.blit(self.enemy4, (299, 420))
+        self.screen.blit(self.titleScreen, (0, 0))
+
+    def update_score_text(self):
+        """Renders the score again when it has changed."""
+        if self.scoreTextValue != self.score:
+            self.scoreText2 = Text(FONT, 20, str(self.score), GREEN, 85, 5)
+            self.scoreTextValue = self.score
 
     def check_collisions(self):
         sprite.groupcollide(self.bullets, self.enemyBullets, True, True)
@@ -638,80 +676,70 @@ class SpaceInvaders(object):
             if self.should_exit(e):
                 sys.exit()
 
-    async def main(self):
-        while True:
-            if self.mainScreen:
-                self.screen.blit(self.background, (0, 0))
-                self.titleText.draw(self.screen)
-                self.titleText2.draw(self.screen)
-                self.enemy1Text.draw(self.screen)
-                self.enemy2Text.draw(self.screen)
-                self.enemy3Text.draw(self.screen)
-                self.enemy4Text.draw(self.screen)
-                self.creator_name.draw(self.screen)
-                self.jtl.draw(self.screen)
-                self.create_main_menu()
-                for e in event.get():
-                    if self.should_exit(e):
-                        sys.exit()
-                    if e.type == KEYUP:
-                        # Only create blockers on a new game, not a new round
-                        self.allBlockers = sprite.Group(
-                            self.make_blockers(0),
-                            self.make_blockers(1),
-                            self.make_blockers(2),
-                            self.make_blockers(3),
-                        )
-                        self.livesGroup.add(self.life1, self.life2, self.life3)
-                        self.reset(0)
-                        self.startGame = True
-                        self.mainScreen = False
-
-            elif self.startGame:
-                if not self.enemies and not self.explosionsGroup:
-                    currentTime = time.get_ticks()
-                    if currentTime - self.gameTimer < 3000:
-                        self.screen.blit(self.background, (0, 0))
-                        self.scoreText2 = Text(FONT, 20, str(self.score), GREEN, 85, 5)
-                        self.scoreText.draw(self.screen)
-                        self.scoreText2.draw(self.screen)
-                        self.nextRoundText.draw(self.screen)
-                        self.livesText.draw(self.screen)
-                        self.livesGroup.update()
-                        self.check_input()
-                        self.creator_name.draw(self.screen)
-                        self.jtl.draw(self.screen)
-                    if currentTime - self.gameTimer > 3000:
-                        # Move enemies closer to bottom
-                        self.enemyPosition += ENEMY_MOVE_DOWN
-                        self.reset(self.score)
-                        self.gameTimer += 3000
-                else:
-                    currentTime = time.get_ticks()
-                    self.play_main_music(currentTime)
-                    self.screen.blit(self.background, (0, 0))
-                    self.allBlockers.update(self.screen)
-                    self.scoreText2 = Text(FONT, 20, str(self.score), GREEN, 85, 5)
-                    self.scoreText.draw(self.screen)
+    def step(self):
+        """Runs one frame of whichever screen is showing: the menu, the game or game over."""
+        if self.mainScreen:
+            self.create_main_menu()
+            for e in event.get():
+                if self.should_exit(e):
+                    sys.exit()
+                if e.type == KEYUP:
+                    # Only create blockers on a new game, not a new round
+                    self.allBlockers = sprite.Group(
+                        self.make_blockers(0),
+                        self.make_blockers(1),
+                        self.make_blockers(2),
+                        self.make_blockers(3),
+                    )
+                    self.livesGroup.add(self.life1, self.life2, self.life3)
+                    self.reset(0)
+                    self.startGame = True
+                    self.mainScreen = False
+
+        elif self.startGame:
+            if not self.enemies and not self.explosionsGroup:
+                currentTime = time.get_ticks()
+                if currentTime - self.gameTimer < 3000:
+                    self.screen.blit(self.playBackground, (0, 0))
+                    self.update_score_text()
                     self.scoreText2.draw(self.screen)
-                    self.livesText.draw(self.screen)
+                    self.nextRoundText.draw(self.screen)
+                    self.livesGroup.update()
                     self.check_input()
-                    self.enemies.update(currentTime)
-                    self.allSprites.update(self.keys, currentTime)
-                    self.explosionsGroup.update(currentTime)
-                    self.check_collisions()
-                    self.create_new_ship(self.makeNewShip, currentTime)
-                    self.make_enemies_shoot()
                     self.creator_name.draw(self.screen)
                     self.jtl.draw(self.screen)
-
-            elif self.gameOver:
+                if currentTime - self.gameTimer > 3000:
+                    # Move enemies closer to bottom
+                    self.enemyPosition += ENEMY_MOVE_DOWN
+                    self.reset(self.score)
+                    self.gameTimer += 3000
+            else:
                 currentTime = time.get_ticks()
-                # Reset enemy starting position
-                self.enemyPosition = ENEMY_DEFAULT_POSITION
-                self.create_game_over(currentTime)
+                self.play_main_music(currentTime)
+                self.screen.blit(self.playBackground, (0, 0))
+                self.allBlockers.update(self.screen)
+                self.update_score_text()
+                self.scoreText2.draw(self.screen)
+                self.check_input()
+                self.enemies.update(currentTime)
+                self.allSprites.update(self.keys, currentTime)
+                self.explosionsGroup.update(currentTime)
+                self.check_collisions()
+                self.create_new_ship(self.makeNewShip, currentTime)
+                self.make_enemies_shoot()
+                self.creator_name.draw(self.screen)
+                self.jtl.draw(self.screen)
 
-            display.update()
+        elif self.gameOver:
+            currentTime = time.get_ticks()
+            # Reset enemy starting position
+            self.enemyPosition = ENEMY_DEFAULT_POSITION
+            self.create_game_over(currentTime)
+
+    async def main(self):
+        while True:
+            self.step()
+            assets.update()
             self.clock.tick(60)
             await asyncio.sleep(0)
 
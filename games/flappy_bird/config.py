@@ -0,0 +1,20 @@
+"""All the game settings are defined here."""
+
+#VARIABLES
+SCREEN_WIDHT = 400
+SCREEN_HEIGHT = 600
+SPEED = 20
+GRAVITY = 2.5
+GAME_SPEED = 15
+
+GROUND_WIDHT = 2 * SCREEN_WIDHT
+GROUND_HEIGHT= 100
+
+PIPE_WIDHT = 80
+PIPE_HEIGHT = 500
+
+PIPE_GAP = 150
+
+# Range for the height of the lower pipe, see get_random_pipes()
+PIPE_MIN_SIZE = 100
+PIPE_MAX_SIZE = 300
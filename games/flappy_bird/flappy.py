@@ -1,233 +1,263 @@
-import pygame, random, time
-from pygame.locals import *
-from pathlib import Path
-
-#VARIABLES
-SCREEN_WIDHT = 400
-SCREEN_HEIGHT = 600
-SPEED = 20
-GRAVITY = 2.5
-GAME_SPEED = 15
-
-GROUND_WIDHT = 2 * SCREEN_WIDHT
-GROUND_HEIGHT= 100
-
-PIPE_WIDHT = 80
-PIPE_HEIGHT = 500
-
-PIPE_GAP = 150
-
-dd = Path(__file__).parent
-
-
-wing = dd/'assets/audio/wing.wav'
-hit = dd/'assets/audio/hit.wav'
-
-pygame.mixer.init()
-
-
-class Bird(pygame.sprite.Sprite):
-
-    def __init__(self):
-        pygame.sprite.Sprite.__init__(self)
-
-        self.images =  [pygame.image.load(dd/'assets/sprites/bluebird-upflap.png').convert_alpha(),
-                        pygame.image.load(dd/'assets/sprites/bluebird-midflap.png').convert_alpha(),
-                        pygame.image.load(dd/'assets/sprites/bluebird-downflap.png').convert_alpha()]
-
-        self.speed = SPEED
-
-        self.current_image = 0
-        self.image = pygame.image.load(dd/'assets/sprites/bluebird-upflap.png').convert_alpha()
-        self.mask = pygame.mask.from_surface(self.image)
-
-        self.rect = self.image.get_rect()
-        self.rect[0] = SCREEN_WIDHT / 6 # .rect[0] is the x position
-        self.rect[1] = SCREEN_HEIGHT / 2 # .rect[1] is the y position
-
-    def update(self):
-        self.current_image = (self.current_image + 1) % 3
-        self.image = self.images[self.current_image]
-        self.speed += GRAVITY
-
-        #UPDATE HEIGHT
-        self.rect[1] += self.speed
-
-    def bump(self):
-        self.speed = -SPEED
-
-    def begin(self):
-        self.current_image = (self.current_image + 1) % 3
-        self.image = self.images[self.current_image]
-
-
-
-
-class Pipe(pygame.sprite.Sprite):
-
-    def __init__(self, inverted, xpos, ysize):
-        pygame.sprite.Sprite.__init__(self)
-
-        self. image = pygame.image.load(dd/'assets/sprites/pipe-green.png').convert_alpha()
-        self.image = pygame.transform.scale(self.image, (PIPE_WIDHT, PIPE_HEIGHT))
-
-
-        self.rect = self.image.get_rect()
-        self.rect[0] = xpos
-
-        if inverted:
-            self.image = pygame.transform.flip(self.image, False, True)
-            self.rect[1] = - (self.rect[3] - ysize)
-        else:
-            self.rect[1] = SCREEN_HEIGHT - ysize
-
-
-        self.mask = pygame.mask.from_surface(self.image)
-
-
-    def update(self):
-        self.rect[0] -= GAME_SPEED # Move the pipe to the left
-
-        
-
-class Ground(pygame.sprite.Sprite):
-    
-    def __init__(self, xpos):
-        pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.image.load(dd/'assets/sprites/base.png').convert_alpha()
-        self.image = pygame.transform.scale(self.image, (GROUND_WIDHT, GROUND_HEIGHT))
-
-        self.mask = pygame.mask.from_surface(self.image)
-
-        self.rect = self.image.get_rect()
-        self.rect[0] = xpos
-        self.rect[1] = SCREEN_HEIGHT - GROUND_HEIGHT
-    def update(self):
-        self.rect[0] -= GAME_SPEED
-
-def is_off_screen(sprite):
-    return sprite.rect[0] < -(sprite.rect[2])
-
-def get_random_pipes(xpos):
-    size = random.randint(100, 300)
-    pipe = Pipe(False, xpos, size)
-    pipe_inverted = Pipe(True, xpos, SCREEN_HEIGHT - size - PIPE_GAP)
-    return pipe, pipe_inverted
-
-pygame.init()
-    
-    
-screen = pygame.display.set_mode((SCREEN_WIDHT, SCREEN_HEIGHT))
-pygame.display.set_caption('Flappy Bird')
-
-
-BACKGROUND = pygame.image.load(dd / 'assets/sprites/background-day.png')
-BACKGROUND = pygame.transform.scale(BACKGROUND, (SCREEN_WIDHT, SCREEN_HEIGHT))
-BEGIN_IMAGE = pygame.image.load(dd/ 'assets/sprites/message.png').convert_alpha()
-
-
-    
-def main():
-    
-    bird_group = pygame.sprite.Group()
-    bird = Bird()
-    bird_group.add(bird)
-
-    ground_group = pygame.sprite.Group()
-
-    for i in range (2):
-        ground = Ground(GROUND_WIDHT * i)
-        ground_group.add(ground)
-
-    pipe_group = pygame.sprite.Group()
-    for i in range (2):
-        pipes = get_random_pipes(SCREEN_WIDHT * i + 800)
-        pipe_group.add(pipes[0])
-        pipe_group.add(pipes[1])
-
-
-    clock = pygame.time.Clock()
-
-    begin = True
-
-    while begin:
-
-        clock.tick(15)
-
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-            if event.type == KEYDOWN:
-                if event.key == K_SPACE or event.key == K_UP:
-                    bird.bump()
-                    pygame.mixer.music.load(wing)
-                    pygame.mixer.music.play()
-                    begin = False
-
-        screen.blit(BACKGROUND, (0, 0))
-        screen.blit(BEGIN_IMAGE, (120, 150))
-
-        if is_off_screen(ground_group.sprites()[0]):
-            ground_group.remove(ground_group.sprites()[0])
-
-            new_ground = Ground(GROUND_WIDHT - 20)
-            ground_group.add(new_ground)
-
-        bird.begin()
-        ground_group.update()
-
-        bird_group.draw(screen)
-        ground_group.draw(screen)
-
-        pygame.display.update()
-
-
-    while True:
-
-        clock.tick(15)
-
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-            if event.type == KEYDOWN:
-                if event.key == K_SPACE or event.key == K_UP:
-                    bird.bump()
-                    pygame.mixer.music.load(wing)
-                    pygame.mixer.music.play()
-
-        screen.blit(BACKGROUND, (0, 0))
-
-        if is_off_screen(ground_group.sprites()[0]):
-            ground_group.remove(ground_group.sprites()[0])
-
-            new_ground = Ground(GROUND_WIDHT - 20)
-            ground_group.add(new_ground)
-
-        if is_off_screen(pipe_group.sprites()[0]):
-            pipe_group.remove(pipe_group.sprites()[0])
-            pipe_group.remove(pipe_group.sprites()[0])
-
-            pipes = get_random_pipes(SCREEN_WIDHT * 2)
-
-            pipe_group.add(pipes[0])
-            pipe_group.add(pipes[1])
-
-        bird_group.update()
-        ground_group.update()
-        pipe_group.update()
-
-        bird_group.draw(screen)
-        pipe_group.draw(screen)
-        ground_group.draw(screen)
-
-        pygame.display.update()
-
-        if (pygame.sprite.groupcollide(bird_group, ground_group, False, False, pygame.sprite.collide_mask) or
-                pygame.sprite.groupcollide(bird_group, pipe_group, False, False, pygame.sprite.collide_mask)):
-            pygame.mixer.music.load(hit)
-            pygame.mixer.music.play()
-            time.sleep(1)
-            break
-
-while True:
-    main()
\ No newline at end of file
+import pygame, random, time
+from pygame.locals import *
+from pathlib import Path
+
+from config import *
+
+dd = Path(__file__).parent
+
+
+wing = dd/'assets/audio/wing.wav'
+hit = dd/'assets/audio/hit.wav'
+
+
+class Assets:
+    """The window, the sound and the images, set up the first time they are used.
+
+    Importing this module does not open a window or load anything. A headless
+    harness can replace `assets` before calling main(), e.g. with
+    Assets(screen=pygame.Surface((SCREEN_WIDHT, SCREEN_HEIGHT))).
+    """
+
+    def __init__(self, screen=None):
+        self._screen = screen
+        self._images = {}
+
+    @property
+    def screen(self):
+        if self._screen is None:
+            pygame.mixer.init()
+            pygame.init()
+            self._screen = pygame.display.set_mode((SCREEN_WIDHT, SCREEN_HEIGHT))
+            pygame.display.set_caption('Flappy Bird')
+        return self._screen
+
+    def image(self, name, size=None, alpha=True):
+        """Returns an image from assets/sprites, scaled to size, loaded and converted only once."""
+        key = (name, size)
+        if key not in self._images:
+            self.screen  # Open the window first, so the image can be converted
+            image = pygame.image.load(dd/'assets/sprites'/name)
+            try:
+                image = image.convert_alpha() if alpha else image.convert()
+            except pygame.error:
+                pass  # No window, as with a screen given by a headless harness
+            if size is not None:
+                image = pygame.transform.scale(image, size)
+            self._images[key] = image
+        return self._images[key]
+
+    def play(self, sound):
+        """Plays a sound, if there is a mixer to play it on."""
+        if pygame.mixer.get_init():
+            pygame.mixer.music.load(sound)
+            pygame.mixer.music.play()
+
+
+assets = Assets()
+
+
+class Bird(pygame.sprite.Sprite):
+
+    def __init__(self):
+        pygame.sprite.Sprite.__init__(self)
+
+        self.images =  [assets.image('bluebird-upflap.png'),
+                        assets.image('bluebird-midflap.png'),
+                        assets.image('bluebird-downflap.png')]
+
+        self.speed = SPEED
+
+        self.current_image = 0
+        self.image = self.images[0]
+        self.mask = pygame.mask.from_surface(self.image)
+
+        self.rect = self.image.get_rect()
+        self.rect[0] = SCREEN_WIDHT / 6 # .rect[0] is the x position
+        self.rect[1] = SCREEN_HEIGHT / 2 # .rect[1] is the y position
+
+    def update(self):
+        self.current_image = (self.current_image + 1) % 3
+        self.image = self.images[self.current_image]
+        self.speed += GRAVITY
+
+        #UPDATE HEIGHT
+        self.rect[1] += self.speed
+
+    def bump(self):
+        self.speed = -SPEED
+
+    def begin(self):
+        self.current_image = (self.current_image + 1) % 3
+        self.image = self.images[self.current_image]
+
+
+
+
+class Pipe(pygame.sprite.Sprite):
+
+    def __init__(self, inverted, xpos, ysize):
+        pygame.sprite.Sprite.__init__(self)
+
+        self.image = assets.image('pipe-green.png', (PIPE_WIDHT, PIPE_HEIGHT))
+
+
+        self.rect = self.image.get_rect()
+        self.rect[0] = xpos
+
+        if inverted:
+            self.image = pygame.transform.flip(self.image, False, True)
+            self.rect[1] = - (self.rect[3] - ysize)
+        else:
+            self.rect[1] = SCREEN_HEIGHT - ysize
+
+
+        self.mask = pygame.mask.from_surface(self.image)
+
+
+    def update(self):
+        self.rect[0] -= GAME_SPEED # Move the pipe to the left
+
+        
+
+class Ground(pygame.sprite.Sprite):
+    
+    def __init__(self, xpos):
+        pygame.sprite.Sprite.__init__(self)
+        self.image = assets.image('base.png', (GROUND_WIDHT, GROUND_HEIGHT))
+
+        self.mask = pygame.mask.from_surface(self.image)
+
+        self.rect = self.image.get_rect()
+        self.rect[0] = xpos
+        self.rect[1] = SCREEN_HEIGHT - GROUND_HEIGHT
+    def update(self):
+        self.rect[0] -= GAME_SPEED
+
+def is_off_screen(sprite):
+    return sprite.rect[0] < -(sprite.rect[2])
+
+def get_random_pipes(xpos):
+    size = random.randint(PIPE_MIN_SIZE, PIPE_MAX_SIZE)
+    pipe = Pipe(False, xpos, size)
+    pipe_inverted = Pipe(True, xpos, SCREEN_HEIGHT - size - PIPE_GAP)
+    return pipe, pipe_inverted
+
+def new_game():
+    """Returns the bird, and the sprite groups for the bird, the ground and the pipes of a new game."""
+    bird_group = pygame.sprite.Group()
+    bird = Bird()
+    bird_group.add(bird)
+
+    ground_group = pygame.sprite.Group()
+
+    for i in range (2):
+        ground = Ground(GROUND_WIDHT * i)
+        ground_group.add(ground)
+
+    pipe_group = pygame.sprite.Group()
+    for i in range (2):
+        pipes = get_random_pipes(SCREEN_WIDHT * i + 800)
+        pipe_group.add(pipes[0])
+        pipe_group.add(pipes[1])
+
+    return bird, bird_group, ground_group, pipe_group
+
+
+def step(screen, bird_group, ground_group, pipe_group):
+    """Moves everything on by one frame and draws it. Returns True if the bird has hit the ground or a pipe."""
+    screen.blit(assets.image('background-day.png', (SCREEN_WIDHT, SCREEN_HEIGHT), alpha=False), (0, 0))
+
+    if is_off_screen(ground_group.sprites()[0]):
+        ground_group.remove(ground_group.sprites()[0])
+
+        new_ground = Ground(GROUND_WIDHT - 20)
+        ground_group.add(new_ground)
+
+    if is_off_screen(pipe_group.sprites()[0]):
+        pipe_group.remove(pipe_group.sprites()[0])
+        pipe_group.remove(pipe_group.sprites()[0])
+
+        pipes = get_random_pipes(SCREEN_WIDHT * 2)
+
+        pipe_group.add(pipes[0])
+        pipe_group.add(pipes[1])
+
+    bird_group.update()
+    ground_group.update()
+    pipe_group.update()
+
+    bird_group.draw(screen)
+    pipe_group.draw(screen)
+    ground_group.draw(screen)
+
+    return bool(pygame.sprite.groupcollide(bird_group, ground_group, False, False, pygame.sprite.collide_mask) or
+                pygame.sprite.groupcollide(bird_group, pipe_group, False, False, pygame.sprite.collide_mask))
+
+
+def main():
+    screen = assets.screen
+    BACKGROUND = assets.image('background-day.png', (SCREEN_WIDHT, SCREEN_HEIGHT), alpha=False)
+    BEGIN_IMAGE = assets.image('message.png')
+
+    bird, bird_group, ground_group, pipe_group = new_game()
+
+    clock = pygame.time.Clock()
+
+    begin = True
+
+    while begin:
+
+        clock.tick(15)
+
+        for event in pygame.event.get():
+            if event.type == QUIT:
+                pygame.quit()
+            if event.type == KEYDOWN:
+                if event.key == K_SPACE or event.key == K_UP:
+                    bird.bump()
+                    assets.play(wing)
+                    begin = False
+
+        screen.blit(BACKGROUND, (0, 0))
+        screen.blit(BEGIN_IMAGE, (120, 150))
+
+        if is_off_screen(ground_group.sprites()[0]):
+            ground_group.remove(ground_group.sprites()[0])
+
+            new_ground = Ground(GROUND_WIDHT - 20)
+            ground_group.add(new_ground)
+
+        bird.begin()
+        ground_group.update()
+
+        bird_group.draw(screen)
+        ground_group.draw(screen)
+
+        pygame.display.update()
+
+
+    while True:
+
+        clock.tick(15)
+
+        for event in pygame.event.get():
+            if event.type == QUIT:
+                pygame.quit()
+            if event.type == KEYDOWN:
+                if event.key == K_SPACE or event.key == K_UP:
+                    bird.bump()
+                    assets.play(wing)
+
+        crashed = step(screen, bird_group, ground_group, pipe_group)
+
+        pygame.display.update()
+
+        if crashed:
+            assets.play(hit)
+            time.sleep(1)
+            break
+
+if __name__ == "__main__":
+    while True:
+        main()
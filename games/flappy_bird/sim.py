@@ -0,0 +1,335 @@
+"""Headless Flappy Bird simulation for training and evaluating bots.
+
+The rules are the same as in flappy.py, frame for frame: a flap sets the speed
+to -SPEED, gravity is added and the bird moves, the pipes scroll left by
+GAME_SPEED and a new pair is spawned when the front pair leaves the screen.
+Collisions use the same sprite masks as the game, so a bot trained here
+crashes exactly where it would crash in the real game.
+
+Nothing is drawn and no window is opened. FlappyBatch keeps the state of many
+independent games in NumPy arrays and advances all of them with one call to
+step(); run_parallel() spreads batches over a process pool.
+
+Run this file to measure the simulation speed on this machine:
+
+    python sim.py
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pygame
+
+import config
+
+dd = Path(__file__).parent
+
+# Index of each value in an observation row
+OBS_Y, OBS_SPEED, OBS_PIPE_DX, OBS_GAP_TOP, OBS_GAP_BOTTOM = range(5)
+
+_profiles = {}
+
+
+def settings(**overrides):
+    """Returns the game settings from config.py, with some values replaced by overrides."""
+    values = {name: getattr(config, name) for name in dir(config) if name.isupper()}
+    for name in overrides:
+        if name not in values:
+            raise ValueError(f"Unknown Flappy Bird setting: {name}")
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def column_intervals(surface):
+    """Returns the first and last opaque row of every column of a surface, and
+    whether the column has any opaque pixel at all.
+
+    The bird and pipe masks have a single run of opaque pixels in every column,
+    so two of them overlap exactly when one of their columns overlaps.
+    """
+    mask = pygame.mask.from_surface(surface)
+    width, height = mask.get_size()
+    bits = np.array([[mask.get_at((x, y)) for y in range(height)] for x in range(width)], dtype=bool)
+    solid = bits.any(axis=1)
+    top = np.where(solid, bits.argmax(axis=1), 0)
+    bottom = np.where(solid, height - 1 - bits[:, ::-1].argmax(axis=1), -1)
+    return top, bottom, solid
+
+
+def shape_profiles(pipe_width, pipe_height):
+    """Loads the bird and pipe shapes, scaled the same way as in flappy.py."""
+    key = (pipe_width, pipe_height)
+    if key not in _profiles:
+        # Bird.mask is made once from the upflap image and never changes, so the
+        # game always collides with that shape whatever image is displayed.
+        bird = pygame.image.load(dd / 'assets/sprites/bluebird-upflap.png')
+        pipe = pygame.image.load(dd / 'assets/sprites/pipe-green.png')
+        pipe = pygame.transform.scale(pipe, (pipe_width, pipe_height))
+        _profiles[key] = column_intervals(bird), column_intervals(pipe)
+    return _profiles[key]
+
+
+class FlappyBatch:
+    """Many independent games of Flappy Bird, advanced together.
+
+    Finished games are restarted automatically inside step(), so the batch
+    always holds n running games.
+
+    Attributes:
+        n (int): Number of games in the batch.
+        y (numpy.ndarray): Top of each bird, in pixels.
+        speed (numpy.ndarray): Vertical speed of each bird.
+        pipe_x (numpy.ndarray): Left edge of the front and back pipe pairs, shape (n, 2).
+        pipe_size (numpy.ndarray): Height of the lower pipe of each pair, shape (n, 2).
+        steps (numpy.ndarray): Frames survived in the current game.
+        score (numpy.ndarray): Pipe pairs passed in the current game.
+    """
+
+    def __init__(self, n, seed=None, **overrides):
+        """
+        Args:
+            n (int): Number of games to run.
+            seed (int or numpy.random.SeedSequence, optional): Seed for the pipe heights.
+            **overrides: Values that replace settings from config.py, e.g. PIPE_GAP=120.
+        """
+        self.n = n
+        self.s = settings(**overrides)
+        self.rng = np.random.default_rng(seed)
+
+        s = self.s
+        (b_top, b_bottom, b_solid), (p_top, p_bottom, p_solid) = shape_profiles(s.PIPE_WIDHT, s.PIPE_HEIGHT)
+        self.bird_x = int(s.SCREEN_WIDHT / 6)
+        self.bird_height = int(b_bottom.max()) + 1
+        self._bird_cols = self.bird_x + np.arange(len(b_top))
+        self._bird_top, self._bird_bottom, self._bird_solid = b_top, b_bottom, b_solid
+        self._bird_lowest = int(b_bottom[b_solid].max())
+        self._pipe_top, self._pipe_bottom, self._pipe_solid = p_top, p_bottom, p_solid
+
+        self.y = np.zeros(n, dtype=np.int64)
+        self.speed = np.zeros(n, dtype=np.float64)
+        self.pipe_x = np.zeros((n, 2), dtype=np.int64)
+        self.pipe_size = np.zeros((n, 2), dtype=np.int64)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.reset()
+
+    def _random_sizes(self, shape):
+        return self.rng.integers(self.s.PIPE_MIN_SIZE, self.s.PIPE_MAX_SIZE + 1, shape)
+
+    def reset(self, which=None):
+        """Starts new games, as if the player flapped to leave the start screen.
+
+        Args:
+            which (numpy.ndarray, optional): Boolean mask of the games to restart. Defaults to all of them.
+
+        Returns:
+            numpy.ndarray: The observations, see observe().
+        """
+        if which is None:
+            which = np.ones(self.n, dtype=bool)
+        count = int(which.sum())
+        s = self.s
+        self.y[which] = int(s.SCREEN_HEIGHT / 2)
+        self.speed[which] = -s.SPEED
+        self.pipe_x[which] = [s.SCREEN_WIDHT * i + 800 for i in range(2)]
+        self.pipe_size[which] = self._random_sizes((count, 2))
+        self.steps[which] = 0
+        self.score[which] = 0
+        return self.observe()
+
+    def observe(self):
+        """Returns one row per game: the bird's y and speed, the distance to the next
+        pipe pair and the top and bottom of its gap. Index the columns with OBS_*."""
+        s = self.s
+        rows = np.arange(self.n)
+        nxt = (self.pipe_x[:, 0] + s.PIPE_WIDHT < self.bird_x).astype(np.int64)
+        size = self.pipe_size[rows, nxt]
+        obs = np.empty((self.n, 5), dtype=np.float32)
+        obs[:, OBS_Y] = self.y
+        obs[:, OBS_SPEED] = self.speed
+        obs[:, OBS_PIPE_DX] = self.pipe_x[rows, nxt] - self.bird_x
+        obs[:, OBS_GAP_TOP] = s.SCREEN_HEIGHT - size - s.PIPE_GAP
+        obs[:, OBS_GAP_BOTTOM] = s.SCREEN_HEIGHT - size
+        return obs
+
+    def crashed(self):
+        """Returns a boolean array, True for birds touching the ground or a pipe."""
+        s = self.s
+        hit = self.y + self._bird_lowest >= s.SCREEN_HEIGHT - s.GROUND_HEIGHT
+
+        # Column of the pipe image under each column of the bird, shape (n, 2, bird width)
+        col = self._bird_cols[None, None, :] - self.pipe_x[:, :, None]
+        inside = (col >= 0) & (col < s.PIPE_WIDHT) & self._bird_solid
+        if not inside.any():
+            return hit
+        col = np.clip(col, 0, s.PIPE_WIDHT - 1)
+        solid = inside & self._pipe_solid[col]
+        p_top, p_bottom = self._pipe_top[col], self._pipe_bottom[col]
+
+        bird_top = self.y[:, None, None] + self._bird_top
+        bird_bottom = self.y[:, None, None] + self._bird_bottom
+
+        # The lower pipe stands on the bottom of the screen
+        lower_y = (s.SCREEN_HEIGHT - self.pipe_size)[:, :, None]
+        lower = np.maximum(bird_top, lower_y + p_top) <= np.minimum(bird_bottom, lower_y + p_bottom)
+
+        # The upper pipe is flipped and hangs down to the top of the gap
+        upper_y = (s.SCREEN_HEIGHT - self.pipe_size - s.PIPE_GAP - s.PIPE_HEIGHT)[:, :, None]
+        flip = s.PIPE_HEIGHT - 1
+        upper = np.maximum(bird_top, upper_y + flip - p_bottom) <= np.minimum(bird_bottom, upper_y + flip - p_top)
+
+        return hit | (solid & (lower | upper)).any(axis=(1, 2))
+
+    def step(self, flap):
+        """Advances every game by one frame.
+
+        Args:
+            flap (array-like): Boolean per game, True to flap on this frame.
+
+        Returns:
+            tuple: (observations, rewards, dones, info). The reward is 1 for every
+            frame survived. info holds the 'steps' and 'score' each game had when it
+            ended; games that are done have already been restarted.
+        """
+        s = self.s
+        flap = np.asarray(flap, dtype=bool)
+        self.speed[flap] = -s.SPEED
+
+        # Replace the front pair once it is off screen, before anything moves
+        off = self.pipe_x[:, 0] < -s.PIPE_WIDHT
+        if off.any():
+            self.pipe_x[off, 0] = self.pipe_x[off, 1]
+            self.pipe_size[off, 0] = self.pipe_size[off, 1]
+            self.pipe_x[off, 1] = s.SCREEN_WIDHT * 2
+            self.pipe_size[off, 1] = self._random_sizes(int(off.sum()))
+
+        # pygame truncates the float position when it is stored in the rect
+        self.speed += s.GRAVITY
+        self.y = np.trunc(self.y + self.speed).astype(np.int64)
+
+        was_ahead = self.pipe_x + s.PIPE_WIDHT >= self.bird_x
+        self.pipe_x -= s.GAME_SPEED
+        self.score += (was_ahead & (self.pipe_x + s.PIPE_WIDHT < self.bird_x)).sum(axis=1)
+
+        done = self.crashed()
+        rewards = np.where(done, 0.0, 1.0)
+        self.steps += ~done
+        info = {'steps': self.steps.copy(), 'score': self.score.copy()}
+        if done.any():
+            self.reset(done)
+        return self.observe(), rewards, done, info
+
+
+class FlappyEnv:
+    """A single headless game with a reset()/step() interface.
+
+    Unlike FlappyBatch, a finished game is not restarted until reset() is called.
+    """
+
+    def __init__(self, seed=None, **overrides):
+        self.batch = FlappyBatch(1, seed, **overrides)
+        self.done = False
+
+    def reset(self):
+        """Starts a new game and returns its observation."""
+        self.done = False
+        return self.batch.reset()[0]
+
+    def step(self, flap):
+        """Advances the game by one frame. Returns (observation, reward, done, info)."""
+        if self.done:
+            raise RuntimeError("The game is over, call reset() to start a new one")
+        obs, rewards, dones, info = self.batch.step([flap])
+        self.done = bool(dones[0])
+        info = {k: int(v[0]) for k, v in info.items()}
+        if self.done:
+            # step() has already restarted the batch, report the state that crashed
+            obs = None
+        else:
+            obs = obs[0]
+        return obs, float(rewards[0]), self.done, info
+
+
+def heuristic_policy(obs):
+    """A simple bot: flap when the bird is falling towards the bottom of the gap."""
+    bottom = obs[:, OBS_Y] + 24
+    return (bottom > obs[:, OBS_GAP_BOTTOM] - 25) & (obs[:, OBS_SPEED] > 0)
+
+
+def run_batch(policy, n_envs, steps, seed=None, overrides=None):
+    """Plays steps frames of n_envs games with a policy and summarises the games that ended.
+
+    Args:
+        policy (callable): Takes the observation array and returns the flap array.
+        n_envs (int): Number of games played at once.
+        steps (int): Number of frames to play.
+        seed (int or numpy.random.SeedSequence, optional): Seed for the games.
+        overrides (dict, optional): Settings that replace values from config.py.
+
+    Returns:
+        dict: Frame count and statistics of the finished games.
+    """
+    batch = FlappyBatch(n_envs, seed, **(overrides or {}))
+    obs = batch.observe()
+    games = score_sum = steps_sum = best = 0
+    for _ in range(steps):
+        obs, _, done, info = batch.step(policy(obs))
+        if done.any():
+            games += int(done.sum())
+            score_sum += int(info['score'][done].sum())
+            steps_sum += int(info['steps'][done].sum())
+            best = max(best, int(info['score'][done].max()))
+    return {'frames': n_envs * steps, 'games': games, 'score_sum': score_sum,
+            'steps_sum': steps_sum, 'best_score': best}
+
+
+def run_parallel(policy=heuristic_policy, n_envs=1024, steps=1000, workers=None, seed=None, **overrides):
+    """Runs one batch per worker process and combines the results of run_batch().
+
+    The policy must be a module level function so it can be sent to the workers.
+    Each worker gets an independent seed derived from seed, so the results are
+    reproducible for a given seed and number of workers.
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(run_batch, policy, n_envs, steps, s, overrides) for s in seeds]
+        results = [f.result() for f in futures]
+
+    total = {k: sum(r[k] for r in results) for k in ('frames', 'games', 'score_sum', 'steps_sum')}
+    total['best_score'] = max(r['best_score'] for r in results)
+    total['mean_score'] = total['score_sum'] / total['games'] if total['games'] else 0.0
+    total['mean_steps'] = total['steps_sum'] / total['games'] if total['games'] else 0.0
+    return total
+
+
+def sweep_session(params, seed, max_steps=10000):
+    """Plays one game with heuristic_policy, for jtlgames.sweep.
+
+    Args:
+        params (dict): Settings that replace values from config.py.
+        seed (int): Seed for the pipe heights.
+        max_steps (int): Frames after which a game that is still going is stopped.
+
+    Returns:
+        dict: Frames survived, pipes passed and whether the bird was still alive at the end.
+    """
+    env = FlappyEnv(seed, **params)
+    obs = env.reset()
+    for _ in range(max_steps):
+        obs, _, done, info = env.step(bool(heuristic_policy(obs[None])[0]))
+        if done:
+            break
+    return {'steps': info['steps'], 'score': info['score'], 'survived': int(not done)}
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    result = run_parallel(steps=2000, seed=1)
+    elapsed = time.perf_counter() - start
+    print(f"{result['frames']:,} frames in {elapsed:.1f}s, {result['frames'] / elapsed * 60:,.0f} frames per minute")
+    print(f"{result['games']:,} games, mean score {result['mean_score']:.2f}, best {result['best_score']}")
@@ -1,6 +1,8 @@
 import pygame
 import math
 
+from jtlgames.coroutines import Scheduler
+
 # Initialize Pygame
 pygame.init()
 
@@ -41,6 +43,7 @@ class Player:
         """
         self.position = pygame.math.Vector2(x, y)
         self.direction_vector = pygame.math.Vector2(Settings.INITIAL_LENGTH, 0)  # Initial direction vector
+        self.moving = None  # The start and end of the move, while the player is moving
 
     def draw(self, show_line=True):
         """Draws the player and the direction vector on the screen."""
@@ -49,30 +52,35 @@ class Player:
         # The end position of the direction vector is the player's position plus the direction vector
         end_position = self.position + self.direction_vector
         
-        if show_line:
+        if self.moving:
+            # While moving, show the line the player is moving along
+            pygame.draw.line(screen, Settings.LINE_COLOR, *self.moving, 2)
+        elif show_line:
             pygame.draw.line(screen, Settings.LINE_COLOR, self.position, end_position, 2)
 
     def move(self):
-        """Moves the player in the direction of the current angle."""
-        
+        """Moves the player in the direction of the current angle.
+
+        This is a generator: it moves the player one step each time it is
+        resumed, and the scheduler resumes it once per frame, so the main
+        loop keeps drawing and handling events while the player moves.
+        """
         
-        init_position = self.position # Save the initial position for the animation
+        init_position = pygame.math.Vector2(self.position) # Save the initial position for the animation
         
         # Calculate the final position after moving. Its just addition!
         final_position = self.position + self.direction_vector
         
         # The rest is just for animation
         length = self.direction_vector.length()
-        N = int(length // 3)
+        N = max(1, int(length // 3))
         step = (final_position - self.position) / N
-       
+
+        self.moving = (init_position, final_position)
         for i in range(N):
             self.position += step
-            screen.fill(Settings.BACKGROUND_COLOR)
-            self.draw(show_line=False)
-            pygame.draw.line(screen, Settings.LINE_COLOR, init_position, final_position, 2)
-            pygame.display.flip()
-            clock.tick(Settings.FPS)
+            yield  # Wait for the next frame
+        self.moving = None
 
 def draw_vector_info(player):
     """Draws the vector information at the bottom of the screen."""
@@ -97,6 +105,7 @@ def draw_vector_info(player):
 
 def main():
     player = Player(Settings.SCREEN_WIDTH // 2, Settings.SCREEN_HEIGHT // 2)
+    scheduler = Scheduler()  # Runs the player's move animation, one step per frame
     running = True
     
     pygame.key.set_repeat(50, 50)
@@ -119,13 +128,16 @@ def main():
             player.direction_vector.scale_to_length(player.direction_vector.length() + Settings.LENGTH_CHANGE)
         elif keys[pygame.K_DOWN]:
             player.direction_vector.scale_to_length(player.direction_vector.length() - Settings.LENGTH_CHANGE)
-        elif keys[pygame.K_SPACE]:
-            player.move()
+        elif keys[pygame.K_SPACE] and not player.moving:
+            scheduler.start(player.move())
                 
-
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
+
+        # Take the next step of anything that is animating
+        scheduler.update(clock.get_time(), events)
                 
         # Draw the player and the direction vector
         player.draw()
@@ -1,28 +1,20 @@
 import pygame
 from jtlgames.spritesheet import SpriteSheet
+from jtlgames.animation import Clip
+from jtlgames.pixelscreen import PixelScreen
 from pathlib import Path
 
 images = Path(__file__).parent / 'images'
 
 
-def scale_sprites(sprites, scale):
-    """Scale a list of sprites by a given factor.
-        
-    Args:
-        sprites (list): List of pygame.Surface objects.
-        scale (int): Scale factor.
-
-    Returns:
-        list: List of scaled pygame.Surface objects.
-    """
-    return [pygame.transform.scale(sprite, (sprite.get_width() * scale, sprite.get_height() * scale)) for sprite in sprites]
-
 def main():
     # Initialize Pygame
     pygame.init()
 
-    # Set up the display
-    screen = pygame.display.set_mode((640, 480))
+    # Set up the display. The sprites are drawn at their own size, 16 x 16, on a
+    # 160 x 120 screen, which is shown four times bigger in a 640 x 480 window.
+    pixels = PixelScreen((160, 120), scale=4)
+    screen = pixels.surface
     pygame.display.set_caption("Sprite Animation Test")
 
     # Load the sprite sheet
@@ -32,16 +24,14 @@ def main():
 
 
     # Load a strip sprites
-    frog_sprites = scale_sprites(spritesheet.load_strip(0, 4, colorkey=-1) , 4)
-    allig_sprites = scale_sprites(spritesheet.load_strip( (0,4), 7, colorkey=-1), 4)
+    frog_sprites = spritesheet.load_strip(0, 4, colorkey=-1)
+    allig_sprites = spritesheet.load_strip( (0,4), 7, colorkey=-1)
 
     # Compose an image
     log = spritesheet.compose_horiz([24, 25, 26], colorkey=-1)
-    log = pygame.transform.scale(log, (log.get_width() * 4, log.get_height() * 4))
 
     # Variables for animation
     frog_index = 0
-    allig_index = 0
     frames_per_image = 6
     frame_count = 0
 
@@ -50,30 +40,14 @@ def main():
     
     sprite_rect = frog_sprites[0].get_rect(center=(screen.get_width() // 2, screen.get_height() // 2))
     
-    pygame.math.Vector2(1, 0)
-    def draw_alligator(alligator, index):
-        """Creates a composed image of the alligator sprites.
-
-        Args:
-            alligator (list): List of alligator sprites.
-            index (int): Index value to determine the right side sprite.
+    # The alligator is made of three parts: the head and body stay the same,
+    # and the tail moves through the rest of the sprites. Each combination is
+    # composed once, the first time it is shown, then reused.
+    schedule = [(0, 1, i) for i in range(2, len(allig_sprites))]
+    alligator = Clip.composite(allig_sprites, schedule, frame_time=100)
 
-        Returns:
-            pygame.Surface: Composed image of the alligator.
-        """
-        
-        index = index % (len(alligator)-2)
-        
-        width = alligator[0].get_width()
-        height = alligator[0].get_height()
-        composed_image = pygame.Surface((width * 3, height), pygame.SRCALPHA)
+    clock = pygame.time.Clock()
 
-        composed_image.blit(alligator[0], (0, 0))
-        composed_image.blit(alligator[1], (width, 0))
-        composed_image.blit(alligator[(index + 2) % len(alligator)], (width * 2, 0))
-
-        return composed_image
-    
     while running:
         screen.fill((0, 0, 139))  # Clear screen with deep blue
 
@@ -82,29 +56,28 @@ def main():
         
         if frame_count % frames_per_image == 0: 
             frog_index = (frog_index + 1) % len(frog_sprites)
-            allig_index = (allig_index + 1) % len(allig_sprites)
         
         # Get the current sprite and display it in the middle of the screen
 
         
         screen.blit(frog_sprites[frog_index], sprite_rect)
 
-        composed_alligator = draw_alligator(allig_sprites, allig_index)
-        screen.blit(composed_alligator,  sprite_rect.move(0, 100))
+        alligator.draw(screen, sprite_rect.move(0, 25))
 
-        screen.blit(log,  sprite_rect.move(0, -100))
+        screen.blit(log,  sprite_rect.move(0, -25))
 
 
-        # Update the display
-        pygame.display.flip()
+        # Scale the small screen up into the window, and show it
+        pixels.present()
 
         # Handle events
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
 
-        # Cap the frame rate
-        pygame.time.Clock().tick(60)
+        # Cap the frame rate, and move the alligator on by the time that has passed
+        dt = clock.tick(60)
+        alligator.update(dt)
 
     # Quit Pygame
     pygame.quit()
@@ -14,3 +14,11 @@ except PackageNotFoundError:  # pragma: no cover
     __version__ = "unknown"
 finally:
     del version, PackageNotFoundError
+
+
+def __getattr__(name):
+    # Imported when first used, so importing jtlgames does not import pygame
+    if name == 'load_image':
+        from jtlgames.images import load_image
+        return load_image
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,165 @@
+"""Animations that advance with elapsed time, including ones built from several parts.
+
+A Clip plays a list of frames, each shown for a time in milliseconds, so it runs
+at the same speed whatever the frame rate. Call update() with the milliseconds
+since the last frame, for example the value returned by clock.tick(), then draw()
+it with a single blit.
+
+Clip.composite() builds a clip whose frames are made by blitting several parts
+side by side, like an alligator made of a head, a body and a tail that moves.
+Each frame in the schedule lists the parts it is made of. A composite frame is
+drawn the first time it is shown, or all at once with precompute=True, and then
+reused, so playing the clip does not create any surfaces.
+
+Example::
+
+    parts = spritesheet.load_strip((0, 4), 7, colorkey=-1)
+    schedule = [(0, 1, 2 + i) for i in range(5)]
+    alligator = Clip.composite(parts, schedule, frame_time=100)
+
+    while running:
+        dt = clock.tick(60)
+        alligator.update(dt)
+        alligator.draw(screen, (100, 200))
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+
+import pygame
+
+
+class CompositeFrames(object):
+    """A sequence of frames composed from parts, each composed once and then kept.
+
+    Frames with the same parts share one surface.
+
+    Attributes:
+        parts (list): The part images.
+        schedule (list): For each frame, the indices of the parts it is made of.
+        positions (list): Where each part of a frame goes, one (x, y) per slot.
+            Defaults to the parts side by side, left to right.
+        size (tuple): The size of a composed frame, big enough for every frame.
+    """
+    def __init__(self, parts, schedule, positions=None):
+        self.parts = list(parts)
+        self.schedule = [tuple(frame) for frame in schedule]
+        if positions is None:
+            slots = max(len(frame) for frame in self.schedule)
+            width = max(part.get_width() for part in self.parts)
+            positions = [(i * width, 0) for i in range(slots)]
+        self.positions = list(positions)
+        self.size = (
+            max(x + self.parts[i].get_width() for key in self.schedule for (x, _), i in zip(self.positions, key)),
+            max(y + self.parts[i].get_height() for key in self.schedule for (_, y), i in zip(self.positions, key)),
+        )
+        self._images = {}
+
+    def __len__(self):
+        return len(self.schedule)
+
+    def __getitem__(self, index):
+        key = self.schedule[index]
+        if key not in self._images:
+            self._images[key] = self.compose(key)
+        return self._images[key]
+
+    def compose(self, key):
+        """Returns a new surface with the parts listed in key blitted at their positions."""
+        image = pygame.Surface(self.size, pygame.SRCALPHA)
+        try:
+            image = image.convert_alpha()
+        except pygame.error:
+            pass  # No display yet, keep the plain surface
+        image.fill((0, 0, 0, 0))
+        for pos, i in zip(self.positions, key):
+            image.blit(self.parts[i], pos)
+        return image
+
+    def precompute(self):
+        """Composes every frame now, rather than the first time each one is shown."""
+        for i in range(len(self)):
+            self[i]
+
+
+class Clip(object):
+    """A sequence of frames played back on elapsed time.
+
+    Attributes:
+        frames (sequence): The frame images; a list, or anything that can be indexed, like CompositeFrames.
+        durations (list): How long each frame is shown, in milliseconds.
+        loop (bool): Start again at the end, or stop on the last frame.
+        time (float): Milliseconds since the clip started, within one loop.
+    """
+    def __init__(self, frames, frame_time=100, loop=True):
+        """
+        Args:
+            frames (sequence): The frame images.
+            frame_time (int or list, optional): Milliseconds to show each frame,
+                either one time for all of them or one per frame. Defaults to 100.
+            loop (bool, optional): Start again at the end. Defaults to True.
+        """
+        self.frames = frames
+        if isinstance(frame_time, (int, float)):
+            frame_time = [frame_time] * len(frames)
+        if len(frame_time) != len(frames):
+            raise ValueError(f"Got {len(frame_time)} frame times for {len(frames)} frames")
+        self.durations = list(frame_time)
+        self._ends = list(accumulate(self.durations))
+        self.loop = loop
+        self.time = 0
+        self.index = 0
+
+    @classmethod
+    def composite(cls, parts, schedule, positions=None, frame_time=100, loop=True, precompute=False):
+        """Makes a clip whose frames are composed from parts.
+
+        Args:
+            parts (list): The part images.
+            schedule (list): For each frame, the indices of the parts it is made of, one per slot.
+            positions (list, optional): Where each slot goes in the frame. Defaults to side by side.
+            frame_time (int or list, optional): Milliseconds to show each frame. Defaults to 100.
+            loop (bool, optional): Start again at the end. Defaults to True.
+            precompute (bool, optional): Compose every frame now. Defaults to False, which
+                composes each frame the first time it is shown.
+        """
+        frames = CompositeFrames(parts, schedule, positions)
+        if precompute:
+            frames.precompute()
+        return cls(frames, frame_time, loop)
+
+    @property
+    def duration(self):
+        """Returns the length of the whole clip in milliseconds"""
+        return self._ends[-1] if self._ends else 0
+
+    @property
+    def done(self):
+        """Returns True when a clip that does not loop has reached its end"""
+        return not self.loop and self.time >= self.duration
+
+    @property
+    def image(self):
+        """Returns the current frame"""
+        return self.frames[self.index]
+
+    def reset(self):
+        """Goes back to the first frame."""
+        self.time = 0
+        self.index = 0
+
+    def update(self, dt):
+        """Advances the clip by dt milliseconds, skipping frames if dt is long."""
+        duration = self.duration
+        if duration <= 0:
+            return
+        self.time += dt
+        if self.loop:
+            self.time %= duration
+        else:
+            self.time = min(self.time, duration)
+        self.index = min(bisect_right(self._ends, self.time), len(self._ends) - 1)
+
+    def draw(self, surface, pos):
+        """Draws the current frame with its top left corner at pos."""
+        surface.blit(self.frames[self.index], pos)
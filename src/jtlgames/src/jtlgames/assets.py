@@ -0,0 +1,185 @@
+"""Load images and sounds on worker threads, while the game keeps drawing frames.
+
+Loading every image and sound before the first frame leaves the window black,
+or not open at all, until the slowest file is read. An AssetLoader reads and
+decodes the files on a pool of threads instead. pygame lets other threads run
+while it decodes an image or a sound, so the files load in parallel, and the
+game's own thread is free to draw a loading screen.
+
+Converting an image to the display format has to happen on the game's thread,
+so update(), called once a frame, finishes the assets that have been decoded:
+it converts the images with jtlgames.images.to_display_format(), resolves each
+asset's future, and posts an ASSET_LOADED event with the progress.
+
+Example::
+
+    loader = AssetLoader()
+    loader.image('background', 'assets/background.png')
+    loader.image('ship', 'assets/ship.png')
+    loader.sound('boom', 'assets/boom.wav')
+
+    # Show the loading screen until the assets needed first are ready
+    while not loader.ready('background', 'ship'):
+        for event in pygame.event.get():
+            if event.type == ASSET_LOADED:
+                print(f"Loaded {event.name}, {event.done} of {event.total}")
+        loader.update()
+        draw_progress_bar(screen, loader.progress)
+        pygame.display.flip()
+        clock.tick(60)
+
+    background = loader['background']
+"""
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pygame
+
+from .images import to_display_format
+
+__author__ = "Eric Busboom"
+__copyright__ = "Eric Busboom"
+__license__ = "MIT"
+
+# Posted by AssetLoader.update() for each finished asset, with the attributes
+# name, done and total, and error if it failed to load.
+ASSET_LOADED = pygame.event.custom_type()
+
+
+def _decode_image(path):
+    return pygame.image.load(path)
+
+
+def _decode_sound(path):
+    return pygame.mixer.Sound(path)
+
+
+class AssetLoader(object):
+    """Loads images and sounds on a thread pool.
+
+    Args:
+        max_workers (int): Threads to load with.
+        post_events (bool): Post an ASSET_LOADED event for each finished asset.
+
+    Attributes:
+        futures (dict): A Future for each asset, by name. It is done once the
+            asset is ready to use, after update() has finished it.
+        done (int): The number of finished assets, including failed ones.
+    """
+
+    def __init__(self, max_workers=4, post_events=True):
+        self.post_events = post_events
+        self.futures = {}
+        self.done = 0
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix='jtlgames-assets')
+        self._decoding = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def __len__(self):
+        """Returns the number of assets, loaded or not."""
+        return len(self.futures)
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+    def _add(self, name, decode, path, finish):
+        if name in self.futures:
+            raise KeyError(f"There is already an asset named {name!r}")
+        future = self.futures[name] = Future()
+        self._decoding[name] = (self._pool.submit(decode, path), finish)
+        return future
+
+    def image(self, name, path, colorkey=None):
+        """Starts loading an image, which is converted to the display format when it is finished.
+
+        Args:
+            name (str): The name to get the image by.
+            path (str or Path): The image file.
+            colorkey (tuple, optional): A color to make transparent, for images with no alpha channel.
+
+        Returns:
+            Future: Resolves to the pygame.Surface.
+        """
+        return self._add(name, _decode_image, path, lambda image: to_display_format(image, colorkey))
+
+    def sound(self, name, path):
+        """Starts loading a sound. The mixer must be initialized first.
+
+        Returns:
+            Future: Resolves to the pygame.mixer.Sound.
+        """
+        return self._add(name, _decode_sound, path, lambda sound: sound)
+
+    def _finish(self, name):
+        decoding, finish = self._decoding.pop(name)
+        future = self.futures[name]
+        error = decoding.exception()
+        if error is None:
+            try:
+                future.set_result(finish(decoding.result()))
+            except Exception as e:
+                error = e
+        if error is not None:
+            future.set_exception(error)
+        self.done += 1
+        if self.post_events:
+            attrs = {'name': name, 'done': self.done, 'total': len(self.futures)}
+            if error is not None:
+                attrs['error'] = error
+            pygame.event.post(pygame.event.Event(ASSET_LOADED, attrs))
+
+    def update(self, max_ms=None):
+        """Finishes the assets that have been decoded. Call it from the game's thread, once a frame.
+
+        Args:
+            max_ms (float, optional): Stop after this long, and finish the rest on
+                the next update, so converting large images does not drop frames.
+
+        Returns:
+            list: The names of the assets finished.
+        """
+        start = time.perf_counter()
+        finished = []
+        for name, (decoding, _) in list(self._decoding.items()):
+            if max_ms is not None and finished and (time.perf_counter() - start) * 1000 >= max_ms:
+                break
+            if decoding.done():
+                self._finish(name)
+                finished.append(name)
+        return finished
+
+    @property
+    def progress(self):
+        """The fraction of the assets that are finished, from 0 to 1."""
+        return self.done / len(self.futures) if self.futures else 1.0
+
+    def ready(self, *names):
+        """Returns True if the named assets, or all assets if no names are given, are finished."""
+        return all(self.futures[name].done() for name in names or self.futures)
+
+    def get(self, name):
+        """Returns an asset, waiting for it and finishing it now if it is not finished yet.
+
+        Raises:
+            Exception: Whatever loading the asset raised, such as FileNotFoundError.
+        """
+        if name in self._decoding:
+            self._decoding[name][0].exception()  # Waits for the decoding to end
+            self._finish(name)
+        return self.futures[name].result()
+
+    def shutdown(self, wait=True):
+        """Stops the threads, after the files they have started, or cancels the rest if wait is False."""
+        if not wait:
+            # Like shutdown(cancel_futures=True), which is not in Python 3.8
+            for name, (decoding, _) in list(self._decoding.items()):
+                if decoding.cancel():
+                    del self._decoding[name]
+                    self.futures[name].cancel()
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,159 @@
+"""Run a game's frames inside an asyncio event loop, on time.
+
+A browser build made with pygbag, or a game embedded in a program that already
+has an event loop, cannot block in clock.tick() between frames: the game has to
+await, so other tasks can run. FrameDriver calls a frame function at a fixed
+rate, and awaits between frames, until the next frame is due. Background tasks,
+like loading assets, sending telemetry or talking to a score server, run in
+that time.
+
+asyncio.sleep() wakes up a millisecond or so late, so the driver sleeps until
+shortly before the frame is due, and then yields with asyncio.sleep(0) until it
+is. Other tasks still run in that time, but only in the short steps between
+their awaits, so a task that computes for a long time without awaiting makes
+the next frame late. A task can ask remaining() how long is left before the
+next frame, and wait for the next frame with next_frame().
+
+Example::
+
+    async def main():
+        def frame(dt):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return False
+            game.update(dt)
+            game.draw(screen)
+            pygame.display.flip()
+
+        driver = FrameDriver(frame, frame_rate=60)
+        asyncio.create_task(upload_scores(driver))
+        await driver.run()
+
+    asyncio.run(main())
+"""
+
+import asyncio
+import inspect
+import statistics
+import time
+
+__author__ = "Eric Busboom"
+__copyright__ = "Eric Busboom"
+__license__ = "MIT"
+
+
+def jitter_stats(intervals, frame_rate):
+    """Returns how far the times between frames were from the frame period.
+
+    Args:
+        intervals (list): Seconds between the starts of consecutive frames.
+        frame_rate (float): The frames per second that were asked for.
+
+    Returns:
+        dict: mean_ms, the mean interval, and jitter_p50_ms, jitter_p95_ms and
+        jitter_max_ms, percentiles of the difference from the period.
+    """
+    period = 1000 / frame_rate
+    ms = [i * 1000 for i in intervals]
+    jitter = sorted(abs(m - period) for m in ms)
+    if not jitter:
+        return {'mean_ms': None, 'jitter_p50_ms': None, 'jitter_p95_ms': None, 'jitter_max_ms': None}
+    return {
+        'mean_ms': round(statistics.fmean(ms), 3),
+        'jitter_p50_ms': round(jitter[len(jitter) // 2], 3),
+        'jitter_p95_ms': round(jitter[min(len(jitter) - 1, int(len(jitter) * 0.95))], 3),
+        'jitter_max_ms': round(jitter[-1], 3),
+    }
+
+
+class FrameDriver(object):
+    """Calls a frame function at a fixed rate, awaiting between frames.
+
+    Args:
+        frame (callable): Called with the milliseconds since the last frame. It
+            can be a coroutine function. Returning False stops the driver.
+        frame_rate (float): Frames per second.
+        spin_ms (float): How long before a frame is due to stop sleeping, and
+            yield to the event loop until it is due instead.
+        timer (callable): Returns the time in seconds.
+
+    Attributes:
+        frames (int): The number of frames run.
+        intervals (list): Seconds between the starts of consecutive frames.
+    """
+
+    def __init__(self, frame, frame_rate=60, spin_ms=2, timer=time.perf_counter):
+        self.frame = frame
+        self.frame_rate = frame_rate
+        self.period = 1 / frame_rate
+        self.spin = spin_ms / 1000
+        self.timer = timer
+        self.frames = 0
+        self.intervals = []
+        self.running = False
+        self._due = None
+        self._frame_done = None
+
+    def stop(self):
+        """Stops the driver after the current frame."""
+        self.running = False
+
+    def remaining(self):
+        """Returns the milliseconds until the next frame is due, 0 if it is due now or the driver is not running."""
+        if self._due is None:
+            return 0
+        return max(0.0, (self._due - self.timer()) * 1000)
+
+    async def next_frame(self):
+        """Waits until the next frame has run."""
+        if self._frame_done is None:
+            self._frame_done = asyncio.get_running_loop().create_future()
+        await asyncio.shield(self._frame_done)
+
+    async def _wait_until(self, due):
+        delay = due - self.spin - self.timer()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        # Always yield once, so other tasks get a turn even when the frames run late
+        await asyncio.sleep(0)
+        while self.timer() < due:
+            await asyncio.sleep(0)
+
+    async def run(self, max_frames=None):
+        """Runs frames until the frame function returns False, stop() is called or max_frames have run."""
+        self.running = True
+        due = last = self.timer()
+        try:
+            while self.running and (max_frames is None or self.frames < max_frames):
+                start = self.timer()
+                if self.frames:
+                    self.intervals.append(start - last)
+                dt = (start - last) * 1000
+                last = start
+
+                result = self.frame(dt)
+                if inspect.isawaitable(result):
+                    result = await result
+                self.frames += 1
+                if self._frame_done is not None:
+                    self._frame_done.set_result(self.frames)
+                    self._frame_done = None
+                if result is False:
+                    break
+
+                due += self.period
+                if self.timer() > due + self.period:
+                    # More than a frame behind: start again from now, rather than rushing to catch up
+                    due = self.timer()
+                self._due = due
+                await self._wait_until(due)
+        finally:
+            self.running = False
+            self._due = None
+            if self._frame_done is not None:
+                self._frame_done.set_result(self.frames)
+                self._frame_done = None
+
+    def stats(self):
+        """Returns the jitter of the frames so far; see jitter_stats()."""
+        return jitter_stats(self.intervals, self.frame_rate)
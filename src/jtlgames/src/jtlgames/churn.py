@@ -0,0 +1,332 @@
+"""Find resources that a game creates again and again inside its frame loop.
+
+Loading an image, opening a font, scaling or rotating a surface, making a new
+Surface or a mask are slow compared with a blit, and belong in a game's setup,
+not in code that runs every frame. A ChurnMonitor counts these calls, per frame
+and per call site, that is, the file and line in the game that made the call:
+
+* pygame.image.load
+* pygame.font.Font and pygame.font.SysFont
+* every function in pygame.transform
+* pygame.Surface
+* pygame.mask.from_surface
+
+A frame ends when the game calls pygame.display.flip() or update(), or when
+frame() is called. The first frames, the warmup, are where a game is expected
+to load things. After that the game is in its steady state, and each call site
+that still creates resources is logged as a warning, once.
+
+Run a game under the monitor with the ``jtlchurn`` command. The report lists the
+call sites, most steady state calls first::
+
+    cd games/Mars-lander
+    jtlchurn --frames 300 main.py
+
+With ``--blits`` it also reports the surfaces the game blits to the screen
+without converting them to the display format; see jtlgames.images.BlitAudit.
+
+Or use it from code::
+
+    with ChurnMonitor(warmup=30) as monitor:
+        game.play()
+    print(monitor.format_report())
+"""
+
+import argparse
+import logging
+import os
+import runpy
+import sys
+import threading
+from collections import Counter
+
+import pygame
+
+from jtlgames import __version__
+from jtlgames.images import BlitAudit
+
+__author__ = "Eric Busboom"
+__copyright__ = "Eric Busboom"
+__license__ = "MIT"
+
+_logger = logging.getLogger(__name__)
+
+_PYGAME_DIR = os.path.dirname(pygame.__file__)
+
+
+class _ChurnMeta(type):
+    """Lets a counting subclass stand in for its class in isinstance()."""
+
+    def __instancecheck__(cls, obj):
+        return isinstance(obj, cls.__bases__[0])
+
+    def __subclasscheck__(cls, sub):
+        return issubclass(sub, cls.__bases__[0])
+
+
+class SiteStats(object):
+    """The calls from one call site.
+
+    Attributes:
+        kind (str): What was called, such as 'image.load'.
+        site (str): 'file:line' of the call.
+        calls (int): Calls in all frames.
+        frames (int): Frames with at least one call.
+        max_per_frame (int): The most calls in one frame.
+        steady (int): Calls after the warmup.
+    """
+
+    def __init__(self, kind, site):
+        self.kind = kind
+        self.site = site
+        self.calls = 0
+        self.frames = 0
+        self.max_per_frame = 0
+        self.steady = 0
+
+    def __repr__(self):
+        return (f"SiteStats({self.kind}, {self.site}, calls={self.calls}, "
+                f"steady={self.steady})")
+
+
+class ChurnMonitor(object):
+    """Counts the resources a game creates, per frame and per call site.
+
+    Args:
+        warmup (int): Frames to ignore at the start, while the game sets up.
+        warn (bool): Log a warning the first time a call site creates a resource
+            after the warmup.
+        max_frames (int, optional): End the program with SystemExit after this
+            many frames, to run a game for a fixed time.
+
+    Attributes:
+        frames (int): The number of frames that have ended.
+        sites (dict): SiteStats by (kind, site).
+    """
+
+    def __init__(self, warmup=30, warn=True, max_frames=None):
+        self.warmup = warmup
+        self.warn = warn
+        self.max_frames = max_frames
+        self.frames = 0
+        self.sites = {}
+        self._frame = Counter()
+        self._inside = threading.local()
+        self._patches = []
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+    @property
+    def steady(self):
+        """True once the warmup is over."""
+        return self.frames >= self.warmup
+
+    def _site(self, frame):
+        """Returns 'file:line' of the first caller outside pygame and this module."""
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename != __file__ and not filename.startswith(_PYGAME_DIR):
+                return f"{os.path.relpath(filename)}:{frame.f_lineno}"
+            frame = frame.f_back
+        return '?'
+
+    def record(self, kind, frame):
+        """Counts one call of kind, made from frame."""
+        key = (kind, self._site(frame))
+        self._frame[key] += 1
+        if self.steady:
+            stats = self.sites.get(key)
+            not_steady = stats is None or not stats.steady
+            if self.warn and not_steady and self._frame[key] == 1:
+                _logger.warning("%s at %s in frame %d, after the warmup",
+                                kind, key[1], self.frames)
+
+    def frame(self):
+        """Ends a frame, adding its calls to the totals."""
+        steady = self.steady
+        for key, n in self._frame.items():
+            stats = self.sites.get(key)
+            if stats is None:
+                stats = self.sites[key] = SiteStats(*key)
+            stats.calls += n
+            stats.frames += 1
+            stats.max_per_frame = max(stats.max_per_frame, n)
+            if steady:
+                stats.steady += n
+        self._frame.clear()
+        self.frames += 1
+        if self.max_frames is not None and self.frames >= self.max_frames:
+            raise SystemExit(0)
+
+    def _counted(self, kind, fn):
+        monitor = self
+
+        def counted(*args, **kwargs):
+            # Calls made inside another counted call on the same thread, like SysFont
+            # making a Font, are not counted again
+            if getattr(monitor._inside, 'value', False):
+                return fn(*args, **kwargs)
+            monitor._inside.value = True
+            try:
+                monitor.record(kind, sys._getframe(1))
+                return fn(*args, **kwargs)
+            finally:
+                monitor._inside.value = False
+
+        counted.__name__ = getattr(fn, '__name__', kind)
+        counted.__doc__ = fn.__doc__
+        return counted
+
+    def _counted_class(self, kind, cls):
+        # A subclass rather than a function, so isinstance() and subclassing still work
+        return _ChurnMeta(cls.__name__, (cls,), {
+            '__init__': self._counted(kind, cls.__init__),
+            '__module__': cls.__module__,
+            '__doc__': cls.__doc__,
+        })
+
+    def _patch(self, owner, name, value):
+        self._patches.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, value)
+
+    def install(self):
+        """Replaces the pygame functions with ones that count their calls."""
+        if self._patches:
+            return
+        self._patch(pygame.image, 'load',
+                    self._counted('image.load', pygame.image.load))
+        self._patch(pygame.font, 'SysFont',
+                    self._counted('font.SysFont', pygame.font.SysFont))
+        self._patch(pygame.font, 'Font',
+                    self._counted_class('font.Font', pygame.font.Font))
+        self._patch(pygame.mask, 'from_surface',
+                    self._counted('mask.from_surface', pygame.mask.from_surface))
+        surface = self._counted_class('Surface', pygame.Surface)
+        self._patch(pygame, 'Surface', surface)
+        self._patch(pygame.surface, 'Surface', surface)
+        for name in dir(pygame.transform):
+            fn = getattr(pygame.transform, name)
+            if callable(fn) and not name.startswith('_') and 'backend' not in name:
+                counted = self._counted(f'transform.{name}', fn)
+                self._patch(pygame.transform, name, counted)
+
+        flip, update = pygame.display.flip, pygame.display.update
+
+        def counted_flip(*args, **kwargs):
+            self.frame()
+            return flip(*args, **kwargs)
+
+        def counted_update(*args, **kwargs):
+            self.frame()
+            return update(*args, **kwargs)
+
+        self._patch(pygame.display, 'flip', counted_flip)
+        self._patch(pygame.display, 'update', counted_update)
+
+    def uninstall(self):
+        """Puts back the pygame functions."""
+        for owner, name, value in reversed(self._patches):
+            setattr(owner, name, value)
+        self._patches = []
+
+    def report(self):
+        """Returns the SiteStats, the most steady state calls first."""
+        return sorted(self.sites.values(), key=lambda s: (-s.steady, -s.calls, s.site))
+
+    def format_report(self):
+        """Returns the report as a text table, one line per call site."""
+        lines = [f"{self.frames} frames, warmup {self.warmup}",
+                 f"{'kind':<22}{'calls':>8}{'frames':>8}{'max':>6}{'steady':>8}  site"]
+        for s in self.report():
+            lines.append(f"{s.kind:<22}{s.calls:>8}{s.frames:>8}{s.max_per_frame:>6}"
+                         f"{s.steady:>8}  {s.site}")
+        return '\n'.join(lines)
+
+
+def parse_args(args):
+    """Parse command line parameters
+
+    Args:
+      args (List[str]): command line parameters as list of strings
+          (for example  ``["--help"]``).
+
+    Returns:
+      :obj:`argparse.Namespace`: command line parameters namespace
+    """
+    parser = argparse.ArgumentParser(
+        description="Run a game and count the resources it creates in its frame loop")
+    parser.add_argument("--version", action="version",
+                        version=f"jtlgames {__version__}")
+    parser.add_argument("script", help="The game's Python file")
+    parser.add_argument("script_args", nargs=argparse.REMAINDER,
+                        help="Arguments for the game. Options for jtlchurn go before "
+                        "the script")
+    parser.add_argument("-w", "--warmup", type=int, default=30,
+                        help="Frames to ignore while the game starts")
+    parser.add_argument("-f", "--frames", type=int, default=None,
+                        help="Stop the game after this many frames")
+    parser.add_argument("-b", "--blits", action="store_true",
+                        help="Also report the surfaces blitted to the screen that are "
+                        "not in the display format")
+    parser.add_argument("-v", "--verbose", dest="loglevel", help="set loglevel to INFO",
+                        action="store_const", const=logging.INFO)
+    parser.add_argument("-vv", "--very-verbose", dest="loglevel",
+                        help="set loglevel to DEBUG",
+                        action="store_const", const=logging.DEBUG)
+    return parser.parse_args(args)
+
+
+def setup_logging(loglevel):
+    """Setup basic logging
+
+    Args:
+      loglevel (int): minimum loglevel for emitting messages
+    """
+    logformat = "[%(asctime)s] %(levelname)s:%(name)s:%(message)s"
+    logging.basicConfig(
+        level=loglevel, stream=sys.stdout, format=logformat, datefmt="%Y-%m-%d %H:%M:%S"
+    )
+
+
+def main(args):
+    args = parse_args(args)
+    setup_logging(args.loglevel)
+    path = os.path.abspath(args.script)
+    sys.path.insert(0, os.path.dirname(path))
+    sys.argv = [path] + args.script_args
+
+    # The audit goes in first, so the monitor's image.load finds the game's call site,
+    # not the audit's
+    audit = BlitAudit() if args.blits else None
+    if audit:
+        audit.install()
+    monitor = ChurnMonitor(warmup=args.warmup, max_frames=args.frames)
+    monitor.install()
+    try:
+        runpy.run_path(path, run_name="__main__")
+    except SystemExit:
+        pass
+    finally:
+        monitor.uninstall()
+        print(monitor.format_report())
+        if audit:
+            audit.uninstall()
+            print()
+            print(audit.format_report())
+
+
+def run():
+    """Calls :func:`main` passing the CLI arguments extracted from :obj:`sys.argv`
+
+    This function can be used as entry point to create console scripts with setuptools.
+    """
+    main(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,210 @@
+"""Run scripted behaviours as generators, many at once, inside one game loop.
+
+A behaviour is a generator function that yields whenever it wants to wait: for
+the next frame, for a number of frames, for some milliseconds, or for an event.
+The Scheduler resumes each generator when its wait is over, so a behaviour can
+be written as a list of steps, like an animation or an enemy's attack pattern,
+without stopping the rest of the game while it runs.
+
+Only the behaviours whose wait is over are resumed on a frame, so thousands of
+sleeping behaviours cost nothing, and the ones that run cost one send() each.
+
+Example::
+
+    def patrol(enemy):
+        while True:
+            for _ in range(60):
+                enemy.x += 2
+                yield                      # Wait for the next frame
+            yield WaitMs(500)
+            event = yield WaitEvent(pygame.KEYDOWN)
+            enemy.speak(event.key)
+
+    scheduler = Scheduler()
+    scheduler.start(patrol(enemy))
+
+    while running:
+        events = pygame.event.get()
+        scheduler.update(clock.tick(60), events)
+"""
+
+from .timers import SimulatedClock, TimerWheel
+
+
+class WaitFrames(object):
+    """Yield to wait for a number of frames. Yielding None waits for one frame."""
+
+    def __init__(self, frames=1):
+        self.frames = max(1, int(frames))
+
+
+class WaitMs(object):
+    """Yield to wait for a number of milliseconds of game time."""
+
+    def __init__(self, ms):
+        self.ms = ms
+
+
+class WaitEvent(object):
+    """Yield to wait for an event of one of the types. The event is sent back.
+
+    Args:
+        *types (int): The event types, such as pygame.KEYDOWN.
+        test (callable, optional): Only wake for events where test(event) is true.
+    """
+
+    def __init__(self, *types, test=None):
+        self.types = types
+        self.test = test
+
+
+class Task(object):
+    """A behaviour running in a Scheduler.
+
+    Attributes:
+        gen (generator): The behaviour.
+        done (bool): True once the behaviour has returned, raised or been cancelled.
+        result: The value the behaviour returned.
+        error (Exception): The exception the behaviour raised, if it raised one.
+    """
+
+    def __init__(self, scheduler, gen):
+        self.scheduler = scheduler
+        self.gen = gen
+        self.done = False
+        self.result = None
+        self.error = None
+        self._steps = 0
+        self._timer = None
+
+    def cancel(self):
+        """Stops the behaviour. Its generator is closed, so `finally` blocks run."""
+        if self.done:
+            return
+        self.done = True
+        if self._timer is not None:
+            self._timer.cancel()
+        self.scheduler._active -= 1
+        self.gen.close()
+
+    def __repr__(self):
+        return f"Task({self.gen.__name__}, done={self.done})"
+
+
+class Scheduler(object):
+    """Runs generator behaviours, resuming each one when its wait is over.
+
+    Attributes:
+        frame (int): The number of updates so far.
+        time (int): Milliseconds of game time, the sum of the update() times.
+    """
+
+    def __init__(self):
+        self.frame = 0
+        self._clock = SimulatedClock()
+        self._timers = TimerWheel(self._clock)
+        self._frames = {}
+        self._events = {}
+        self._woken = []
+        self._active = 0
+
+    def __len__(self):
+        """Returns the number of behaviours still running."""
+        return self._active
+
+    @property
+    def time(self):
+        return self._clock.time
+
+    def start(self, gen):
+        """Starts a behaviour. It runs its first step on the next update().
+
+        Args:
+            gen (generator): The behaviour, from calling a generator function.
+
+        Returns:
+            Task: The running behaviour, which can be cancelled.
+        """
+        task = Task(self, gen)
+        self._active += 1
+        self._frames.setdefault(self.frame + 1, []).append((task, None))
+        return task
+
+    def _wake(self, task, value=None):
+        self._woken.append((task, value))
+
+    def _step(self, task, value):
+        """Resumes a task and files it under what it waits for next."""
+        if task.done:
+            return
+        task._steps += 1
+        task._timer = None
+        try:
+            wait = task.gen.send(value)
+        except StopIteration as e:
+            task.done = True
+            task.result = e.value
+            self._active -= 1
+            return
+        except BaseException as e:
+            task.done = True
+            task.error = e
+            self._active -= 1
+            raise
+
+        if wait is None:
+            self._frames.setdefault(self.frame + 1, []).append((task, None))
+        elif isinstance(wait, WaitFrames):
+            self._frames.setdefault(self.frame + wait.frames, []).append((task, None))
+        elif isinstance(wait, WaitMs):
+            task._timer = self._timers.after(wait.ms, self._wake, task)
+        elif isinstance(wait, WaitEvent):
+            # Entries under the other types go stale when one wakes the task, and are dropped later
+            for event_type in wait.types:
+                self._events.setdefault(event_type, []).append((task, wait, task._steps))
+        else:
+            task.cancel()
+            raise TypeError(f"{task!r} yielded {wait!r}; behaviours can yield None, WaitFrames, WaitMs or WaitEvent")
+
+    def update(self, dt, events=()):
+        """Runs one frame: resumes the behaviours whose wait is over.
+
+        Args:
+            dt (int): Milliseconds since the last update, such as the value from clock.tick().
+            events (list): The events of this frame, from pygame.event.get().
+
+        Raises:
+            Exception: The first exception a behaviour raised. The other behaviours
+                woken on this frame are still resumed before it is raised.
+        """
+        self.frame += 1
+        self._clock.advance(dt)
+        self._timers.update()
+        woken, self._woken = self._woken, []
+        woken.extend(self._frames.pop(self.frame, ()))
+
+        for event in events:
+            waiting = self._events.get(event.type)
+            if not waiting:
+                continue
+            keep = []
+            for entry in waiting:
+                task, wait, steps = entry
+                if task.done or task._steps != steps:
+                    continue
+                if wait.test is None or wait.test(event):
+                    task._steps += 1  # Not woken again by a later event this frame
+                    woken.append((task, event))
+                else:
+                    keep.append(entry)
+            self._events[event.type] = keep
+
+        error = None
+        for task, value in woken:
+            try:
+                self._step(task, value)
+            except Exception as e:
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
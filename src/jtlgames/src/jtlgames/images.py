@@ -0,0 +1,249 @@
+"""Load images in the display's pixel format, and find the ones that are not.
+
+pygame.image.load() returns a surface in the file's pixel format. Blitting it to
+the screen converts every pixel to the display's format, on every blit, which
+can cost more than the blit itself. load_image() converts the image once, when
+it is loaded, picking the cheapest format that draws the image the same:
+
+* An image with no transparent pixels, even if the file has an alpha channel,
+  is converted with convert(), so it is copied without blending.
+* An image whose pixels are either fully transparent or fully opaque is
+  converted with convert() and a colorkey, with RLE acceleration, so the
+  transparent runs are skipped.
+* An image with partly transparent pixels is converted with convert_alpha().
+
+BlitAudit finds the surfaces a game still draws to the screen without
+converting them, with the time the game spends blitting each of them per
+frame. Run a game with it with ``jtlchurn --blits main.py``.
+"""
+
+import os
+import time
+import weakref
+
+import pygame
+
+__author__ = "Eric Busboom"
+__copyright__ = "Eric Busboom"
+__license__ = "MIT"
+
+# The color given to transparent pixels, for a colorkey, if the image does not use it
+COLORKEY = (255, 0, 255)
+
+
+def to_display_format(image, colorkey=None):
+    """Returns image converted to the display's pixel format.
+
+    Args:
+        image (pygame.Surface): The image to convert.
+        colorkey (tuple, optional): A color to make transparent, for images with
+            no alpha channel.
+
+    Returns:
+        pygame.Surface: The converted image, or image itself if the display mode
+        is not set yet.
+    """
+    try:
+        if not image.get_flags() & pygame.SRCALPHA:
+            converted = image.convert()
+            colorkey = colorkey if colorkey is not None else image.get_colorkey()
+            if colorkey is not None:
+                converted.set_colorkey(colorkey, pygame.RLEACCEL)
+            return converted
+
+        pixels = image.get_width() * image.get_height()
+        opaque = pygame.mask.from_surface(image, 254).count()
+        if opaque == pixels:
+            return image.convert()
+        keyed = pygame.mask.from_threshold(image, COLORKEY + (255,), (1, 1, 1, 1)).count()
+        if opaque == pygame.mask.from_surface(image, 0).count() and not keyed:
+            # Drawn over the key color, the transparent pixels become the key and the others stay as they are
+            converted = image.convert()
+            converted.fill(COLORKEY)
+            converted.blit(image, (0, 0))
+            converted.set_colorkey(COLORKEY, pygame.RLEACCEL)
+            return converted
+        return image.convert_alpha()
+    except pygame.error:
+        # Probably can't convert because video mode is not set yet.
+        return image
+
+
+def load_image(filename, colorkey=None):
+    """Loads an image and converts it to the display's pixel format.
+
+    See to_display_format() for how the format is chosen. The display mode must
+    be set first, or the image is returned as it was loaded.
+
+    Args:
+        filename (str or Path): The image file.
+        colorkey (tuple, optional): A color to make transparent, for images with
+            no alpha channel.
+
+    Returns:
+        pygame.Surface: The image.
+    """
+    return to_display_format(pygame.image.load(filename), colorkey)
+
+
+def is_display_format(surface, display=None):
+    """Returns True if surface can be blitted to the display without converting its pixels."""
+    display = display or pygame.display.get_surface()
+    return (surface.get_bitsize() == display.get_bitsize()
+            and surface.get_masks()[:3] == display.get_masks()[:3])
+
+
+class BlitStats(object):
+    """The blits of one surface that is not in the display format.
+
+    Attributes:
+        name (str): The file the surface was loaded from, or its size and format.
+        blits (int): Blits to the screen.
+        seconds (float): Time spent in those blits.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.blits = 0
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return f"BlitStats({self.name}, blits={self.blits})"
+
+
+class _AuditedScreen(pygame.Surface):
+    """Stands in for the display surface, timing blits from surfaces not in its format."""
+
+    audit = None
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        if self.audit.check(source):
+            start = time.perf_counter()
+            rect = pygame.Surface.blit(self, source, dest, area, special_flags)
+            self.audit.record(source, time.perf_counter() - start)
+            return rect
+        return pygame.Surface.blit(self, source, dest, area, special_flags)
+
+    def blits(self, blit_sequence, doreturn=1):
+        rects = [self.blit(*args) for args in blit_sequence]
+        return rects if doreturn else None
+
+
+class BlitAudit(object):
+    """Reports the surfaces blitted to the screen that are not in the display format.
+
+    While installed, the game draws to a surface in the display's format that
+    stands in for the screen, and is copied to the screen when the frame ends.
+    Its blits check the format of what they draw, and time the blits of
+    surfaces that need converting. The copy makes each frame a little slower,
+    but is not counted. Blits to other surfaces are not checked.
+
+    Attributes:
+        frames (int): The number of frames that have ended.
+        surfaces (dict): BlitStats by name of the surface. Surfaces that were
+            not loaded from a file are named by their size and format, so the
+            frames of a rotating sprite, for example, are counted together.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.surfaces = {}
+        self._names = weakref.WeakKeyDictionary()
+        self._checked = weakref.WeakKeyDictionary()
+        self._screen = None
+        self._display_surface = pygame.display.get_surface
+        self._patches = []
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+    def check(self, source):
+        """Returns True if blitting source to the screen converts its pixels."""
+        bad = self._checked.get(source)
+        if bad is None:
+            bad = self._checked[source] = not is_display_format(source, self._screen)
+        return bad
+
+    def record(self, source, seconds):
+        """Counts one blit of source that took seconds."""
+        name = self._names.get(source) or f"{source.get_width()}x{source.get_height()} {source.get_bitsize()} bit"
+        stats = self.surfaces.get(name)
+        if stats is None:
+            stats = self.surfaces[name] = BlitStats(name)
+        stats.blits += 1
+        stats.seconds += seconds
+
+    def frame(self):
+        """Ends a frame, copying the stand in surface to the screen."""
+        display = self._display_surface()
+        if self._screen is not None and display is not None:
+            display.blit(self._screen, (0, 0))
+        self.frames += 1
+
+    def _patch(self, owner, name, value):
+        self._patches.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, value)
+
+    def install(self):
+        """Replaces the display functions, so the game draws to the stand in surface."""
+        if self._patches:
+            return
+        load, set_mode, get_surface = pygame.image.load, pygame.display.set_mode, pygame.display.get_surface
+        flip, update = pygame.display.flip, pygame.display.update
+
+        def named_load(filename, *args, **kwargs):
+            image = load(filename, *args, **kwargs)
+            self._names[image] = os.path.relpath(filename) if isinstance(filename, (str, os.PathLike)) else repr(filename)
+            return image
+
+        def audited_set_mode(*args, **kwargs):
+            return self._stand_in(set_mode(*args, **kwargs))
+
+        def audited_get_surface():
+            return self._screen if get_surface() is not None else None
+
+        def audited_flip():
+            self.frame()
+            return flip()
+
+        def audited_update(*args, **kwargs):
+            self.frame()
+            return update(*args, **kwargs)
+
+        self._patch(pygame.image, 'load', named_load)
+        self._patch(pygame.display, 'set_mode', audited_set_mode)
+        self._patch(pygame.display, 'get_surface', audited_get_surface)
+        self._patch(pygame.display, 'flip', audited_flip)
+        self._patch(pygame.display, 'update', audited_update)
+        if get_surface() is not None:
+            self._stand_in(get_surface())
+
+    def _stand_in(self, display):
+        """Makes the surface the game draws to instead of display."""
+        self._screen = _AuditedScreen(display.get_size(), 0, display)
+        self._screen.audit = self
+        self._checked = weakref.WeakKeyDictionary()
+        return self._screen
+
+    def uninstall(self):
+        """Puts back the display functions."""
+        for owner, name, value in reversed(self._patches):
+            setattr(owner, name, value)
+        self._patches = []
+
+    def report(self):
+        """Returns the BlitStats, the most time per frame first."""
+        return sorted(self.surfaces.values(), key=lambda s: -s.seconds)
+
+    def format_report(self):
+        """Returns the report as a text table, one line per surface."""
+        frames = max(self.frames, 1)
+        lines = [f"{self.frames} frames, surfaces not in the display format",
+                 f"{'blits/frame':>12}{'ms/frame':>10}  surface"]
+        for s in self.report():
+            lines.append(f"{s.blits / frames:>12.1f}{s.seconds * 1000 / frames:>10.3f}  {s.name}")
+        return '\n'.join(lines)
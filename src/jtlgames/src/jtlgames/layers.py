@@ -0,0 +1,123 @@
+"""Draw the parts of a screen that do not move once, and reuse them every frame.
+
+Most of a frame is often the same as the last one: the background, the terrain,
+the frame around the score. StaticLayers draws layers like these, bottom to
+top, onto one surface, and keeps it. A frame then starts with one blit of that
+surface, and the game draws only what moves on top of it.
+
+Each layer is a function that draws onto the surface it is given. A layer is
+drawn again only after it has been invalidated, because what it shows has
+changed, and then only it and the layers above it are drawn again. Each layer
+keeps a copy of the surface with it and the layers below it drawn, so a layer
+near the top is redrawn without redrawing the layers below it.
+
+Example::
+
+    static = StaticLayers(screen.get_size())
+    static.add('background', lambda surface: surface.blit(background, (0, 0)))
+    static.add('terrain', terrain_sprites.draw)
+
+    while running:
+        if pygame.sprite.spritecollide(player, terrain_sprites, True):
+            static.invalidate('terrain')
+        static.draw(screen)
+        moving_sprites.draw(screen)
+"""
+
+import pygame
+
+
+class Layer(object):
+    """One layer of a StaticLayers.
+
+    Attributes:
+        name (str): The name of the layer.
+        draw (callable): Draws the layer, called with the surface to draw on.
+        surface (pygame.Surface): This layer and the layers below it, once drawn.
+    """
+
+    def __init__(self, name, draw):
+        self.name = name
+        self.draw = draw
+        self.surface = None
+
+
+class StaticLayers(object):
+    """Layers that change rarely, drawn once onto one surface and kept.
+
+    Args:
+        size (tuple): The size of the surface (width, height).
+        fill (tuple): The color under the bottom layer.
+
+    Attributes:
+        layers (list): The Layers, from the bottom up.
+        redraws (int): The number of times a layer has been drawn.
+    """
+
+    def __init__(self, size, fill=(0, 0, 0)):
+        self.size = size
+        self.fill = fill
+        self.layers = []
+        self.redraws = 0
+        self._dirty = 0
+        self._empty = None
+
+    def add(self, name, draw):
+        """Adds a layer on top of the others.
+
+        Args:
+            name (str): The name of the layer, for invalidate().
+            draw (callable): Draws the layer onto the surface it is called with.
+        """
+        self.layers.append(Layer(name, draw))
+        self._dirty = min(self._dirty, len(self.layers) - 1)
+
+    def _index(self, name):
+        for i, layer in enumerate(self.layers):
+            if layer.name == name:
+                return i
+        raise KeyError(f"No layer named {name!r}")
+
+    def invalidate(self, name=None):
+        """Marks a layer as changed, so it is drawn again on the next draw().
+
+        Args:
+            name (str, optional): The layer. If not given, all layers are drawn again.
+        """
+        self._dirty = min(self._dirty, 0 if name is None else self._index(name))
+
+    def _new_surface(self):
+        surface = pygame.Surface(self.size)
+        try:
+            return surface.convert()
+        except pygame.error:
+            # Probably can't convert because video mode is not set yet.
+            return surface
+
+    @property
+    def surface(self):
+        """The surface with all the layers drawn, drawing the layers that have changed first.
+
+        With no layers, it is a surface filled with the fill color.
+        """
+        if not self.layers:
+            if self._empty is None:
+                self._empty = self._new_surface()
+                self._empty.fill(self.fill)
+            return self._empty
+        for i in range(self._dirty, len(self.layers)):
+            layer = self.layers[i]
+            if layer.surface is None:
+                layer.surface = self._new_surface()
+            if i == 0:
+                layer.surface.fill(self.fill)
+            else:
+                layer.surface.blit(self.layers[i - 1].surface, (0, 0))
+            layer.draw(layer.surface)
+            self.redraws += 1
+        self._dirty = len(self.layers)
+        return self.layers[-1].surface
+
+    def draw(self, screen, pos=(0, 0)):
+        """Blits the layers onto screen, with their top left at pos, and returns the rect blitted."""
+        return screen.blit(self.surface, pos)
@@ -1,23 +1,30 @@
 import pygame
 
-def main_loop(screen, frame_rate=60):
+def main_loop(screen, frame_rate=60, scheduler=None):
     """Main loop generator function.
 
     Args:
         screen (pygame.Surface): The display surface.
         frame_rate (int): The frame rate to cap the loop at.
+        scheduler (jtlgames.coroutines.Scheduler, optional): Behaviours to run
+            each frame, before the frame is drawn.
     """
     running = True
     clock = pygame.time.Clock()
+    dt = 0
 
     while running:
         screen.fill((0, 0, 139))  # Clear screen with deep blue
 
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
 
+        if scheduler is not None:
+            scheduler.update(dt, events)
+
         yield
 
         pygame.display.flip()
-        clock.tick(frame_rate)
\ No newline at end of file
+        dt = clock.tick(frame_rate)
\ No newline at end of file
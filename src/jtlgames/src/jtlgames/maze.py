@@ -0,0 +1,188 @@
+"""Generate and draw large mazes quickly.
+
+A maze is a NumPy array indexed [x, y], the same way as pygame.surfarray, where
+cells are WALL or OPEN. A maze of cols x rows rooms is a grid of size
+(2 * cols + 1, 2 * rows + 1): the rooms are at the odd positions, and the
+positions between two rooms are walls that are knocked through to join them.
+
+The maze is a randomised Kruskal maze: every wall between two rooms gets a
+random weight, and the lightest walls that join rooms not already connected
+are knocked through until all rooms are connected. Instead of going through the
+walls one at a time, this is done with Boruvka's algorithm, which gives the same
+maze for the same weights but works on all the rooms at once with NumPy: in
+each round every connected group of rooms knocks through its lightest wall to
+another group, and the groups are merged, so a few dozen rounds finish even a
+2000 x 2000 maze.
+
+MazeView draws a maze by building a surface with one pixel per cell, with
+pygame.surfarray, and scaling up the part that is on screen. Changing a cell,
+such as moving the player, only redraws that cell.
+
+Example::
+
+    grid = generate(100, 100, seed=1)
+    start, end = add_entrances(grid)
+    view = MazeView(grid, cell_size=4)
+    view.draw(screen)
+"""
+
+import numpy as np
+import pygame
+
+OPEN = 0
+WALL = 1
+START = 2
+END = 3
+PATH = 4
+PLAYER = 5
+
+COLORS = [
+    (255, 255, 255),  # OPEN
+    (0, 0, 0),  # WALL
+    (0, 200, 0),  # START
+    (220, 0, 0),  # END
+    (0, 0, 255),  # PATH
+    (255, 255, 0),  # PLAYER
+]
+
+
+def generate(cols, rows, seed=None):
+    """Makes a maze of cols x rows rooms.
+
+    Args:
+        cols (int): Number of rooms across.
+        rows (int): Number of rooms down.
+        seed (int or numpy.random.Generator, optional): Seed for the random walls.
+
+    Returns:
+        numpy.ndarray: uint8 grid of shape (2 * cols + 1, 2 * rows + 1), indexed [x, y],
+        holding WALL and OPEN.
+    """
+    rng = np.random.default_rng(seed)
+    grid = np.full((2 * cols + 1, 2 * rows + 1), WALL, dtype=np.uint8)
+    grid[1::2, 1::2] = OPEN
+
+    # Rooms are numbered x * rows + y. Wall i joins rooms a[i] and b[i].
+    rooms = np.arange(cols * rows, dtype=np.int32).reshape(cols, rows)
+    a = np.concatenate([rooms[:-1, :].ravel(), rooms[:, :-1].ravel()])
+    b = np.concatenate([rooms[1:, :].ravel(), rooms[:, 1:].ravel()])
+
+    # Random weights in the high bits and the wall's number in the low bits,
+    # so no two walls weigh the same and a weight says which wall it is
+    shift = max(len(a), 1).bit_length()
+    weight = rng.integers(0, 1 << (62 - shift), len(a), dtype=np.int64) << shift
+    weight |= np.arange(len(a))
+    mask = (1 << shift) - 1
+    none = np.iinfo(np.int64).max
+
+    # The walls still standing between different groups, and the groups they
+    # join. Groups are renumbered from 0 each round; numbers holds the maps
+    # from one round's numbers to the next.
+    ga, gb = a, b
+    numbers = []
+    n_groups = cols * rows
+    knocked = []
+    while len(weight):
+        # Each group's lightest wall to another group. When two groups pick the
+        # same wall it is knocked through twice, which does no harm.
+        lightest = np.full(n_groups, none)
+        np.minimum.at(lightest, ga, weight)
+        np.minimum.at(lightest, gb, weight)
+        groups = np.flatnonzero(lightest != none).astype(np.int32)
+        wall = lightest[groups] & mask
+        knocked.append(wall)
+
+        # Point each group at the group its wall leads to. Two groups that chose
+        # the same wall point at each other, so the smaller one becomes the root.
+        ids = np.arange(n_groups, dtype=np.int32)
+        parent = ids.copy()
+        to_a, to_b = a[wall], b[wall]
+        for number in numbers:
+            to_a, to_b = number[to_a], number[to_b]
+        parent[groups] = np.where(to_a == groups, to_b, to_a)
+        root = np.flatnonzero((parent[parent] == ids) & (ids < parent))
+        parent[root] = root
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+        # Number the merged groups from 0, and drop the walls inside a group
+        is_root = parent == ids
+        number = (np.cumsum(is_root, dtype=np.int32) - 1)[parent]
+        n_groups = int(is_root.sum())
+        numbers.append(number)
+        ga, gb = number[ga], number[gb]
+        keep = np.flatnonzero(ga != gb)
+        ga, gb, weight = ga.take(keep), gb.take(keep), weight.take(keep)
+
+    opened = np.zeros(len(a), dtype=bool)
+    for wall in knocked:
+        opened[wall] = True
+    split = (cols - 1) * rows
+    grid[2:-1:2, 1::2][opened[:split].reshape(cols - 1, rows)] = OPEN
+    grid[1::2, 2:-1:2][opened[split:].reshape(cols, rows - 1)] = OPEN
+    return grid
+
+
+def add_entrances(grid, start=None, end=None):
+    """Opens the outside wall next to the top left and bottom right rooms.
+
+    Returns:
+        tuple: The (x, y) start and end positions, marked START and END in the grid.
+    """
+    w, h = grid.shape
+    start = start or (1, 0)
+    end = end or (w - 2, h - 1)
+    grid[start] = START
+    grid[end] = END
+    return start, end
+
+
+class MazeView(object):
+    """Draws a maze grid, scaled up, through a camera.
+
+    Attributes:
+        grid (numpy.ndarray): The maze, indexed [x, y].
+        cell_size (int): Size of a cell on screen, in pixels.
+        colors (list): RGB color for each cell value.
+        image (pygame.Surface): The maze with one pixel per cell. It is an 8 bit
+            surface whose palette is the colors, so the grid is copied in as it is.
+    """
+
+    def __init__(self, grid, cell_size=8, colors=COLORS):
+        self.grid = grid
+        self.cell_size = cell_size
+        self.colors = [tuple(c) for c in colors]
+        self.image = pygame.surfarray.make_surface(grid)
+        self.image.set_palette(self.colors)
+        self._view = None
+        self._view_area = None
+
+    def set_cell(self, x, y, value):
+        """Changes one cell of the grid, and redraws just that cell."""
+        self.grid[x, y] = value
+        color = self.colors[value]
+        self.image.set_at((x, y), color)
+        if self._view is not None and self._view_area.collidepoint(x, y):
+            s = self.cell_size
+            self._view.fill(color, ((x - self._view_area.x) * s, (y - self._view_area.y) * s, s, s))
+
+    def cell_at(self, pos, camera=(0, 0)):
+        """Returns the grid position under a screen position."""
+        return camera[0] + pos[0] // self.cell_size, camera[1] + pos[1] // self.cell_size
+
+    def draw(self, surface, camera=(0, 0)):
+        """Draws the maze with grid position camera at the top left of surface.
+
+        The part of the maze on screen is scaled once, and scaled again only when
+        the camera moves.
+        """
+        s = self.cell_size
+        area = pygame.Rect(camera, (-(-surface.get_width() // s), -(-surface.get_height() // s)))
+        area = area.clip(self.image.get_rect())
+        if area != self._view_area:
+            self._view_area = area
+            self._view = pygame.transform.scale(self.image.subsurface(area), (area.w * s, area.h * s))
+        surface.blit(self._view, ((area.x - camera[0]) * s, (area.y - camera[1]) * s))
@@ -0,0 +1,488 @@
+"""Find paths on grids of blocked and open cells.
+
+A PathFinder works on a NumPy array indexed [x, y], the same way as
+pygame.surfarray and jtlgames.maze, where True (or any non zero value) is a
+blocked cell. For a maze from jtlgames.maze, use ``PathFinder(grid == WALL)``.
+
+There are three ways to find a way through the grid:
+
+* astar() finds the shortest path between two cells, using a binary heap.
+* jps() finds the same paths with jump point search, which skips over open
+  areas instead of looking at every cell in them. It needs diagonal moves.
+* flow_field() works out the distance to a goal from every cell at once, so any
+  number of agents heading to the same place, like enemies chasing the player,
+  can each look up their next step.
+
+Moves go to the 4 neighbouring cells, or to all 8 with diagonal=True. A diagonal
+move costs the square root of 2 and may not cut the corner of a blocked cell.
+
+Paths from path() and flow fields are cached. When cells change with update(),
+a cached path is only dropped if the change is next to the part of the grid its
+search looked at, since a change anywhere else cannot make a different path the
+shortest. Flow fields cover the whole grid, so they are all dropped.
+
+Example::
+
+    finder = PathFinder(walls, diagonal=True)
+    path = finder.path((1, 1), (40, 30))
+
+    field = finder.flow_field(player_pos)
+    enemy_positions = field.next_steps(enemy_positions)
+"""
+
+import heapq
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+SQRT2 = math.sqrt(2)
+
+STRAIGHT = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+DIAGONAL = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+
+class FlowField(object):
+    """The number of moves to a goal from every cell, and the move to make from each.
+
+    Attributes:
+        goal (tuple): The (x, y) cell everything flows to.
+        distance (numpy.ndarray): Moves to the goal from each cell, indexed [x, y],
+            or -1 where the goal can't be reached.
+    """
+    def __init__(self, goal, distance, next_index, stride):
+        self.goal = goal
+        self.distance = distance
+        self._next = next_index
+        self._stride = stride
+
+    def next_step(self, pos):
+        """Returns the cell to move to from pos, or pos if it can't reach the goal."""
+        i = self._next[(pos[0] + 1) * self._stride + pos[1] + 1]
+        return int(i // self._stride - 1), int(i % self._stride - 1)
+
+    def next_steps(self, positions):
+        """Returns the next cell for many positions at once.
+
+        Args:
+            positions (array): (n, 2) array of (x, y) cells.
+
+        Returns:
+            numpy.ndarray: (n, 2) array of the cells to move to.
+        """
+        positions = np.asarray(positions)
+        i = self._next[(positions[:, 0] + 1) * self._stride + positions[:, 1] + 1]
+        return np.stack([i // self._stride - 1, i % self._stride - 1], axis=1)
+
+    def path(self, start):
+        """Returns the cells from start to the goal, or None if it can't be reached."""
+        start = tuple(map(int, start))
+        if self.distance[start] < 0:
+            return None
+        path = [start]
+        while path[-1] != self.goal:
+            path.append(self.next_step(path[-1]))
+        return path
+
+
+class PathFinder(object):
+    """Finds paths on a grid of blocked cells.
+
+    Attributes:
+        blocked (numpy.ndarray): Bool array of blocked cells, indexed [x, y].
+        diagonal (bool): Whether moves can go diagonally.
+        cache_size (int): Number of paths to keep in the cache.
+        expanded (int): Number of cells searched since the finder was made, useful
+            to check the cache.
+    """
+
+    def __init__(self, blocked, diagonal=False, cache_size=1024):
+        self.blocked = np.array(blocked, dtype=bool)
+        self.diagonal = diagonal
+        self.cache_size = cache_size
+        self.expanded = 0
+        self._paths = OrderedDict()
+        self._fields = {}
+        self._build()
+
+    def _build(self):
+        """Makes the open cell lookups, with a blocked border around the grid."""
+        w, h = self.blocked.shape
+        self._stride = h + 2
+        padded = np.ones((w + 2, h + 2), dtype=bool)
+        padded[1:-1, 1:-1] = self.blocked
+        self._open_array = ~padded.ravel()
+        self._open = self._open_array.tolist()
+
+    def _index(self, pos):
+        return (pos[0] + 1) * self._stride + pos[1] + 1
+
+    def _pos(self, i):
+        return i // self._stride - 1, i % self._stride - 1
+
+    def _moves(self):
+        """Returns (offset, cost, side_a, side_b) for each move.
+
+        The sides are the cells a diagonal move must not cut the corner of.
+        """
+        S = self._stride
+        moves = [(dx * S + dy, 1.0, None, None) for dx, dy in STRAIGHT]
+        if self.diagonal:
+            moves += [(dx * S + dy, SQRT2, dx * S, dy) for dx, dy in DIAGONAL]
+        return moves
+
+    def _heuristic(self, goal):
+        gx, gy = goal
+        S = self._stride
+        if self.diagonal:
+            def h(i):
+                dx, dy = abs(i // S - 1 - gx), abs(i % S - 1 - gy)
+                return dx + dy + (SQRT2 - 2) * min(dx, dy)
+        else:
+            def h(i):
+                return abs(i // S - 1 - gx) + abs(i % S - 1 - gy)
+        return h
+
+    def is_open(self, pos):
+        """Returns True if pos is inside the grid and not blocked"""
+        w, h = self.blocked.shape
+        return 0 <= pos[0] < w and 0 <= pos[1] < h and not self.blocked[pos]
+
+    def astar(self, start, goal):
+        """Returns the shortest path from start to goal as a list of cells, or None."""
+        return self._astar(start, goal)[0]
+
+    def _astar(self, start, goal):
+        """A* search. Returns the path, and the (x0, y0, x1, y1) box it expanded."""
+        # Plain ints, as NumPy ints and bools do not mix in the arithmetic below
+        start, goal = tuple(map(int, start)), tuple(map(int, goal))
+        if not (self.is_open(start) and self.is_open(goal)):
+            return None, self._ends_box(start, goal)
+        box = [start[0], start[1], start[0], start[1]]
+
+        S = self._stride
+        open_ = self._open
+        moves = self._moves()
+        h = self._heuristic(goal)
+        s, g = self._index(start), self._index(goal)
+
+        # Entries are (f, -g, cell), so of equal f the deepest is tried first
+        heap = [(h(s), 0.0, s)]
+        cost = {s: 0.0}
+        came_from = {s: None}
+        closed = set()
+        while heap:
+            _, neg_g, i = heapq.heappop(heap)
+            if i in closed:
+                continue
+            closed.add(i)
+            x, y = i // S - 1, i % S - 1
+            box = [min(box[0], x), min(box[1], y), max(box[2], x), max(box[3], y)]
+            if i == g:
+                self.expanded += len(closed)
+                return self._walk_back(came_from, i), box
+            for offset, step, side_a, side_b in moves:
+                j = i + offset
+                if not open_[j]:
+                    continue
+                if side_a is not None and not (open_[i + side_a] and open_[i + side_b]):
+                    continue
+                new_cost = -neg_g + step
+                if new_cost < cost.get(j, math.inf):
+                    cost[j] = new_cost
+                    came_from[j] = i
+                    heapq.heappush(heap, (new_cost + h(j), -new_cost, j))
+
+        self.expanded += len(closed)
+        return None, box
+
+    def _ends_box(self, start, goal):
+        """The box to remember when start or goal is blocked.
+
+        Opening either one changes the answer.
+        """
+        (x0, y0), (x1, y1) = start, goal
+        return [min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)]
+
+    def _walk_back(self, came_from, i):
+        path = []
+        while i is not None:
+            path.append(self._pos(i))
+            i = came_from[i]
+        path.reverse()
+        return path
+
+    def jps(self, start, goal):
+        """Returns the shortest path from start to goal by jump point search, or None.
+
+        Gives paths as short as astar() with diagonal moves, often looking at far
+        fewer cells.
+
+        Raises:
+            ValueError: If the finder does not allow diagonal moves.
+        """
+        return self._jps(start, goal)[0]
+
+    def _jps(self, start, goal):
+        """Jump point search. Returns the path and the box of the cells it looked at."""
+        if not self.diagonal:
+            raise ValueError("Jump point search needs a PathFinder with diagonal=True")
+        start, goal = tuple(map(int, start)), tuple(map(int, goal))
+        if not (self.is_open(start) and self.is_open(goal)):
+            return None, self._ends_box(start, goal)
+        self._box = [start[0], start[1], start[0], start[1]]
+
+        S = self._stride
+        h = self._heuristic(goal)
+        s, g = self._index(start), self._index(goal)
+        self._goal = g
+
+        heap = [(h(s), 0.0, s)]
+        cost = {s: 0.0}
+        came_from = {s: None}
+        closed = set()
+        while heap:
+            _, neg_g, i = heapq.heappop(heap)
+            if i in closed:
+                continue
+            closed.add(i)
+            if i == g:
+                self.expanded += len(closed)
+                return self._fill_in(self._walk_back(came_from, i)), self._box
+
+            parent = came_from[i]
+            for dx, dy in self._directions(i, parent):
+                j = self._jump(i + dx * S + dy, dx, dy)
+                if j is None or j in closed:
+                    continue
+                ax, ay = abs(j // S - i // S), abs(j % S - i % S)
+                new_cost = -neg_g + max(ax, ay) + (SQRT2 - 1) * min(ax, ay)
+                if new_cost < cost.get(j, math.inf):
+                    cost[j] = new_cost
+                    came_from[j] = i
+                    heapq.heappush(heap, (new_cost + h(j), -new_cost, j))
+
+        self.expanded += len(closed)
+        return None, self._box
+
+    def _directions(self, i, parent):
+        """Returns the directions worth searching from i, reached from parent."""
+        S = self._stride
+        open_ = self._open
+        if parent is None:
+            dirs = [d for d in STRAIGHT if open_[i + d[0] * S + d[1]]]
+            dirs += [(dx, dy) for dx, dy in DIAGONAL
+                     if open_[i + dx * S] and open_[i + dy]]
+            return dirs
+
+        px, py = divmod(parent, S)
+        x, y = divmod(i, S)
+        dx, dy = (x > px) - (x < px), (y > py) - (y < py)
+        dirs = []
+        if dx and dy:
+            if open_[i + dy]:
+                dirs.append((0, dy))
+            if open_[i + dx * S]:
+                dirs.append((dx, 0))
+            if open_[i + dy] and open_[i + dx * S]:
+                dirs.append((dx, dy))
+        elif dx:
+            ahead, up, down = open_[i + dx * S], open_[i - 1], open_[i + 1]
+            if ahead:
+                dirs.append((dx, 0))
+                if up:
+                    dirs.append((dx, -1))
+                if down:
+                    dirs.append((dx, 1))
+            if up:
+                dirs.append((0, -1))
+            if down:
+                dirs.append((0, 1))
+        else:
+            ahead, left, right = open_[i + dy], open_[i - S], open_[i + S]
+            if ahead:
+                dirs.append((0, dy))
+                if left:
+                    dirs.append((-1, dy))
+                if right:
+                    dirs.append((1, dy))
+            if left:
+                dirs.append((-1, 0))
+            if right:
+                dirs.append((1, 0))
+        return dirs
+
+    def _mark(self, i):
+        x, y = i // self._stride - 1, i % self._stride - 1
+        box = self._box
+        if x < box[0]:
+            box[0] = x
+        elif x > box[2]:
+            box[2] = x
+        if y < box[1]:
+            box[1] = y
+        elif y > box[3]:
+            box[3] = y
+
+    def _jump_straight(self, i, dx, dy):
+        """Moves from i in a straight line until something interesting.
+
+        Returns the jump point or None.
+        """
+        S = self._stride
+        open_ = self._open
+        step = dx * S + dy
+        start = i
+        try:
+            while True:
+                if not open_[i]:
+                    return None
+                if i == self._goal:
+                    return i
+                if dx:
+                    back = i - step
+                    if ((open_[i - 1] and not open_[back - 1])
+                            or (open_[i + 1] and not open_[back + 1])):
+                        return i
+                else:
+                    back = i - step
+                    if ((open_[i - S] and not open_[back - S])
+                            or (open_[i + S] and not open_[back + S])):
+                        return i
+                i += step
+        finally:
+            self._mark(start)
+            self._mark(i)
+
+    def _jump(self, i, dx, dy):
+        """Jumps from i in direction (dx, dy). Returns the next jump point or None."""
+        if not (dx and dy):
+            return self._jump_straight(i, dx, dy)
+
+        S = self._stride
+        open_ = self._open
+        start = i
+        try:
+            while True:
+                if not open_[i]:
+                    return None
+                if i == self._goal:
+                    return i
+                if (self._jump_straight(i + dx * S, dx, 0) is not None
+                        or self._jump_straight(i + dy, 0, dy) is not None):
+                    return i
+                if not (open_[i + dx * S] and open_[i + dy]):
+                    return None
+                i += dx * S + dy
+        finally:
+            self._mark(start)
+            self._mark(i)
+
+    def _fill_in(self, points):
+        """Returns every cell along the straight and diagonal lines between jumps."""
+        path = [points[0]]
+        for x, y in points[1:]:
+            px, py = path[-1]
+            dx, dy = (x > px) - (x < px), (y > py) - (y < py)
+            while (px, py) != (x, y):
+                px, py = px + dx, py + dy
+                path.append((px, py))
+        return path
+
+    def path(self, start, goal):
+        """Returns the shortest path from start to goal, or None, using the cache.
+
+        Uses jump point search when diagonal moves are allowed, and A* otherwise.
+        """
+        key = (tuple(map(int, start)), tuple(map(int, goal)))
+        if key in self._paths:
+            self._paths.move_to_end(key)
+            return self._paths[key][0]
+
+        search = self._jps if self.diagonal else self._astar
+        path, box = search(start, goal)
+        self._paths[key] = (path, tuple(box))
+        while len(self._paths) > self.cache_size:
+            self._paths.popitem(last=False)
+        return path
+
+    def flow_field(self, goal):
+        """Returns the FlowField for a goal.
+
+        It is worked out with a breadth first search if it is not cached.
+        """
+        goal = tuple(map(int, goal))
+        if goal not in self._fields:
+            self._fields[goal] = self._flow_field(goal)
+        return self._fields[goal]
+
+    def _flow_field(self, goal):
+        S = self._stride
+        open_ = self._open_array
+        size = len(open_)
+        w, h = self.blocked.shape
+        distance = np.full(size, -1, dtype=np.int32)
+        moves = self._moves()
+
+        if self.is_open(goal):
+            # Breadth first search, one ring of cells at a time
+            frontier = np.array([self._index(goal)])
+            distance[frontier] = 0
+            steps = 0
+            while len(frontier):
+                steps += 1
+                found = []
+                for offset, _, side_a, side_b in moves:
+                    n = frontier + offset
+                    ok = open_[n] & (distance[n] < 0)
+                    if side_a is not None:
+                        ok &= open_[frontier + side_a] & open_[frontier + side_b]
+                    found.append(n[ok])
+                frontier = np.unique(np.concatenate(found))
+                distance[frontier] = steps
+            self.expanded += int((distance >= 0).sum())
+
+        # The next cell from each cell is the neighbour closest to the goal
+        cells = np.arange(size)
+        next_index = cells.copy()
+        far = np.iinfo(np.int32).max
+        best = np.where(distance >= 0, distance, far)
+        inner = np.flatnonzero(open_)
+        for offset, _, side_a, side_b in moves:
+            n = inner + offset
+            d = np.where(distance[n] >= 0, distance[n], far)
+            if side_a is not None:
+                d = np.where(open_[inner + side_a] & open_[inner + side_b], d, far)
+            closer = d < best[inner]
+            best[inner[closer]] = d[closer]
+            next_index[inner[closer]] = n[closer]
+
+        distance = distance.reshape(w + 2, h + 2)[1:-1, 1:-1]
+        return FlowField(goal, distance, next_index, S)
+
+    def update(self, region, blocked=True):
+        """Blocks or opens a rectangle of cells, and drops the cached results it alters.
+
+        Args:
+            region (tuple or pygame.Rect): (x, y, width, height) of the cells to change.
+            blocked (bool, optional): Whether the cells become blocked. Defaults to
+                True.
+        """
+        x, y, w, h = region
+        self.blocked[max(x, 0):max(x + w, 0), max(y, 0):max(y + h, 0)] = blocked
+        for cx in range(max(x, 0), min(x + w, self.blocked.shape[0])):
+            i = self._index((cx, 0))
+            lo, hi = max(y, 0), min(y + h, self.blocked.shape[1])
+            self._open[i + lo:i + hi] = [not blocked] * max(hi - lo, 0)
+            self._open_array[i + lo:i + hi] = not blocked
+
+        # A search can only be changed by cells next to the ones it looked at
+        x1, y1 = x + w - 1, y + h - 1
+        for key, (_, (bx0, by0, bx1, by1)) in list(self._paths.items()):
+            if x <= bx1 + 1 and x1 >= bx0 - 1 and y <= by1 + 1 and y1 >= by0 - 1:
+                del self._paths[key]
+        self._fields.clear()
+
+    def set_blocked(self, pos, blocked=True):
+        """Blocks or opens a single cell."""
+        self.update((pos[0], pos[1], 1, 1), blocked)
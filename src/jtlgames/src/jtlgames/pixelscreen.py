@@ -0,0 +1,102 @@
+"""Draw pixel art at its own size, and scale the whole screen up once a frame.
+
+Scaling every sprite up by 4 when it is loaded makes 16 times as many pixels to
+keep in memory and to copy on every blit. A PixelScreen gives the game a small
+surface, at the resolution the art was made for, to draw native size sprites
+on. present() scales that surface up to the window once, and shows it. There
+are three ways to scale it:
+
+* 'nearest': each pixel becomes a square block of pixels, with
+  pygame.transform.scale() into the window.
+* 'scale2x': pygame.transform.scale2x(), which smooths diagonal edges, done
+  once for a scale of 2, twice for 4, and so on. The scale must be a power of 2.
+* 'scaled': the window is opened with pygame.SCALED, and SDL scales it, on
+  the graphics card if there is one. The window can be resized. If SDL cannot
+  make a renderer, as with the dummy video driver, it falls back to 'nearest'.
+
+Example::
+
+    pixels = PixelScreen((160, 120), scale=4)
+    while running:
+        pixels.surface.fill((0, 0, 139))
+        pixels.surface.blit(frog, (72, 52))   # A 16 x 16 sprite
+        pixels.present()
+"""
+
+import pygame
+
+__author__ = "Eric Busboom"
+__copyright__ = "Eric Busboom"
+__license__ = "MIT"
+
+MODES = ('nearest', 'scale2x', 'scaled')
+
+
+class PixelScreen(object):
+    """A small surface to draw on, shown scaled up by a whole number in the window.
+
+    Args:
+        size (tuple): The size of the surface to draw on (width, height).
+        scale (int): How many window pixels each of its pixels is, across and down.
+        mode (str): How to scale: 'nearest', 'scale2x' or 'scaled'.
+        flags (int): More flags for pygame.display.set_mode().
+
+    Attributes:
+        surface (pygame.Surface): The surface to draw on.
+        window (pygame.Surface): The display surface.
+    """
+
+    def __init__(self, size, scale=2, mode='nearest', flags=0):
+        if mode not in MODES:
+            raise ValueError(f"Mode must be one of {MODES}, not {mode!r}")
+        if int(scale) != scale or scale < 1:
+            raise ValueError(f"Scale must be a whole number of at least 1, not {scale!r}")
+        if mode == 'scale2x' and scale & (scale - 1):
+            raise ValueError(f"scale2x needs a scale that is a power of 2, not {scale}")
+        self.size = tuple(size)
+        self.scale = int(scale)
+        self.mode = mode
+
+        if mode == 'scaled':
+            # SDL scales the window to fit, keeping whole number scales when it can
+            try:
+                self.window = pygame.display.set_mode(self.size, flags | pygame.SCALED)
+                self.surface = self.window
+            except pygame.error:
+                self.mode = mode = 'nearest'
+
+        if mode != 'scaled':
+            self.window = pygame.display.set_mode((self.size[0] * self.scale, self.size[1] * self.scale), flags)
+            self.surface = pygame.Surface(self.size).convert()
+
+        # The in-between surfaces for scale2x, made once and reused every frame
+        self._doubled = []
+        if mode == 'scale2x':
+            w, h = self.size
+            while w * 2 < self.window.get_width():
+                w, h = w * 2, h * 2
+                self._doubled.append(pygame.Surface((w, h)).convert())
+
+    def present(self):
+        """Scales the surface up into the window, and shows it."""
+        if self.mode == 'nearest':
+            if self.scale == 1:
+                self.window.blit(self.surface, (0, 0))
+            else:
+                pygame.transform.scale(self.surface, self.window.get_size(), self.window)
+        elif self.mode == 'scale2x':
+            source = self.surface
+            for doubled in self._doubled:
+                pygame.transform.scale2x(source, doubled)
+                source = doubled
+            if self.scale == 1:
+                self.window.blit(source, (0, 0))
+            else:
+                pygame.transform.scale2x(source, self.window)
+        pygame.display.flip()
+
+    def to_surface(self, pos):
+        """Returns the position on the surface of a position in the window, such as event.pos."""
+        if self.mode == 'scaled':
+            return pos  # SDL already gives mouse positions on the surface
+        return pos[0] // self.scale, pos[1] // self.scale
@@ -0,0 +1,336 @@
+"""Headless analysis of spritesheets, one at a time or a whole directory tree at once.
+
+For each sheet, the background pixels are found, from the colorkey, or else
+from the top left pixel: the alpha channel if it is transparent, otherwise
+the pixels of its color, for sheets with an opaque background. The
+columns and rows that are completely transparent are the gutters between cells,
+and the cell size and offset are the smallest grid whose lines all fall in the
+gutters. Every cell is then checked for being empty and hashed, so repeated
+frames show up as groups of cells with the same hash.
+
+A directory is analysed in a process pool, and the results are written to a
+JSON manifest. A contact sheet, the cells laid out with their index numbers and
+the empty and duplicate cells marked, can be saved for each sheet.
+
+Example::
+
+    ssinfo assets/sprites -o manifest.json --contact-sheets contact/
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+__author__ = "Eric Busboom"
+__copyright__ = "Eric Busboom"
+__license__ = "MIT"
+
+_logger = logging.getLogger(__name__)
+
+SHEET_SUFFIXES = ('.png', '.gif', '.bmp', '.tga', '.webp')
+
+EMPTY_COLOR = (60, 60, 60)
+DUPLICATE_COLOR = (220, 40, 40)
+CELL_COLOR = (40, 160, 40)
+
+
+def load_sheet(filename):
+    """Loads an image without converting it, so it works with no display."""
+    try:
+        return pygame.image.load(str(filename))
+    except pygame.error as e:
+        raise FileNotFoundError(f"Unable to load spritesheet image: {filename}: {e}")
+
+
+def opaque_pixels(image):
+    """Returns a bool array, indexed [x, y], of the pixels that are not background.
+
+    The background is the colorkey, or else the top left pixel, as with
+    SpriteSheet's colorkey=-1. If that pixel is transparent, the alpha channel
+    says which pixels show. Many sheets have an alpha channel that is opaque
+    over a solid background, so if it is opaque, the pixels of its color are
+    background too, as well as any transparent ones.
+    """
+    alpha = None
+    if image.get_flags() & pygame.SRCALPHA:
+        alpha = pygame.surfarray.array_alpha(image)
+    colorkey = image.get_colorkey()
+    if colorkey is None:
+        colorkey = image.get_at((0, 0))
+        if alpha is not None and colorkey.a == 0:
+            return alpha > 0
+    rgb = pygame.surfarray.array3d(image)
+    shown = (rgb != np.array(colorkey[:3], dtype=rgb.dtype)).any(axis=2)
+    if alpha is not None:
+        shown &= alpha > 0
+    return shown
+
+
+def spans(filled):
+    """Returns the (start, end) of each run of True in a 1D array, end exclusive."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], filled.astype(np.int8), [0]))))
+    return edges.reshape(-1, 2)
+
+
+def detect_axis(filled):
+    """Finds the cell size and offset along one axis.
+
+    A grid fits when every run of filled columns lies inside one whole cell.
+    Of the grids that fit, the one with the fewest cells that are empty or hold
+    more than one run wins, then one that ends exactly at the edge of the
+    image, then the largest, which puts the gutters around the sprites rather
+    than on one side of them.
+
+    Args:
+        filled (array): For each column (or row) of the image, whether it has any
+            opaque pixel.
+
+    Returns:
+        tuple: (size, offset). With one run or none, the whole length of the image
+            is one cell.
+    """
+    length = len(filled)
+    runs = spans(filled)
+    if len(runs) < 2:
+        return length, 0
+
+    starts, ends = runs[:, 0], runs[:, 1] - 1
+    best, best_score = (length, 0), None
+    for size in range(int((runs[:, 1] - runs[:, 0]).max()), length // 2 + 1):
+        # The grid must start at or before the first run, or that run would be cut off
+        offsets = np.arange(min(size, starts[0] + 1))
+        first = (starts[:, None] - offsets) // size
+        last = (ends[:, None] - offsets) // size
+        count = (length - offsets) // size
+        ok = (first == last).all(axis=0) & (last[-1] < count)
+        for i in np.flatnonzero(ok):
+            used = len(np.unique(first[:, i]))
+            misfits = (count[i] - used) + (len(runs) - used)
+            score = (misfits, (length - offsets[i]) % size != 0, -size)
+            if best_score is None or score < best_score:
+                best, best_score = (size, int(offsets[i])), score
+    return best
+
+
+def detect_grid(opaque):
+    """Returns ((width, height), (x, y)), the cell size and offset of an opaque map.
+
+    They come from the gutters, the columns and rows with no opaque pixels.
+    """
+    w, ox = detect_axis(opaque.any(axis=1))
+    h, oy = detect_axis(opaque.any(axis=0))
+    return (w, h), (ox, oy)
+
+
+def analyze_sheet(filename, cellsize=None, offset=None):
+    """Analyses one spritesheet.
+
+    Args:
+        filename (str or Path): The image file.
+        cellsize (tuple, optional): (width, height) of the cells. Detected from the
+            gutters if not given.
+        offset (tuple, optional): (x, y) of the first cell. Detected if not given,
+            otherwise (0, 0) when only the cell size is given.
+
+    Returns:
+        dict: The sheet's size, cell size, offset, grid size in cells, the
+        indices of the empty cells, a hash for every cell (None for empty cells)
+        and the groups of cells that are duplicates of each other. Indices count
+        across then down, as in SpriteSheet. It also has the pixels the cells
+        take, the pixels trimmed, shared frames take, and the fraction saved.
+    """
+    image = load_sheet(filename)
+    opaque = opaque_pixels(image)
+
+    detected = cellsize is None
+    if detected:
+        cellsize, found_offset = detect_grid(opaque)
+        offset = offset or found_offset
+    offset = tuple(offset or (0, 0))
+    cw, ch = cellsize
+    ox, oy = offset
+    cols, rows = (image.get_width() - ox) // cw, (image.get_height() - oy) // ch
+
+    cells = opaque[ox:ox + cols * cw, oy:oy + rows * ch].reshape(cols, cw, rows, ch)
+    # filled[row, col], so ravel() counts across then down
+    filled = cells.any(axis=(1, 3)).T
+
+    pixels = pygame.surfarray.array3d(image)
+    alpha = None
+    if image.get_flags() & pygame.SRCALPHA:
+        alpha = pygame.surfarray.array_alpha(image)
+    hashes = []
+    groups = {}
+    stored = 0
+    for index, full in enumerate(filled.ravel()):
+        if not full:
+            hashes.append(None)
+            continue
+        row, col = divmod(index, cols)
+        x, y = ox + col * cw, oy + row * ch
+        digest = hashlib.blake2b(digest_size=8)
+        cell_opaque = opaque[x:x + cw, y:y + ch]
+        # Hash only what shows, so the color under transparent pixels does not matter
+        shown = np.where(cell_opaque[..., None], pixels[x:x + cw, y:y + ch], 0)
+        digest.update(shown.tobytes())
+        if alpha is not None:
+            shown = np.where(cell_opaque, alpha[x:x + cw, y:y + ch], 0)
+            digest.update(shown.tobytes())
+        hashes.append(digest.hexdigest())
+        if hashes[-1] not in groups:
+            # SpriteSheet.frame_at() stores each distinct frame once, trimmed to
+            # its bounding box
+            xs = np.flatnonzero(cell_opaque.any(axis=1))
+            ys = np.flatnonzero(cell_opaque.any(axis=0))
+            stored += int(xs[-1] - xs[0] + 1) * int(ys[-1] - ys[0] + 1)
+        groups.setdefault(hashes[-1], []).append(index)
+
+    return {
+        'size': list(image.get_size()),
+        'cellsize': [cw, ch],
+        'offset': [ox, oy],
+        'detected': detected,
+        'grid': [cols, rows],
+        'cells': cols * rows,
+        'empty': [int(i) for i in np.flatnonzero(~filled.ravel())],
+        'duplicates': [g for g in groups.values() if len(g) > 1],
+        'hashes': hashes,
+        'cell_pixels': cols * rows * cw * ch,
+        'stored_pixels': stored,
+        'saved': round(1 - stored / (cols * rows * cw * ch), 4) if cols * rows else 0.0,
+    }
+
+
+def contact_sheet(filename, info, scale=None, columns=16):
+    """Returns a surface showing every cell of a sheet with its index.
+
+    Empty cells get a grey frame and duplicated cells a red one.
+
+    Args:
+        filename (str or Path): The image file.
+        info (dict): The analysis of the sheet, from analyze_sheet().
+        scale (int, optional): How many times larger to draw the cells. Defaults to 2
+            for cells up to 64 pixels and 1 for bigger ones.
+        columns (int, optional): Cells per row of the contact sheet. Defaults to 16.
+    """
+    image = load_sheet(filename)
+    cw, ch = info['cellsize']
+    ox, oy = info['offset']
+    cols = info['grid'][0]
+    if scale is None:
+        scale = 2 if max(cw, ch) <= 64 else 1
+    n = info['cells']
+    duplicated = {i for group in info['duplicates'] for i in group}
+    empty = set(info['empty'])
+
+    font = pygame.font.Font(None, 16)
+    pad, label = 4, 14
+    tile_w, tile_h = cw * scale + 2 * pad, ch * scale + 2 * pad + label
+    columns = max(1, min(columns, n))
+    sheet = pygame.Surface((tile_w * columns, tile_h * max(1, -(-n // columns))))
+    sheet.fill((0, 0, 0))
+
+    for index in range(n):
+        row, col = divmod(index, cols)
+        cell = image.subsurface(pygame.Rect(ox + col * cw, oy + row * ch, cw, ch))
+        x, y = (index % columns) * tile_w, (index // columns) * tile_h
+        color = CELL_COLOR
+        if index in empty:
+            color = EMPTY_COLOR
+        elif index in duplicated:
+            color = DUPLICATE_COLOR
+        frame = (x + 1, y + 1, tile_w - 2, tile_h - label - 2)
+        pygame.draw.rect(sheet, color, frame, 1)
+        scaled = pygame.transform.scale(cell, (cw * scale, ch * scale))
+        sheet.blit(scaled, (x + pad, y + pad))
+        number = font.render(str(index), True, (255, 255, 255))
+        sheet.blit(number, (x + pad, y + tile_h - label))
+    return sheet
+
+
+def find_sheets(root):
+    """Returns the image files in a directory tree, sorted."""
+    root = Path(root)
+    if root.is_file():
+        return [root]
+    return sorted(p for p in root.rglob('*')
+                  if p.suffix.lower() in SHEET_SUFFIXES and p.is_file())
+
+
+def _contact_path(contact_dir, name):
+    stem = name.replace('/', '__').rsplit('.', 1)[0]
+    return Path(contact_dir) / (stem + '_contact.png')
+
+
+def audit_sheet(filename, name, cellsize=None, offset=None, contact_dir=None):
+    """Analyses one sheet in a worker process, and saves its contact sheet.
+
+    Returns:
+        dict: The analysis, with the sheet's name, or the error if it could not be read.
+    """
+    pygame.font.init()
+    try:
+        info = {'file': name, **analyze_sheet(filename, cellsize, offset)}
+        if contact_dir is not None:
+            path = _contact_path(contact_dir, name)
+            pygame.image.save(contact_sheet(filename, info), str(path))
+            info['contact_sheet'] = str(path)
+    except (FileNotFoundError, ValueError, pygame.error) as e:
+        return {'file': name, 'error': str(e)}
+    return info
+
+
+def audit(root, manifest_path=None, cellsize=None, offset=None, contact_dir=None,
+          workers=None):
+    """Analyses every sheet in a directory tree in a process pool.
+
+    Args:
+        root (str or Path): The directory to search for images, or a single image.
+        manifest_path (str or Path, optional): Where to write the JSON manifest.
+        cellsize (tuple, optional): Cell size for every sheet. Detected per sheet if
+            not given.
+        offset (tuple, optional): Offset for every sheet.
+        contact_dir (str or Path, optional): Directory to save a contact sheet for
+            each sheet in.
+        workers (int, optional): Number of worker processes. Defaults to the number
+            of CPUs.
+
+    Returns:
+        dict: The manifest, with a 'sheets' list holding the analysis of each
+        sheet, in file name order.
+    """
+    root = Path(root)
+    files = find_sheets(root)
+    base = root if root.is_dir() else root.parent
+    if contact_dir is not None:
+        Path(contact_dir).mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    sheets = {}
+    with ProcessPoolExecutor(workers or os.cpu_count()) as pool:
+        futures = {pool.submit(audit_sheet, str(f), f.relative_to(base).as_posix(),
+                               cellsize, offset, contact_dir): f for f in files}
+        for i, future in enumerate(as_completed(futures), 1):
+            info = future.result()
+            sheets[info['file']] = info
+            if 'error' in info:
+                _logger.warning("%s: %s", info['file'], info['error'])
+            _logger.debug("Sheet %d/%d done: %s", i, len(files), info['file'])
+
+    manifest = {
+        'root': str(root),
+        'seconds': round(time.perf_counter() - start, 3),
+        'sheets': [sheets[k] for k in sorted(sheets)],
+    }
+    if manifest_path is not None:
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=1)
+    _logger.info("Analysed %d sheets in %.2fs", len(files), manifest['seconds'])
+    return manifest
@@ -1,5 +1,12 @@
 """Display a spritesheet expanded to a larger size.
 
+Only the cells that fit on the screen are drawn. Scaled cells and their labels
+are cached, for the page on screen and a page either side of it, and the viewer
+waits for events instead of redrawing in a loop, so it uses no CPU while it sits
+idle, however big the sheet is.
+
+Keys: Up/Down or the mouse wheel scroll by a row, Page Up/Page Down by a
+screen, Home/End jump to the start or the end, +/- zoom in and out.
 """
 
 import pygame
@@ -11,56 +18,155 @@ class SpriteShow:
     """Class to display an expanded spritesheet.
 
     Attributes:
-        spritesheet (SpriteSheet): The spritesheet object.
+        ss (SpriteSheet): The spritesheet object.
         screen_width (int): The width of the display screen.
         screen_height (int): The height of the display screen.
+        zoom (int): How many times larger than the sheet the cells are drawn.
+        top_row (int): The first row of cells on the screen.
     """
 
-    def __init__(self, screen,  filename, cellsize, offset=(0, 0)):
+    MAX_ZOOM = 16
+
+    def __init__(self, screen,  filename, cellsize, offset=(0, 0), zoom=2):
         self.ss = SpriteSheet(filename, cellsize, offset)
         self.screen = screen
         self.screen_width, self.screen_height = screen.get_size()
+        self.zoom = zoom
+        self.top_row = 0
+        self._font = None
+        self._cells = {}
+        self._labels = {}
+
+    @property
+    def cell_size(self):
+        """Returns the size of a cell on screen, including the space for its label"""
+        return self.ss.cellsize[0] * self.zoom + 20, self.ss.cellsize[1] * self.zoom + 20
+
+    @property
+    def cols(self):
+        """Returns the number of cells that fit across the screen"""
+        return max(1, self.screen_width // self.cell_size[0])
+
+    @property
+    def page_rows(self):
+        """Returns the number of rows of cells that fit on the screen"""
+        return max(1, (self.screen_height - 20) // self.cell_size[1])
+
+    @property
+    def total_rows(self):
+        """Returns the number of rows needed to show every cell"""
+        return -(-self.ss.num_sprites // self.cols)
+
+    def visible_indices(self):
+        """Returns the range of sprite indices on the current page"""
+        first = self.top_row * self.cols
+        return range(first, min(first + self.page_rows * self.cols, self.ss.num_sprites))
 
     def sprite_pos(self, index):
         """Returns the screen position of a sprite index, where we will draw the sprite."""
-        cell_x = self.ss.cellsize[0] * 2 + 20
-        cell_y = self.ss.cellsize[1] * 2 + 20
-        cols = self.screen_width // cell_x
-        row, col = divmod(index, cols)
+        cell_x, cell_y = self.cell_size
+        row, col = divmod(index, self.cols)
         x = col * cell_x + 20
-        y = row * cell_y + 20
+        y = (row - self.top_row) * cell_y + 20
         return x, y
 
+    def cell_image(self, index):
+        """Returns the scaled image of a cell, scaling it the first time it is shown at this zoom."""
+        key = (index, self.zoom)
+        if key not in self._cells:
+            sprite = self.ss.image_at(index, colorkey=-1)
+            self._cells[key] = pygame.transform.scale(
+                sprite, (self.ss.cellsize[0] * self.zoom, self.ss.cellsize[1] * self.zoom))
+        return self._cells[key]
+
     def draw_sprite(self, sprite, index):
         x, y = self.sprite_pos(index)
         self.screen.blit(sprite, (x, y))
 
     def text_pos(self, index):
         x, y = self.sprite_pos(index)
-        return x, y + self.ss.cellsize[1] * 2 + 3
+        return x, y + self.ss.cellsize[1] * self.zoom + 3
 
     def draw_text(self, text, index):
         x, y = self.text_pos(index)
-        font = pygame.font.Font(None, 20)
-        text = font.render(text, True, (255, 255, 255))
-        self.screen.blit(text, (x, y))
+        key = (index, text)
+        if key not in self._labels:
+            if self._font is None:
+                self._font = pygame.font.Font(None, 20)
+            self._labels[key] = self._font.render(text, True, (255, 255, 255))
+        self.screen.blit(self._labels[key], (x, y))
 
-    def show(self):
+    def draw(self):
+        """Draws the current page of cells."""
         self.screen.fill((0, 0, 0))
-        for i in range(self.ss.num_sprites):
-            sprite = self.ss.image_at(i, colorkey=-1)
-            sprite = pygame.transform.scale(sprite, (self.ss.cellsize[0] * 2, self.ss.cellsize[1] * 2))
-            self.draw_sprite(sprite, i)
+        for i in self.visible_indices():
+            self.draw_sprite(self.cell_image(i), i)
             self.draw_text(str(i), i)
 
+    def scroll(self, rows):
+        """Moves the page by a number of rows, staying within the sheet."""
+        last = max(0, self.total_rows - self.page_rows)
+        self.top_row = min(max(self.top_row + rows, 0), last)
+        self.evict_cells()
+
+    def evict_cells(self):
+        """Drops the scaled cells and labels more than a page away from the screen, so
+        scrolling through a large sheet keeps no more than three pages of them."""
+        page = self.page_rows * self.cols
+        first = self.top_row * self.cols
+        keep = range(first - page, first + 2 * page)
+        for cache in (self._cells, self._labels):
+            for key in [key for key in cache if key[0] not in keep]:
+                del cache[key]
+
+    def set_zoom(self, zoom):
+        """Changes the zoom, keeping the first cell on screen in view."""
+        first = self.top_row * self.cols
+        zoom = min(max(zoom, 1), self.MAX_ZOOM)
+        if zoom != self.zoom:
+            self.zoom = zoom
+            self._cells.clear()
+            self.top_row = 0
+            self.scroll(first // self.cols)
+
+    def handle_event(self, event):
+        """Updates the view for an event. Returns False if the viewer should close."""
+        if event.type == pygame.QUIT:
+            return False
+        elif event.type == pygame.MOUSEWHEEL:
+            self.scroll(-event.y)
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return False
+            elif event.key == pygame.K_DOWN:
+                self.scroll(1)
+            elif event.key == pygame.K_UP:
+                self.scroll(-1)
+            elif event.key == pygame.K_PAGEDOWN:
+                self.scroll(self.page_rows)
+            elif event.key == pygame.K_PAGEUP:
+                self.scroll(-self.page_rows)
+            elif event.key == pygame.K_HOME:
+                self.scroll(-self.total_rows)
+            elif event.key == pygame.K_END:
+                self.scroll(self.total_rows)
+            elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                self.set_zoom(self.zoom + 1)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self.set_zoom(self.zoom - 1)
+        return True
+
+    def show(self):
         running = True
+        view = None
         while running:
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
+            # Only draw when the view has changed
+            if view != (self.top_row, self.zoom):
+                view = (self.top_row, self.zoom)
+                self.draw()
+                pygame.display.flip()
+            event = pygame.event.wait()
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                view = None
+            running = self.handle_event(event)
         pygame.quit()
-
-
-    
-    
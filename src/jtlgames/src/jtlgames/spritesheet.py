@@ -1,6 +1,37 @@
+import hashlib
 import pygame
 from pathlib import Path
 
+
+def _colorkey_key(colorkey):
+    """Returns a colorkey in a form that can be part of a cache key.
+
+    Colors can be given as a pygame.Color or a list, which are not hashable, so
+    they become (r, g, b, a) tuples, the same for every way of giving one color.
+    """
+    if colorkey is None or isinstance(colorkey, int):
+        return colorkey
+    return tuple(pygame.Color(colorkey))
+
+
+class Frame(object):
+    """A sprite trimmed to its visible pixels, and where to draw it within its cell.
+
+    Attributes:
+        image (pygame.Surface): The trimmed image. Identical frames share the same surface.
+        offset (tuple): Position of the trimmed image within the cell (x, y).
+        size (tuple): Size of the whole cell (width, height).
+    """
+    def __init__(self, image, offset, size):
+        self.image = image
+        self.offset = offset
+        self.size = size
+
+    def draw(self, surface, pos):
+        """Draws the frame with the top left of its cell at pos"""
+        surface.blit(self.image, (pos[0] + self.offset[0], pos[1] + self.offset[1]))
+
+
 class SpriteSheet(object):
     """Class to handle loading and parsing a sprite sheet image.
     """
@@ -28,10 +59,17 @@ class SpriteSheet(object):
             except pygame.error as e:
                 # Probably can't convert because video mode is not set yet. 
                 self.sheet = img
+
+            # convert() drops the alpha channel, so keep it for trimming frames
+            self.alpha_sheet = img if img.get_flags() & pygame.SRCALPHA else None
             
         except pygame.error as e:
             print(f'Unable to load spritesheet image: {filename}')
             raise FileNotFoundError(e)
+
+        self._frames = {}
+        self._frame_images = {}
+        self._composed = {}
         
     def xy_to_index(self, x, y):
         """Converts (x, y) grid position to sprite index"""
@@ -68,6 +106,71 @@ class SpriteSheet(object):
 
 
 
+    def frame_at(self, index, colorkey=None):
+        """Loads a sprite as a Frame, trimmed to its non-transparent pixels.
+
+        Frames are cached, and frames with the same pixels share one surface, so
+        sheets with repeated or mostly empty cells take less memory, and drawing
+        a frame only touches the pixels that show. Sheets with an alpha channel
+        are trimmed on alpha; otherwise give a colorkey, as for image_at().
+        """
+        x, y = self.index_to_xy(index)
+        key = (x, y, _colorkey_key(colorkey))
+        if key in self._frames:
+            return self._frames[key]
+
+        rect = pygame.Rect(x * self.cellsize[0], y * self.cellsize[1], *self.cellsize)
+        if colorkey is None and self.alpha_sheet is not None:
+            cell = self.alpha_sheet.subsurface(rect)
+        else:
+            cell = self.image_at((x, y), colorkey)
+
+        bounds = cell.get_bounding_rect()
+        trimmed = cell.subsurface(bounds)
+        digest = hashlib.blake2b(pygame.image.tobytes(trimmed, 'RGBA'), digest_size=16)
+        digest.update(repr(bounds.size).encode())
+        image_key = digest.digest()
+
+        if image_key not in self._frame_images:
+            image = pygame.Surface(bounds.size, cell.get_flags() & pygame.SRCALPHA)
+            try:
+                image = image.convert_alpha() if cell.get_flags() & pygame.SRCALPHA else image.convert()
+            except pygame.error:
+                pass  # No display yet, keep the plain surface
+            if cell.get_flags() & pygame.SRCALPHA:
+                image.fill((0, 0, 0, 0))
+            image.blit(trimmed, (0, 0))
+            if cell.get_colorkey() is not None:
+                image.set_colorkey(cell.get_colorkey(), pygame.RLEACCEL)
+            self._frame_images[image_key] = image
+
+        frame = Frame(self._frame_images[image_key], bounds.topleft, tuple(self.cellsize))
+        self._frames[key] = frame
+        return frame
+
+    def load_frames(self, colorkey=None):
+        """Loads every sprite in the sheet as a trimmed Frame, in index order"""
+        return [self.frame_at(i, colorkey) for i in range(self.num_sprites)]
+
+    def frame_savings(self):
+        """Returns how much the trimmed, shared frames loaded so far save over whole cells.
+
+        Returns:
+            dict: The number of frames loaded, of distinct surfaces and of empty
+            frames, the pixels whole cells would take, the pixels actually stored,
+            and the fraction saved.
+        """
+        cell_pixels = len(self._frames) * self.cellsize[0] * self.cellsize[1]
+        stored = sum(image.get_width() * image.get_height() for image in self._frame_images.values())
+        return {
+            'frames': len(self._frames),
+            'unique': len(self._frame_images),
+            'empty': sum(1 for f in self._frames.values() if f.image.get_width() == 0),
+            'cell_pixels': cell_pixels,
+            'stored_pixels': stored,
+            'saved': 1 - stored / cell_pixels if cell_pixels else 0.0,
+        }
+
     @property
     def num_sprites(self):
         """Returns the number of sprites in the sprite sheet"""
@@ -87,8 +190,15 @@ class SpriteSheet(object):
         return [self.image_at(index, colorkey) for index in indices]
 
     def compose_horiz(self, indices, colorkey=None):
-        """Creates a composed image of the sprites at the given indices, stacking the spritest from left to right. """
-            
+        """Creates a composed image of the sprites at the given indices, stacking the spritest from left to right.
+
+        The image is made once for each set of indices, and each call returns a copy
+        of it, which is much quicker than blitting the sprites again.
+        """
+        key = (tuple(self.index_to_xy(i) for i in indices), _colorkey_key(colorkey))
+        if key in self._composed:
+            return self._composed[key].copy()
+
         images = self.images_at(indices, colorkey)
         width = sum(image.get_width() for image in images)
         height = images[0].get_height()
@@ -100,7 +210,8 @@ class SpriteSheet(object):
             composed_image.blit(image, (x, 0))
             x += image.get_width()
         
-        return composed_image
+        self._composed[key] = composed_image
+        return composed_image.copy()
 
     def load_strip(self, start_index, image_count, colorkey=None):
         """Loads a strip of images starting at start_index (x, y) and returns them as a list"""
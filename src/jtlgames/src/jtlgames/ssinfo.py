@@ -3,12 +3,14 @@
 """
 
 import argparse
+import json
 import logging
 import sys
 
 from jtlgames import __version__
 import pygame
 from pathlib import Path
+from .sheetinfo import audit
 from .show import SpriteShow
 
 __author__ = "Eric Busboom"
@@ -103,12 +105,21 @@ def parse_args(args):
       :obj:`argparse.Namespace`: command line parameters namespace
     """
     parser = argparse.ArgumentParser(description="SpriteSheet display tool")
-    parser.add_argument("file", help="Path to the image file", type=str)
+    parser.add_argument("file", help="Path to the image file, or a directory of them to analyse", type=str)
     parser.add_argument("--no-show", help="Do not display the image", action="store_true")
     parser.add_argument("-cw", "--width", help="Cell width", type=int, default=None)
     parser.add_argument("-ch", "--height", help="Cell height", type=int, default=None)
     parser.add_argument("-x", "--offset-x", help="X offset", type=int, default=0)
     parser.add_argument("-y", "--offset-y", help="Y offset", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Analyse without a window and write a JSON manifest",
+                        type=str, default=None)
+    parser.add_argument("--contact-sheets", help="Directory to save a contact sheet of each sheet in",
+                        type=str, default=None)
+    parser.add_argument("-w", "--workers", help="Number of worker processes", type=int, default=None)
+    parser.add_argument("-v", "--verbose", dest="loglevel", help="set loglevel to INFO",
+                        action="store_const", const=logging.INFO)
+    parser.add_argument("-vv", "--very-verbose", dest="loglevel", help="set loglevel to DEBUG",
+                        action="store_const", const=logging.DEBUG)
     return parser.parse_args(args)
 
 def main(args):
@@ -117,6 +128,17 @@ def main(args):
     if not file.exists():
         raise FileNotFoundError(f"Error: The file {file} does not exist.")
 
+    # Batch mode: analyse every sheet without opening a window
+    if file.is_dir() or args.output or args.contact_sheets:
+        setup_logging(args.loglevel or logging.INFO)
+        cellsize = None
+        if args.width is not None or args.height is not None:
+            cellsize = (args.width or args.height, args.height or args.width)
+        offset = (args.offset_x, args.offset_y) if args.offset_x or args.offset_y else None
+        manifest = audit(file, args.output, cellsize, offset, args.contact_sheets, args.workers)
+        if args.output is None:
+            print(json.dumps(manifest, indent=1))
+        return
 
     if args.width is None and args.height is not None:
         args.width = args.height
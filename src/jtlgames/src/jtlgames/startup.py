@@ -0,0 +1,335 @@
+"""Measure how long jtlgames, the games and the lessons take to start.
+
+Each target is started in a new Python process, with ``-X importtime`` and the
+dummy video and audio drivers, so no window opens. A target is either a module,
+like ``jtlgames.ssinfo``, or a script, like ``games/flappy_bird/flappy.py``.
+For every target this measures:
+
+* import_ms: wall time from starting the process until the target is imported.
+  A script is imported without running it as ``__main__``.
+* first_frame_ms: wall time from starting the process until a script, run as
+  ``__main__``, first calls pygame.display.flip() or update(). The process
+  stops there.
+* importtime_ms: the time Python spent importing modules, from -X importtime,
+  and the slowest of the top level imports.
+* draws_on_import: True when importing the script already draws a frame,
+  that is, the script does its work at import rather than in a main function.
+
+Results are the median of a number of repeats, and can be saved as a JSON
+baseline. Later runs are compared with the baseline, and a target that has
+become slower by more than a threshold is reported as a regression.
+
+Example::
+
+    jtlstartup --root . --save -b benchmarks/startup.json
+    jtlstartup --root . -b benchmarks/startup.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import pkgutil
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from jtlgames import __version__
+
+__author__ = "Eric Busboom"
+__copyright__ = "Eric Busboom"
+__license__ = "MIT"
+
+_logger = logging.getLogger(__name__)
+
+METRICS = ('import_ms', 'first_frame_ms', 'importtime_ms')
+
+# Run in the child process. It imports as little as it can, so it does not
+# change what is measured.
+_BOOTSTRAP = r'''
+import os, sys, time
+mode, target = sys.argv[1], sys.argv[2]
+
+def report(event):
+    sys.stdout.write("\n@startup %s %.6f\n" % (event, time.time()))
+    sys.stdout.flush()
+
+if target.endswith(".py"):
+    import runpy
+    import pygame
+
+    def first_frame(*args, **kwargs):
+        report("frame")
+        os._exit(0)
+
+    pygame.display.flip = pygame.display.update = first_frame
+    path = os.path.abspath(target)
+    sys.path.insert(0, os.path.dirname(path))
+    sys.argv = [path]
+    runpy.run_path(path, run_name="__main__" if mode == "frame" else "__startup__")
+else:
+    __import__(target)
+report("imported")
+os._exit(0)
+'''
+
+_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+_REPORT = re.compile(r'^@startup (\w+) ([\d.]+)$', re.M)
+
+
+def module_targets():
+    """Returns jtlgames and each of its modules."""
+    import jtlgames
+    modules = pkgutil.iter_modules(jtlgames.__path__)
+    return ['jtlgames'] + sorted(f'jtlgames.{m.name}' for m in modules)
+
+
+def script_targets(root):
+    """Returns the game and lesson scripts under a checkout of the repository.
+
+    A game is its main.py, or otherwise the scripts in its directory that open a
+    window. Every script in lessons is a target.
+    """
+    root = Path(root)
+    scripts = []
+    for game in sorted(p for p in (root / 'games').glob('*') if p.is_dir()):
+        if (game / 'main.py').exists():
+            scripts.append(game / 'main.py')
+        else:
+            scripts.extend(p for p in sorted(game.glob('*.py'))
+                           if 'set_mode(' in p.read_text(errors='ignore'))
+    scripts.extend(sorted((root / 'lessons').rglob('*.py')))
+    return [p.relative_to(root).as_posix() for p in scripts]
+
+
+def parse_importtime(stderr):
+    """Returns the total import time and the top level imports from -X importtime.
+
+    Returns:
+        tuple: (total_ms, [(module, ms), ...]) with the top level imports slowest first.
+    """
+    top = []
+    for line in stderr.splitlines():
+        m = _IMPORTTIME.match(line)
+        if m and len(m.group(3)) == 1:
+            top.append((m.group(4), int(m.group(2)) / 1000))
+    top.sort(key=lambda t: -t[1])
+    return round(sum(ms for _, ms in top), 2), top
+
+
+def measure(target, mode='import', root='.', timeout=30):
+    """Starts target once in a new process and times it.
+
+    Args:
+        target (str): A module name, or the path of a script relative to root.
+        mode (str): 'import' to stop when the target is imported, 'frame' to run a
+            script as __main__ until its first frame.
+        root (str or Path): The directory script paths are relative to.
+        timeout (float): Seconds to wait before giving up on the target.
+
+    Returns:
+        dict: 'ms' from process start to the event, 'event' ('imported' or
+        'frame', None if the process ended without either), 'importtime_ms',
+        'slowest_imports' and 'error' if it failed.
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy',
+               PYGAME_HIDE_SUPPORT_PROMPT='1')
+    path = (Path(root) / target).resolve() if target.endswith('.py') else target
+    # Games load files relative to their own directory, lessons relative to the repo
+    cwd = path.parent if target.startswith('games/') else root
+    start = time.time()
+    try:
+        command = [sys.executable, '-X', 'importtime', '-c', _BOOTSTRAP, mode,
+                   str(path)]
+        proc = subprocess.run(command, capture_output=True, text=True, timeout=timeout,
+                              env=env, cwd=cwd)
+    except subprocess.TimeoutExpired:
+        return {'ms': None, 'event': None, 'error': f'No result after {timeout}s'}
+
+    total, top = parse_importtime(proc.stderr)
+    result = {'ms': None, 'event': None, 'importtime_ms': total,
+              'slowest_imports': [[name, round(ms, 2)] for name, ms in top[:5]]}
+    reports = _REPORT.findall(proc.stdout)
+    if reports:
+        event, when = reports[-1]
+        result['event'] = event
+        result['ms'] = round((float(when) - start) * 1000, 2)
+    elif proc.returncode:
+        stderr = proc.stderr.strip()
+        result['error'] = (stderr.splitlines()[-1] if stderr
+                           else f'Exit {proc.returncode}')
+    return result
+
+
+def benchmark(target, root='.', repeat=3, timeout=30):
+    """Measures the startup of one target, the median of repeat runs.
+
+    Returns:
+        dict: The metrics for the target; see the module documentation.
+    """
+    script = target.endswith('.py')
+    imports = [measure(target, 'import', root, timeout) for _ in range(repeat)]
+    frames = []
+    if script:
+        frames = [measure(target, 'frame', root, timeout) for _ in range(repeat)]
+
+    def median(values):
+        values = [v for v in values if v is not None]
+        return round(statistics.median(values), 2) if values else None
+
+    result = {
+        'import_ms': median(r['ms'] for r in imports if r['event'] == 'imported'),
+        'first_frame_ms': median(r['ms'] for r in frames if r['event'] == 'frame'),
+        'importtime_ms': median(r.get('importtime_ms') for r in imports),
+        'slowest_imports': imports[0].get('slowest_imports', []),
+    }
+    if script:
+        result['draws_on_import'] = any(r['event'] == 'frame' for r in imports)
+        if result['draws_on_import']:
+            result['import_ms'] = median(r['ms'] for r in imports)
+    errors = [r['error'] for r in imports + frames if 'error' in r]
+    if errors:
+        result['error'] = errors[0]
+    return result
+
+
+def compare(results, baseline, threshold=0.25, min_ms=20):
+    """Finds the metrics that have become slower than in the baseline.
+
+    Args:
+        results (dict): Metrics per target, from benchmark().
+        baseline (dict): Metrics per target from an earlier run.
+        threshold (float): The fraction a metric may grow by before it counts as slower.
+        min_ms (float): Smaller changes than this are noise, whatever the fraction.
+
+    Returns:
+        list: (target, metric, baseline ms, new ms) for each regression.
+    """
+    regressions = []
+    for target, metrics in sorted(results.items()):
+        old = baseline.get(target)
+        if not old:
+            continue
+        for metric in METRICS:
+            a, b = old.get(metric), metrics.get(metric)
+            if a is None or b is None:
+                continue
+            if b > a * (1 + threshold) and b - a > min_ms:
+                regressions.append((target, metric, a, b))
+    return regressions
+
+
+def run_all(targets, root='.', repeat=3, timeout=30):
+    """Benchmarks every target and returns the report, with the metrics per target."""
+    results = {}
+    for i, target in enumerate(targets, 1):
+        results[target] = benchmark(target, root, repeat, timeout)
+        _logger.info("%d/%d %s: %s", i, len(targets), target,
+                     {k: results[target][k] for k in METRICS})
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def format_table(results):
+    """Returns the results as a text table, one line per target."""
+    header = f"{'target':<60}{'import':>10}{'frame':>10}{'imports':>10}"
+    lines = [header + "  slowest import"]
+    for target, r in results.items():
+        cells = ''.join(f"{'-' if r[m] is None else format(r[m], '.0f'):>10}"
+                        for m in METRICS)
+        slowest = r['slowest_imports'][0][0] if r['slowest_imports'] else ''
+        note = '  draws on import' if r.get('draws_on_import') else ''
+        note += f"  error: {r['error']}" if 'error' in r else ''
+        lines.append(f"{target:<60}{cells}  {slowest}{note}")
+    return '\n'.join(lines)
+
+
+def parse_args(args):
+    """Parse command line parameters
+
+    Args:
+      args (List[str]): command line parameters as list of strings
+          (for example  ``["--help"]``).
+
+    Returns:
+      :obj:`argparse.Namespace`: command line parameters namespace
+    """
+    parser = argparse.ArgumentParser(
+        description="Measure the startup time of jtlgames, the games and the lessons")
+    parser.add_argument("--version", action="version",
+                        version=f"jtlgames {__version__}")
+    parser.add_argument("targets", nargs='*',
+                        help="Modules or scripts to measure. Defaults to all of them")
+    parser.add_argument("--root", default=".",
+                        help="Checkout of the repository, for the games and lessons")
+    parser.add_argument("-r", "--repeat", type=int, default=3,
+                        help="Runs of each target; the median is reported")
+    parser.add_argument("-b", "--baseline", default=None,
+                        help="JSON baseline to compare with, or to save to")
+    parser.add_argument("--save", help="Save the results as the baseline",
+                        action="store_true")
+    parser.add_argument("-t", "--threshold", type=float, default=0.25,
+                        help="Fraction slower that counts as a regression")
+    parser.add_argument("--min-ms", type=float, default=20,
+                        help="Smallest change in ms that counts as a regression")
+    parser.add_argument("--timeout", help="Seconds to wait for each run", type=float,
+                        default=30)
+    parser.add_argument("-v", "--verbose", dest="loglevel", help="set loglevel to INFO",
+                        action="store_const", const=logging.INFO)
+    parser.add_argument("-vv", "--very-verbose", dest="loglevel",
+                        help="set loglevel to DEBUG",
+                        action="store_const", const=logging.DEBUG)
+    return parser.parse_args(args)
+
+
+def setup_logging(loglevel):
+    """Setup basic logging
+
+    Args:
+      loglevel (int): minimum loglevel for emitting messages
+    """
+    logformat = "[%(asctime)s] %(levelname)s:%(name)s:%(message)s"
+    logging.basicConfig(
+        level=loglevel, stream=sys.stdout, format=logformat, datefmt="%Y-%m-%d %H:%M:%S"
+    )
+
+
+def main(args):
+    args = parse_args(args)
+    setup_logging(args.loglevel)
+    targets = args.targets or module_targets() + script_targets(args.root)
+    report = run_all(targets, args.root, args.repeat, args.timeout)
+    print(format_table(report['results']))
+
+    if args.baseline and args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=1)
+        _logger.info("Saved the baseline to %s", args.baseline)
+    elif args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(report['results'], baseline, args.threshold, args.min_ms)
+        for target, metric, old, new in regressions:
+            print(f"Slower: {target} {metric} {old:.0f}ms -> {new:.0f}ms")
+        if regressions:
+            sys.exit(1)
+
+
+def run():
+    """Calls :func:`main` passing the CLI arguments extracted from :obj:`sys.argv`
+
+    This function can be used as entry point to create console scripts with setuptools.
+    """
+    main(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    run()
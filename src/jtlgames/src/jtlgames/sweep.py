@@ -0,0 +1,407 @@
+"""Run a game many times with different settings, to balance its difficulty.
+
+A sweep runs a session function from a game's headless simulation over a grid
+or a random sample of settings, several seeds for each, in a process pool. The
+session function takes a dict of settings and a seed, plays one game, and
+returns a dict of numbers, for example::
+
+    def sweep_session(params, seed):
+        ...
+        return {'steps': 812, 'score': 9}
+
+Every finished session is appended to a CSV file as soon as it is done, so an
+interrupted sweep continues where it stopped when it is run again with the same
+arguments. When all the sessions are done, the runs are summarised, one row per
+set of settings, with the count, mean, standard deviation, minimum and maximum
+of every value the session returned.
+
+Example::
+
+    jtlsweep games/flappy_bird/sim.py:sweep_session \\
+        --grid PIPE_GAP=120,150,180 --grid GAME_SPEED=10,15,20 --seeds 20 -o flappy.csv
+"""
+
+import argparse
+import ast
+import csv
+import importlib.util
+import itertools
+import logging
+import math
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from jtlgames import __version__
+
+__author__ = "Eric Busboom"
+__copyright__ = "Eric Busboom"
+__license__ = "MIT"
+
+_logger = logging.getLogger(__name__)
+
+_sessions = {}
+
+
+def load_session(target):
+    """Returns the function named by target, 'path/to/file.py:function'.
+
+    The file's directory is put on the front of sys.path while the file is
+    imported, because the game simulations import their config module as a top
+    level module. Afterwards sys.path is put back, and the modules imported from
+    the directory are taken out of sys.modules, so games that use the same
+    module names, like config, do not get each other's.
+    """
+    if target not in _sessions:
+        path, _, name = target.rpartition(':')
+        if not path or not name:
+            raise ValueError(
+                f"Target must look like 'path/to/file.py:function', not {target!r}"
+            )
+        path = Path(path).resolve()
+        if not path.exists():
+            raise FileNotFoundError(f"Error: The file {path} does not exist.")
+        directory = str(path.parent)
+        modules = set(sys.modules)
+        sys.path.insert(0, directory)
+        try:
+            spec = importlib.util.spec_from_file_location(f"_sweep_{path.stem}", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        finally:
+            sys.path.remove(directory)
+            for loaded in set(sys.modules) - modules:
+                file = getattr(sys.modules[loaded], '__file__', None) or ''
+                if file.startswith(directory):
+                    del sys.modules[loaded]
+        _sessions[target] = getattr(module, name)
+    return _sessions[target]
+
+
+def parse_value(text):
+    """Parses a number or other Python literal, leaving anything else as a string."""
+    try:
+        return ast.literal_eval(text.strip())
+    except (ValueError, SyntaxError):
+        return text.strip()
+
+
+def parse_grid(specs):
+    """Parses ['NAME=v1,v2', ...] into {'NAME': [v1, v2], ...}."""
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if not values:
+            raise ValueError(f"Grid values must look like NAME=v1,v2,..., not {spec!r}")
+        grid[name.strip()] = [parse_value(v) for v in values.split(',')]
+    return grid
+
+
+def parse_ranges(specs):
+    """Parses ['NAME=low:high', ...] into {'NAME': (low, high), ...}."""
+    ranges = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        low, sep, high = values.partition(':')
+        if not sep:
+            raise ValueError(
+                f"Random ranges must look like NAME=low:high, not {spec!r}"
+            )
+        ranges[name.strip()] = (parse_value(low), parse_value(high))
+    return ranges
+
+
+def parameter_sets(grid=None, ranges=None, samples=0, seed=None):
+    """Returns the list of settings dicts to try.
+
+    Every combination of the grid values is used. If there are random ranges,
+    each grid combination is combined with `samples` random points drawn from
+    them; a range with two ints draws ints, otherwise floats. The draws come
+    from `seed`, so the same arguments always give the same list, which is what
+    makes a sweep resumable.
+    """
+    grid = grid or {}
+    ranges = ranges or {}
+    combos = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+    if not ranges:
+        return combos
+
+    rng = random.Random(seed)
+    sets = []
+    for combo in combos:
+        for _ in range(samples):
+            point = dict(combo)
+            for name, (low, high) in ranges.items():
+                if isinstance(low, int) and isinstance(high, int):
+                    point[name] = rng.randint(low, high)
+                else:
+                    point[name] = rng.uniform(low, high)
+            sets.append(point)
+    return sets
+
+
+def run_session(target, params, seed):
+    """Runs one session in a worker process and returns its results."""
+    return load_session(target)(dict(params), seed)
+
+
+def drop_partial_row(path):
+    """Cuts off the last line of a runs file if it was left half written, as
+    when a sweep is killed while writing a row. Returns True if it did."""
+    path = Path(path)
+    if not path.exists():
+        return False
+    with path.open('rb+') as f:
+        data = f.read()
+        if not data or data.endswith(b'\n'):
+            return False
+        f.truncate(data.rfind(b'\n') + 1)
+    _logger.warning("Dropped a half written row at the end of %s", path)
+    return True
+
+
+def read_runs(path):
+    """Returns the field names and rows of an existing runs file, or ([], []).
+
+    Rows with missing or extra values are left out, with a warning.
+    """
+    path = Path(path)
+    if not path.exists() or path.stat().st_size == 0:
+        return [], []
+    with path.open(newline='') as f:
+        reader = csv.DictReader(f)
+        rows = []
+        for row in reader:
+            if None in row or None in row.values():
+                _logger.warning(
+                    "Skipping a broken row on line %d of %s", reader.line_num, path
+                )
+            else:
+                rows.append(row)
+        return list(reader.fieldnames or []), rows
+
+
+def run_key(params, seed):
+    """The key that identifies a run in the runs file, all values as strings."""
+    return tuple(str(params[name]) for name in sorted(params)) + (str(seed),)
+
+
+def summarize(fieldnames, rows, param_names):
+    """Groups runs by their settings and returns one summary row per group."""
+    metrics = [f for f in fieldnames if f not in param_names and f != 'seed']
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row[p] for p in param_names), []).append(row)
+
+    summary = []
+    for key, group in groups.items():
+        out = dict(zip(param_names, key))
+        out['runs'] = len(group)
+        for m in metrics:
+            values = [float(r[m]) for r in group if r[m] not in ('', None)]
+            if not values:
+                continue
+            mean = sum(values) / len(values)
+            std = math.sqrt(sum((v - mean) ** 2 for v in values) / len(values))
+            out.update(
+                {
+                    f'{m}_mean': mean,
+                    f'{m}_std': std,
+                    f'{m}_min': min(values),
+                    f'{m}_max': max(values),
+                }
+            )
+        summary.append(out)
+    return summary
+
+
+def write_csv(path, rows):
+    """Writes a list of dicts to a CSV file, with the columns in first-seen order."""
+    fieldnames = list(dict.fromkeys(k for row in rows for k in row))
+    with Path(path).open('w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def sweep(target, param_sets, seeds, runs_path, summary_path=None, workers=None):
+    """Runs every settings dict with every seed, skipping runs already in runs_path.
+
+    Args:
+        target (str): The session function, 'path/to/file.py:function'.
+        param_sets (list): Settings dicts, all with the same names.
+        seeds (list): Seeds to run each settings dict with.
+        runs_path (str or Path): CSV file the results of each run are appended to.
+        summary_path (str or Path, optional): CSV file for the summary. Defaults to
+            runs_path with '_summary' added to the name.
+        workers (int, optional): Number of worker processes. Defaults to the
+            number of CPUs.
+
+    Returns:
+        list: The summary rows.
+    """
+    runs_path = Path(runs_path)
+    if summary_path is None:
+        summary_path = runs_path.with_name(
+            runs_path.stem + '_summary' + runs_path.suffix
+        )
+    param_names = sorted(param_sets[0]) if param_sets else []
+
+    drop_partial_row(runs_path)
+    fieldnames, rows = read_runs(runs_path)
+    if fieldnames and fieldnames[: len(param_names) + 1] != param_names + ['seed']:
+        raise ValueError(
+            f"{runs_path} was written by a sweep over different settings: {fieldnames}"
+        )
+    done = {tuple(row[p] for p in param_names) + (row['seed'],) for row in rows}
+    todo = [(p, s) for p in param_sets for s in seeds if run_key(p, s) not in done]
+    _logger.info("%d runs already done, %d to go", len(done), len(todo))
+
+    if todo:
+        load_session(target)  # Fail early, in this process, if the target is wrong
+        pool = ProcessPoolExecutor(workers or os.cpu_count())
+        with pool, runs_path.open('a', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames) if fieldnames else None
+            futures = {pool.submit(run_session, target, p, s): (p, s) for p, s in todo}
+            for i, future in enumerate(as_completed(futures), 1):
+                params, seed = futures[future]
+                row = {
+                    **{k: params[k] for k in param_names},
+                    'seed': seed,
+                    **future.result(),
+                }
+                if writer is None:
+                    fieldnames = list(row)
+                    writer = csv.DictWriter(f, fieldnames=fieldnames)
+                    writer.writeheader()
+                writer.writerow(row)
+                f.flush()
+                _logger.debug("Run %d/%d done: %s", i, len(todo), row)
+
+    fieldnames, rows = read_runs(runs_path)
+    summary = summarize(fieldnames, rows, param_names)
+    write_csv(summary_path, summary)
+    _logger.info(
+        "Wrote %d runs to %s and the summary to %s", len(rows), runs_path, summary_path
+    )
+    return summary
+
+
+def parse_args(args):
+    """Parse command line parameters
+
+    Args:
+      args (List[str]): command line parameters as list of strings
+          (for example  ``["--help"]``).
+
+    Returns:
+      :obj:`argparse.Namespace`: command line parameters namespace
+    """
+    parser = argparse.ArgumentParser(
+        description="Sweep a game's settings over many headless sessions"
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"jtlgames {__version__}"
+    )
+    parser.add_argument(
+        "target", help="Session function, as path/to/file.py:function", type=str
+    )
+    parser.add_argument(
+        "-g",
+        "--grid",
+        help="Values to try, NAME=v1,v2,... (repeatable)",
+        action="append",
+        default=[],
+    )
+    parser.add_argument(
+        "-r",
+        "--random",
+        help="Range to sample, NAME=low:high (repeatable)",
+        action="append",
+        default=[],
+    )
+    parser.add_argument(
+        "-n", "--samples", help="Random samples per grid point", type=int, default=10
+    )
+    parser.add_argument(
+        "-s",
+        "--seeds",
+        help="Sessions to run for each set of settings",
+        type=int,
+        default=10,
+    )
+    parser.add_argument(
+        "--seed", help="Seed for drawing the random samples", type=int, default=0
+    )
+    parser.add_argument(
+        "-w", "--workers", help="Number of worker processes", type=int, default=None
+    )
+    parser.add_argument(
+        "-o", "--output", help="CSV file for the runs", type=str, default="sweep.csv"
+    )
+    parser.add_argument(
+        "--summary", help="CSV file for the summary", type=str, default=None
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="loglevel",
+        help="set loglevel to INFO",
+        action="store_const",
+        const=logging.INFO,
+    )
+    parser.add_argument(
+        "-vv",
+        "--very-verbose",
+        dest="loglevel",
+        help="set loglevel to DEBUG",
+        action="store_const",
+        const=logging.DEBUG,
+    )
+    return parser.parse_args(args)
+
+
+def setup_logging(loglevel):
+    """Setup basic logging
+
+    Args:
+      loglevel (int): minimum loglevel for emitting messages
+    """
+    logformat = "[%(asctime)s] %(levelname)s:%(name)s:%(message)s"
+    logging.basicConfig(
+        level=loglevel, stream=sys.stdout, format=logformat, datefmt="%Y-%m-%d %H:%M:%S"
+    )
+
+
+def main(args):
+    args = parse_args(args)
+    setup_logging(args.loglevel)
+    sets = parameter_sets(
+        parse_grid(args.grid), parse_ranges(args.random), args.samples, args.seed
+    )
+    if not sets:
+        raise ValueError(
+            "Nothing to sweep, give at least one --grid or --random setting"
+        )
+    sweep(
+        args.target,
+        sets,
+        list(range(args.seeds)),
+        args.output,
+        args.summary,
+        args.workers,
+    )
+
+
+def run():
+    """Calls :func:`main` passing the CLI arguments extracted from :obj:`sys.argv`
+
+    This function can be used as entry point to create console scripts with setuptools.
+    """
+    main(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    run()
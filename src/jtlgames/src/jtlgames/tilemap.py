@@ -0,0 +1,131 @@
+"""Draw large scrolling worlds made of tiles from a spritesheet.
+
+The map is cut into chunks of tiles. A chunk is drawn onto its own surface the
+first time the camera sees it, and kept in a cache, so a frame costs one blit
+per visible chunk no matter how big the world is. Chunks that have not been
+seen for a while are dropped from the cache when it is full.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+class TileMap:
+    """A grid of tiles drawn through a camera rect.
+
+    Attributes:
+        ss (SpriteSheet): The spritesheet the tiles come from.
+        tiles (list): Rows of tile indices; a negative index is an empty tile.
+        cols (int): Width of the map in tiles.
+        rows (int): Height of the map in tiles.
+        chunk_size (tuple): Size of a chunk in tiles (columns, rows).
+        cache_size (int): Number of chunk surfaces to keep.
+        chunks_rendered (int): How many times a chunk has been drawn, useful to check the cache.
+    """
+
+    def __init__(self, spritesheet, tiles, chunk_size=(16, 16), cache_size=64, colorkey=None):
+        """
+        Args:
+            spritesheet (SpriteSheet): The spritesheet the tiles come from.
+            tiles (sequence): Rows of tile indices into the spritesheet, e.g. a list of lists
+                or a 2D numpy array. Use -1 for an empty tile.
+            chunk_size (tuple, optional): Size of a chunk in tiles. Defaults to (16, 16).
+            cache_size (int, optional): Number of chunk surfaces to keep. Defaults to 64.
+            colorkey (optional): Colorkey for the tile images, as in SpriteSheet.image_at().
+        """
+        self.ss = spritesheet
+        self.tiles = [[int(t) for t in row] for row in tiles]
+        self.rows = len(self.tiles)
+        self.cols = len(self.tiles[0]) if self.rows else 0
+        self.tile_w, self.tile_h = spritesheet.cellsize
+        self.chunk_size = chunk_size
+        self.cache_size = cache_size
+        self.colorkey = colorkey
+        self.chunks_rendered = 0
+        self._tile_images = {}
+        self._chunks = OrderedDict()
+
+    @property
+    def size(self):
+        """Returns the size of the whole map in pixels"""
+        return self.cols * self.tile_w, self.rows * self.tile_h
+
+    @property
+    def chunk_pixels(self):
+        """Returns the size of a chunk in pixels"""
+        return self.chunk_size[0] * self.tile_w, self.chunk_size[1] * self.tile_h
+
+    def tile_image(self, index):
+        """Returns the image for a tile index, loading it from the spritesheet once."""
+        if index not in self._tile_images:
+            self._tile_images[index] = self.ss.image_at(index, self.colorkey)
+        return self._tile_images[index]
+
+    def get_tile(self, col, row):
+        """Returns the tile index at a map position"""
+        return self.tiles[row][col]
+
+    def set_tile(self, col, row, index):
+        """Changes the tile at a map position. The chunk holding it is drawn again when next seen."""
+        self.tiles[row][col] = index
+        self._chunks.pop((col // self.chunk_size[0], row // self.chunk_size[1]), None)
+
+    def _render_chunk(self, cx, cy):
+        cw, ch = self.chunk_size
+        transparent = self.colorkey is not None
+        surface = pygame.Surface(self.chunk_pixels, pygame.SRCALPHA if transparent else 0)
+        try:
+            surface = surface.convert_alpha() if transparent else surface.convert()
+        except pygame.error:
+            pass  # No display yet, keep the plain surface
+        if transparent:
+            surface.fill((0, 0, 0, 0))
+
+        for row in range(cy * ch, min((cy + 1) * ch, self.rows)):
+            y = (row - cy * ch) * self.tile_h
+            tile_row = self.tiles[row]
+            for col in range(cx * cw, min((cx + 1) * cw, self.cols)):
+                index = tile_row[col]
+                if index >= 0:
+                    surface.blit(self.tile_image(index), ((col - cx * cw) * self.tile_w, y))
+
+        self.chunks_rendered += 1
+        return surface
+
+    def chunk(self, cx, cy):
+        """Returns the surface for the chunk at chunk position (cx, cy), drawing it if it is not cached."""
+        key = (cx, cy)
+        surface = self._chunks.get(key)
+        if surface is None:
+            surface = self._chunks[key] = self._render_chunk(cx, cy)
+        else:
+            self._chunks.move_to_end(key)
+        return surface
+
+    def visible_chunks(self, camera):
+        """Returns the chunk positions that overlap the camera rect, in world pixels."""
+        pw, ph = self.chunk_pixels
+        max_cx = (self.cols - 1) // self.chunk_size[0]
+        max_cy = (self.rows - 1) // self.chunk_size[1]
+        x0, x1 = max(camera.left // pw, 0), min((camera.right - 1) // pw, max_cx)
+        y0, y1 = max(camera.top // ph, 0), min((camera.bottom - 1) // ph, max_cy)
+        return [(cx, cy) for cy in range(y0, y1 + 1) for cx in range(x0, x1 + 1)]
+
+    def draw(self, surface, camera, dest=(0, 0)):
+        """Draws the part of the map seen by the camera.
+
+        Args:
+            surface (pygame.Surface): The surface to draw on, usually the screen.
+            camera (pygame.Rect): The part of the world to show, in world pixels.
+            dest (tuple, optional): Where the camera's top left corner goes on the surface.
+        """
+        camera = pygame.Rect(camera)
+        pw, ph = self.chunk_pixels
+        visible = self.visible_chunks(camera)
+        for cx, cy in visible:
+            surface.blit(self.chunk(cx, cy), (cx * pw - camera.x + dest[0], cy * ph - camera.y + dest[1]))
+
+        # Drop the least recently seen chunks, but never the ones on screen now
+        while len(self._chunks) > max(self.cache_size, len(visible)):
+            self._chunks.popitem(last=False)
@@ -0,0 +1,309 @@
+"""Call functions later, once or repeatedly, from a timing wheel.
+
+Games often keep a start time for everything that happens later, such as an
+explosion that goes away after 400 ms or an enemy that shoots every 700 ms,
+and compare every one of them with pygame.time.get_ticks() on every frame.
+A TimerWheel keeps the timers instead, and update() calls the ones that are
+due, so a frame costs about the same however many timers are waiting.
+
+The wheel is a list of levels, each with 256 slots. Level 0 has one slot per
+tick, level 1 one slot per 256 ticks, and so on. A timer goes in the slot for
+its tick on the lowest level that reaches it. When the time moves into the next
+slot of a higher level, the timers in that slot move down to the levels below,
+so each timer is moved at most once per level before it is called.
+
+The time comes from a clock. RealClock reads pygame.time.get_ticks();
+SimulatedClock only moves when it is told to, so a game can run headless, in a
+test or a replay, with the same timers called in the same order every time.
+
+Example::
+
+    clock = SimulatedClock()
+    timers = TimerWheel(clock)
+    timers.after(400, explosion.kill)
+    shooting = timers.every(700, enemies.shoot)
+
+    clock.advance(1000)
+    timers.update()  # Kills the explosion, and the enemies shoot once
+    shooting.cancel()
+"""
+
+import pygame
+
+
+class RealClock(object):
+    """The time from pygame, in milliseconds since pygame.init()."""
+
+    def now(self):
+        return pygame.time.get_ticks()
+
+
+class SimulatedClock(object):
+    """A clock that only moves when advance() is called.
+
+    Attributes:
+        time (int): The current time in milliseconds.
+    """
+
+    def __init__(self, start=0):
+        self.time = start
+
+    def now(self):
+        return self.time
+
+    def advance(self, ms):
+        """Moves the clock on by ms milliseconds and returns the new time."""
+        self.time += ms
+        return self.time
+
+
+class Timer(object):
+    """A function waiting to be called by a TimerWheel.
+
+    Attributes:
+        when (int): The time the timer is due, in milliseconds.
+        interval (int): Milliseconds between calls for a repeating timer, None for a
+            one-shot timer. It can be changed, and the new interval is used from the
+            next call.
+        callback (callable): The function to call.
+        args (tuple): The arguments to call it with.
+        active (bool): False once a one-shot timer has been called or any timer is
+            cancelled.
+    """
+
+    def __init__(self, wheel, when, interval, callback, args, seq):
+        self.wheel = wheel
+        self.when = when
+        self.interval = interval
+        self.callback = callback
+        self.args = args
+        self.active = True
+        self._seq = seq
+        self._slot = None
+
+    @property
+    def remaining(self):
+        """Returns the milliseconds until the timer is due."""
+        return self.when - self.wheel.time
+
+    def cancel(self):
+        """Stops the timer from being called again."""
+        self.wheel.cancel(self)
+
+    def __repr__(self):
+        return (f"Timer({self.callback!r}, when={self.when}, interval={self.interval}, "
+                f"active={self.active})")
+
+
+class TimerWheel(object):
+    """Calls one-shot and repeating timers when they are due.
+
+    Delays count from the time of the last update(), so timers added by a
+    callback, or during a frame, are as far apart as their delays say. Timers
+    due at the same time are called in the order they were added, and a
+    repeating timer that is several calls behind, after a long pause, is called
+    once for each of them.
+
+    Attributes:
+        clock: Anything with a now() method that returns milliseconds. Defaults to a
+            RealClock.
+        resolution (int): Milliseconds per tick. A timer is called at the first
+            update() at or after its time, rounded up to a whole tick.
+        time (int): The time of the last update(), in milliseconds.
+    """
+
+    BITS = 8
+    LEVELS = 4
+
+    def __init__(self, clock=None, resolution=1):
+        self.clock = clock or RealClock()
+        self.resolution = resolution
+        self.time = self.clock.now()
+        self._tick = self._ticks(self.time)
+        self._levels = [{} for _ in range(self.LEVELS)]
+        self._counts = [0] * (self.LEVELS + 1)
+        self._overflow = set()
+        self._ready = []
+        self._seq = 0
+        self._pending = 0
+
+    def __len__(self):
+        """Returns the number of timers waiting to be called."""
+        return self._pending
+
+    def _ticks(self, ms):
+        return int(ms // self.resolution)
+
+    def after(self, delay, callback, *args):
+        """Calls callback(*args) once, delay milliseconds from now.
+
+        Returns:
+            Timer: The timer, which can be cancelled.
+        """
+        return self._add(self.time + delay, None, callback, args)
+
+    def every(self, interval, callback, *args, delay=None):
+        """Calls callback(*args) every interval milliseconds until it is cancelled.
+
+        Args:
+            interval (int): Milliseconds between calls.
+            callback (callable): The function to call.
+            delay (int, optional): Milliseconds until the first call. Defaults to
+                interval.
+
+        Returns:
+            Timer: The timer, which can be cancelled.
+        """
+        if interval <= 0:
+            raise ValueError(
+                f"A repeating timer needs an interval above 0, not {interval}")
+        if delay is None:
+            delay = interval
+        return self._add(self.time + delay, interval, callback, args)
+
+    def cancel(self, timer):
+        """Stops a timer. Cancelling a timer that has already stopped does nothing."""
+        if not timer.active:
+            return
+        timer.active = False
+        self._pending -= 1
+        if timer._slot is not None:
+            level, slot = timer._slot
+            if level == self.LEVELS:
+                self._overflow.discard(timer)
+            else:
+                self._levels[level][slot].discard(timer)
+            self._counts[level] -= 1
+            timer._slot = None
+
+    def clear(self):
+        """Cancels every timer."""
+        for level in self._levels:
+            for bucket in level.values():
+                for timer in bucket:
+                    timer.active = False
+                    timer._slot = None
+            level.clear()
+        for timer in self._overflow | set(self._ready):
+            timer.active = False
+            timer._slot = None
+        self._overflow.clear()
+        self._ready.clear()
+        self._counts = [0] * (self.LEVELS + 1)
+        self._pending = 0
+
+    def _add(self, when, interval, callback, args):
+        self._seq += 1
+        timer = Timer(self, when, interval, callback, args, self._seq)
+        self._pending += 1
+        self._place(timer)
+        return timer
+
+    def _place(self, timer):
+        """Puts a timer in the slot for its tick, on the lowest level reaching it."""
+        # Round up, so no timer is called early
+        due = -int(-timer.when // self.resolution)
+        if due <= self._tick:
+            timer._slot = None
+            self._ready.append(timer)
+            return
+        for level in range(self.LEVELS):
+            shift = self.BITS * level
+            # The lowest level where the timer and now share a turn of the level above
+            if due >> (shift + self.BITS) == self._tick >> (shift + self.BITS):
+                slot = (due >> shift) & ((1 << self.BITS) - 1)
+                self._levels[level].setdefault(slot, set()).add(timer)
+                break
+        else:
+            level, slot = self.LEVELS, None
+            self._overflow.add(timer)
+        timer._slot = (level, slot)
+        self._counts[level] += 1
+
+    def _take(self, level, slot):
+        """Removes and returns the timers in one slot."""
+        if level == self.LEVELS:
+            bucket = self._overflow
+        else:
+            bucket = self._levels[level].pop(slot, None)
+        if not bucket:
+            return []
+        timers = list(bucket)
+        if level == self.LEVELS:
+            self._overflow = set()
+        self._counts[level] -= len(timers)
+        for timer in timers:
+            timer._slot = None
+        return timers
+
+    def _fire(self, timers):
+        """Calls the due timers, earliest first, and puts back the repeating ones."""
+        calls = 0
+        for timer in sorted(timers, key=lambda t: (t.when, t._seq)):
+            if not timer.active:
+                continue
+            if timer.interval is None:
+                timer.active = False
+                self._pending -= 1
+            timer.callback(*timer.args)
+            calls += 1
+            if timer.active and timer.interval is not None and timer._slot is None:
+                timer.when += timer.interval
+                self._place(timer)
+        return calls
+
+    def _drain(self):
+        calls = 0
+        while self._ready:
+            ready, self._ready = self._ready, []
+            calls += self._fire(ready)
+        return calls
+
+    def update(self, now=None):
+        """Calls every timer that is due, in time order.
+
+        Args:
+            now (int, optional): The time in milliseconds. Defaults to the clock's time.
+
+        Returns:
+            int: The number of calls made.
+        """
+        now = self.clock.now() if now is None else now
+        target = self._ticks(now)
+        mask = (1 << self.BITS) - 1
+        calls = self._drain()
+        while self._tick < target:
+            if self._counts[0] == 0:
+                # Nothing happens before the next slot of the lowest level with timers
+                lowest = next((i for i, n in enumerate(self._counts) if n), None)
+                if lowest is None:
+                    self._tick = target
+                    break
+                step = 1 << (self.BITS * lowest)
+                skip = (self._tick | (step - 1)) + 1
+                if skip > target:
+                    self._tick = target
+                    break
+                self._tick = skip
+            else:
+                self._tick += 1
+            tick = self._tick
+            self.time = tick * self.resolution
+
+            # Move the timers in the next slot of each level that turned, down a level
+            if tick & mask == 0:
+                top = 1
+                while top < self.LEVELS and (tick >> (self.BITS * top)) & mask == 0:
+                    top += 1
+                for level in range(top, 0, -1):
+                    slot = None
+                    if level < self.LEVELS:
+                        slot = (tick >> (self.BITS * level)) & mask
+                    for timer in self._take(level, slot):
+                        self._place(timer)
+
+            calls += self._fire(self._take(0, tick & mask))
+            calls += self._drain()
+        self.time = now
+        calls += self._drain()
+        return calls
@@ -1,6 +1,9 @@
+import logging
 import pygame
 import math
 
+_logger = logging.getLogger(__name__)
+
 # Constants for colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -8,6 +11,39 @@ BLUE = (0, 0, 255)
 GREEN = (0, 100, 0)
 GRAY = (128, 128, 128)
 
+# Fonts and rendered labels are shared by every factory. Creating a SysFont
+# searches the system fonts, far too slow to do for every vector on every frame.
+_fonts = {}
+_labels = {}
+_grids = {}
+MAX_LABELS = 512
+
+
+def get_font(size):
+    """Returns the default SysFont at a size, creating it the first time."""
+    if size not in _fonts:
+        _fonts[size] = pygame.font.SysFont(None, size)
+    return _fonts[size]
+
+
+def render_label(text, size, color, background=None):
+    """Returns a rendered text surface, reusing it if the same text was rendered before."""
+    key = (text, size, color, background)
+    label = _labels.get(key)
+    if label is None:
+        if len(_labels) >= MAX_LABELS:
+            _labels.clear()
+        label = _labels[key] = get_font(size).render(text, True, color, background)
+    return label
+
+
+def clear_caches():
+    """Forgets the cached fonts, labels and grids. Call this after pygame.quit() if
+    pygame will be started again, because the old fonts are no longer usable."""
+    _fonts.clear()
+    _labels.clear()
+    _grids.clear()
+
 # Factory function to create the Vector20 class with customizable screen size and scale
 def Vector20Factory(screen_width=800, screen_height=600, scale=20):
     class Vector20(pygame.math.Vector2):
@@ -31,7 +67,7 @@ def Vector20Factory(screen_width=800, screen_height=600, scale=20):
         start = origin + start_o
         end = end_o + start
         
-        print("Draw from ", start, " to ", end)
+        _logger.debug("Draw from %s to %s", start, end)
         pygame.draw.line(screen, BLACK, start, end, 3)  # Line from start to end
 
         # Calculate the arrowhead
@@ -54,14 +90,11 @@ def Vector20Factory(screen_width=800, screen_height=600, scale=20):
         mid_x = (start.x + end.x) / 2
         mid_y = (start.y + end.y) / 2
 
-        # Create a font object
-        font = pygame.font.SysFont(None, 24)
-      
         disp_x = end_o.x // scale
         disp_y = end_o.y // scale
-        
+
         # Render the text with white background
-        text_surface = font.render(f"({disp_x:.1f}, {disp_y:.1f})", True, BLUE, WHITE)
+        text_surface = render_label(f"({disp_x:.1f}, {disp_y:.1f})", 24, BLUE, WHITE)
         text_rect = text_surface.get_rect(center=(mid_x, mid_y))
         
         # Draw the text on the screen at the midpoint of the line
@@ -91,13 +124,11 @@ def Vector20Factory(screen_width=800, screen_height=600, scale=20):
         center_x = screen_width // 2
         center_y = screen_height // 2
 
-        font = pygame.font.SysFont(None, 16)
-
         # Label vertical lines at y=0
         for x in range(0, screen_width, scale):
             line_number = (x - center_x) // scale
             if line_number != 0:  # Skip the center line label
-                label = font.render(str(line_number), True, GREEN)
+                label = render_label(str(line_number), 16, GREEN)
                 label_rect = label.get_rect()
                 # Draw the label with white background buffer
                 pygame.draw.rect(screen, WHITE, (x - label_rect.width // 2, center_y + 5, label_rect.width, label_rect.height))
@@ -107,16 +138,26 @@ def Vector20Factory(screen_width=800, screen_height=600, scale=20):
         for y in range(0, screen_height, scale):
             line_number = (center_y - y) // scale
             if line_number != 0:  # Skip the center line label
-                label = font.render(str(line_number), True, GREEN)
+                label = render_label(str(line_number), 16, GREEN)
                 label_rect = label.get_rect()
                 # Draw the label with white background buffer
                 pygame.draw.rect(screen, WHITE, (center_x + 5, y - label_rect.height // 2, label_rect.width, label_rect.height))
                 screen.blit(label, (center_x + 5, y - label_rect.height // 2))
 
     def draw_grid(screen):
-
-        screen.fill((255, 255, 255))
-        _draw_grid(screen)
-        _label_lines(screen)
+        """Draws the grid and its labels. They are drawn once onto a surface that is
+        kept for this screen size and scale, and every later call is a single blit."""
+        key = (screen_width, screen_height, scale)
+        grid = _grids.get(key)
+        if grid is None:
+            grid = pygame.Surface((screen_width, screen_height))
+            _draw_grid(grid)
+            _label_lines(grid)
+            try:
+                grid = grid.convert()
+            except pygame.error:
+                pass  # No display yet, keep the plain surface
+            _grids[key] = grid
+        screen.blit(grid, (0, 0))
 
     return Vector20, drawv20, draw_grid
@@ -0,0 +1,31 @@
+"""
+    Benchmarks for the hot paths of jtlgames and for frames of the games.
+
+    They need pytest-benchmark, and are not run with the other tests. Run them,
+    and save the results as the baseline, with::
+
+        tox -e bench
+
+    Then compare a later run with the latest baseline; it fails when the fastest
+    run of a benchmark is more than 25% slower, which is less thrown by a busy
+    machine than the mean or the median::
+
+        tox -e bench-compare
+
+    The baselines are kept in benchmarks/pytest at the top of the repository.
+"""
+
+import pygame
+import pytest
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    collect_ignore_glob = ["test_*.py"]
+
+
+@pytest.fixture
+def screen():
+    pygame.init()
+    yield pygame.display.set_mode((800, 600))
+    pygame.quit()
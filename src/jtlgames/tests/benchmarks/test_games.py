@@ -0,0 +1,37 @@
+import pygame
+
+
+def test_space_invaders_frame(benchmark, load_game):
+    invaders = load_game('Space_Invaders_Classic', 'main')
+    invaders.game = game = invaders.SpaceInvaders()
+    pygame.event.post(pygame.event.Event(pygame.KEYUP, key=pygame.K_a))  # Leave the menu
+    game.step()
+    assert game.startGame
+
+    benchmark(game.step)
+
+
+def test_mars_lander_frame(benchmark, load_game):
+    mars = load_game('Mars-lander', 'game')
+    game = mars.Game()
+    game.new_game()
+    enter = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN)
+
+    def keep_playing():
+        # Continue past the menus when the lander lands or crashes, so every round is a frame of play
+        while game.state != mars.PLAYING:
+            game.step([enter] if game.state == mars.PAUSED else [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_n)])
+
+    benchmark.pedantic(game.step, args=([], {pygame.K_SPACE: True}), setup=keep_playing, rounds=50)
+
+
+def test_flappy_frame(benchmark, load_game):
+    flappy = load_game('flappy_bird', 'flappy')
+    screen = flappy.assets.screen
+    bird, bird_group, ground_group, pipe_group = flappy.new_game()
+
+    def fly():
+        if bird.rect[1] > flappy.SCREEN_HEIGHT / 2:
+            bird.bump()
+
+    benchmark.pedantic(flappy.step, args=(screen, bird_group, ground_group, pipe_group), setup=fly, rounds=500)
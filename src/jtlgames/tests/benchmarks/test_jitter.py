@@ -0,0 +1,64 @@
+"""Frame timing of the blocking clock.tick() loop and the asyncio FrameDriver.
+
+Each benchmark runs FRAMES frames at 60 frames per second, and saves the jitter,
+how far the times between frames were from 1/60 s, in the benchmark's
+extra_info. The time of the benchmark itself is the time of all the frames.
+"""
+
+import asyncio
+import time
+
+import pygame
+
+from jtlgames.asyncloop import FrameDriver, jitter_stats
+
+FRAMES = 60
+
+
+def draw(screen):
+    screen.fill((0, 0, 139))
+    for i in range(50):
+        pygame.draw.circle(screen, (255, 255, 255), (i * 16, 300), 5)
+    pygame.display.flip()
+
+
+def test_clock_tick_jitter(benchmark, screen):
+    def run():
+        clock = pygame.time.Clock()
+        starts = []
+        for _ in range(FRAMES):
+            starts.append(time.perf_counter())
+            draw(screen)
+            clock.tick(60)
+        return jitter_stats([b - a for a, b in zip(starts, starts[1:])], 60)
+
+    stats = benchmark.pedantic(run, rounds=1, iterations=1)
+    benchmark.extra_info.update(stats)
+
+
+def test_frame_driver_jitter(benchmark, screen):
+    def run():
+        driver = FrameDriver(lambda dt: draw(screen), frame_rate=60)
+        steps = 0
+
+        async def background():
+            # Stands in for I/O, like sending telemetry: short waits with a little work between them
+            nonlocal steps
+            while driver.running or not driver.frames:
+                await asyncio.sleep(0.0005)
+                sum(range(2000))
+                steps += 1
+
+        async def main():
+            task = asyncio.create_task(background())
+            await driver.run(FRAMES)
+            await task
+
+        asyncio.run(main())
+        return dict(driver.stats(), background_steps=steps)
+
+    stats = benchmark.pedantic(run, rounds=1, iterations=1)
+    benchmark.extra_info.update(stats)
+    assert stats['background_steps'] > FRAMES
+    # On the wall clock, so only roughly on time
+    assert abs(stats['mean_ms'] - 1000 / 60) < 3
@@ -0,0 +1,56 @@
+import pygame
+import pytest
+
+from jtlgames.loop import main_loop
+from jtlgames.spritesheet import SpriteSheet
+from jtlgames.vector20 import Vector20Factory
+
+
+@pytest.fixture
+def sheet(screen, tmp_path):
+    """A sheet of 8 x 8 cells of 32 x 32 pixels, each a different color"""
+    image = pygame.Surface((256, 256))
+    for i in range(64):
+        image.fill((i * 4, 255 - i * 4, 128), ((i % 8) * 32 + 4, (i // 8) * 32 + 4, 24, 24))
+    pygame.image.save(image, str(tmp_path / 'sheet.png'))
+    return SpriteSheet(tmp_path / 'sheet.png', (32, 32))
+
+
+def test_image_at(benchmark, sheet):
+    image = benchmark(sheet.image_at, 10, -1)
+    assert image.get_size() == (32, 32)
+
+
+def test_load_strip(benchmark, sheet):
+    images = benchmark(sheet.load_strip, (0, 2), 8, -1)
+    assert len(images) == 8
+
+
+def test_compose_horiz(benchmark, sheet):
+    def compose():
+        sheet._composed.clear()  # Time making the image, not finding it in the cache
+        return sheet.compose_horiz(range(8), -1)
+
+    assert benchmark(compose).get_size() == (256, 32)
+
+
+def test_compose_horiz_cached(benchmark, sheet):
+    assert benchmark(sheet.compose_horiz, range(8), -1).get_size() == (256, 32)
+
+
+def test_vector20_draw(benchmark, screen):
+    Vector20, drawv20, draw_grid = Vector20Factory(800, 600, 20)
+    vectors = [(Vector20(0, 0), Vector20(x, 10 - x)) for x in range(-10, 11, 4)]
+
+    def frame():
+        draw_grid(screen)
+        for start, end in vectors:
+            drawv20(screen, start, end)
+
+    benchmark(frame)
+
+
+def test_main_loop(benchmark, screen):
+    loop = main_loop(screen, frame_rate=0)  # No frame cap, so the loop itself is timed
+    next(loop)
+    benchmark(next, loop)
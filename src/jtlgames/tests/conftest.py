@@ -7,4 +7,37 @@
     - https://docs.pytest.org/en/stable/writing_plugins.html
 """
 
-# import pytest
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Run pygame without opening windows or audio devices, so the tests work headless.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+GAMES = Path(__file__).resolve().parents[3] / 'games'
+
+
+def forget_games():
+    """Removes the games' modules from sys.modules, as games use the same names, like config."""
+    for name, module in list(sys.modules.items()):
+        if str(getattr(module, '__file__', None) or '').startswith(str(GAMES)):
+            del sys.modules[name]
+
+
+@pytest.fixture
+def load_game(monkeypatch):
+    """Returns a function that imports a module of a game the way the game runs,
+    from the game's directory and with the directory first on sys.path."""
+    def load(directory, name):
+        path = GAMES / directory
+        monkeypatch.chdir(path)
+        monkeypatch.syspath_prepend(str(path))
+        forget_games()
+        return importlib.import_module(name)
+
+    yield load
+    forget_games()
@@ -0,0 +1,60 @@
+import unittest
+
+import pygame
+
+from jtlgames.animation import Clip
+
+
+class TestClip(unittest.TestCase):
+    """Tests for the animation Clip."""
+
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((64, 64))
+        self.parts = []
+        for color in [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)]:
+            part = pygame.Surface((8, 8))
+            part.fill(color)
+            self.parts.append(part)
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_elapsed_time(self):
+        clip = Clip(self.parts, frame_time=[100, 50, 50, 100])
+        self.assertEqual(clip.duration, 300)
+        clip.update(99)
+        self.assertEqual(clip.index, 0)
+        clip.update(1)
+        self.assertEqual(clip.index, 1)
+        clip.update(120)
+        self.assertEqual(clip.index, 3)
+        clip.update(100)  # Loops back round
+        self.assertEqual((clip.index, clip.time), (0, 20))
+
+        clip = Clip(self.parts, frame_time=10, loop=False)
+        clip.update(1000)
+        self.assertEqual(clip.index, 3)
+        self.assertTrue(clip.done)
+
+        with self.assertRaises(ValueError):
+            Clip(self.parts, frame_time=[10, 10])
+
+    def test_composite(self):
+        clip = Clip.composite(self.parts, [(0, 1, 2), (0, 1, 3), (0, 1, 2)], frame_time=100)
+        self.assertEqual(clip.image.get_size(), (24, 8))
+        self.assertEqual(clip.image.get_at((20, 4))[:3], (0, 0, 255))
+        clip.update(100)
+        self.assertEqual(clip.image.get_at((20, 4))[:3], (255, 255, 0))
+
+        # Frames are composed once and frames with the same parts share a surface
+        self.assertIs(clip.frames[0], clip.frames[2])
+        self.assertIs(clip.frames[1], clip.image)
+
+        screen = pygame.Surface((64, 64))
+        clip.draw(screen, (10, 10))
+        self.assertEqual(screen.get_at((10, 10))[:3], (255, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import pygame
+
+from jtlgames import assets
+from jtlgames.assets import ASSET_LOADED, AssetLoader
+from jtlgames.images import is_display_format
+
+
+class TestAssetLoader(unittest.TestCase):
+    """Tests for the threaded asset loader."""
+
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((64, 64))
+        pygame.event.clear()
+        self.dir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(5):
+            image = pygame.Surface((16 * (i + 1), 16), pygame.SRCALPHA)
+            image.fill((i * 40, 0, 0, 255))
+            self.paths.append(os.path.join(self.dir.name, f'{i}.png'))
+            pygame.image.save(image, self.paths[-1])
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_loads_in_background(self):
+        with AssetLoader(max_workers=2) as loader:
+            futures = [loader.image(f'image{i}', path) for i, path in enumerate(self.paths)]
+            missing = loader.image('missing', os.path.join(self.dir.name, 'missing.png'))
+            self.assertEqual((len(loader), loader.progress), (6, 0))
+
+            # Nothing is finished until update() runs on this thread
+            deadline = time.time() + 10
+            while not loader.ready() and time.time() < deadline:
+                loader.update()
+            self.assertEqual(loader.progress, 1.0)
+
+        self.assertEqual([f.result().get_width() for f in futures], [16, 32, 48, 64, 80])
+        self.assertTrue(is_display_format(loader['image0']))
+        with self.assertRaises(Exception):
+            missing.result()
+
+        events = pygame.event.get(ASSET_LOADED)
+        self.assertEqual(sorted(e.name for e in events), sorted(loader.futures))
+        self.assertEqual([e.done for e in events], list(range(1, 7)))
+        self.assertEqual([e.name for e in events if hasattr(e, 'error')], ['missing'])
+
+    def test_get_waits(self):
+        loader = AssetLoader(post_events=False)
+        loader.image('first', self.paths[0])
+        loader.image('last', self.paths[-1])
+        self.assertEqual(loader['last'].get_width(), 80)
+        self.assertTrue(loader.ready('last'))
+        with self.assertRaises(KeyError):
+            loader.image('last', self.paths[0])
+        loader.shutdown()
+        self.assertEqual(loader.get('first').get_width(), 16)
+        self.assertEqual(pygame.event.get(ASSET_LOADED), [])
+
+    def test_shutdown_cancels(self):
+        started, gate = threading.Event(), threading.Event()
+        decode = assets._decode_image
+
+        def slow_decode(path):
+            started.set()
+            gate.wait(10)
+            return decode(path)
+
+        assets._decode_image = slow_decode
+        try:
+            loader = AssetLoader(max_workers=1, post_events=False)
+            first = loader.image('first', self.paths[0])
+            rest = [loader.image(f'image{i}', path) for i, path in enumerate(self.paths[1:])]
+            started.wait(10)
+            loader.shutdown(wait=False)
+            gate.set()
+        finally:
+            assets._decode_image = decode
+
+        # The file being loaded is finished, and the ones not started are cancelled
+        self.assertTrue(all(f.cancelled() for f in rest))
+        self.assertEqual(loader['first'].get_width(), 16)
+        self.assertTrue(first.done())
+        self.assertEqual(loader.update(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+
+from jtlgames.asyncloop import FrameDriver, jitter_stats
+
+
+class FakeTimer(object):
+    """A timer that goes forward by step seconds each time it is read, so the driver never
+    sleeps and the frames run on the same ticks every time."""
+
+    def __init__(self, step=0.0005):
+        self.step = step
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+class TestFrameDriver(unittest.TestCase):
+    """Tests for the asyncio frame driver."""
+
+    def test_runs_frames_on_time(self):
+        log = []
+
+        async def frame(dt):
+            log.append(('frame', driver.frames))
+            if driver.frames == 9:
+                return False
+
+        async def background():
+            while driver.running or not driver.frames:
+                log.append(('task', driver.remaining() <= 1000 / 100))
+                await driver.next_frame()
+
+        async def main():
+            task = asyncio.create_task(background())
+            await driver.run()
+            await task
+
+        # Spinning for the whole period, the driver only yields with sleep(0), never sleeps
+        driver = FrameDriver(frame, frame_rate=100, spin_ms=10, timer=FakeTimer())
+        asyncio.run(main())
+
+        self.assertEqual(driver.frames, 10)
+        self.assertEqual([entry for entry in log if entry[0] == 'frame'], [('frame', i) for i in range(10)])
+        # The background task ran between every two frames, while waiting for the next one
+        self.assertEqual([kind for kind, _ in log[1:]], ['task', 'frame'] * 9)
+        self.assertTrue(all(ok for kind, ok in log if kind == 'task'))
+
+        stats = driver.stats()
+        self.assertEqual(len(driver.intervals), 9)
+        self.assertEqual((stats['mean_ms'], stats['jitter_max_ms']), (10, 0))
+
+    def test_jitter_stats(self):
+        stats = jitter_stats([0.016, 0.017, 0.0167, 0.030], 60)
+        self.assertEqual(stats['jitter_max_ms'], 13.333)
+        self.assertEqual(stats['jitter_p50_ms'], 0.667)
+        self.assertIsNone(jitter_stats([], 60)['mean_ms'])
+
+
+if __name__ == "__main__":
+    unittest.main()
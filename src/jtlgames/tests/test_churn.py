@@ -0,0 +1,48 @@
+import unittest
+
+import pygame
+
+from jtlgames.churn import ChurnMonitor
+
+
+class TestChurnMonitor(unittest.TestCase):
+    """Tests for the resource churn monitor."""
+
+    def test_counts_per_site(self):
+        pygame.init()
+        pygame.display.set_mode((64, 64))
+        scale, flip = pygame.transform.scale, pygame.display.flip
+
+        with self.assertLogs('jtlgames.churn', 'WARNING') as logs:
+            with ChurnMonitor(warmup=2) as monitor:
+                image = pygame.Surface((8, 8))
+                for _ in range(5):
+                    pygame.transform.scale(image, (16, 16))
+                    pygame.transform.scale(image, (4, 4))
+                    pygame.font.SysFont('monospace', 12)
+                    pygame.display.flip()
+
+                # The stand in class still works with isinstance()
+                self.assertIsInstance(pygame.display.get_surface(), pygame.Surface)
+                self.assertIsInstance(image, pygame.surface.Surface)
+
+        self.assertIs(pygame.transform.scale, scale)
+        self.assertIs(pygame.display.flip, flip)
+        self.assertEqual(monitor.frames, 5)
+
+        big, small, sysfont, surface = monitor.report()
+        self.assertEqual((big.kind, big.calls, big.frames, big.max_per_frame, big.steady),
+                         ('transform.scale', 5, 5, 1, 3))
+        self.assertIn('test_churn.py:', big.site)
+        self.assertNotEqual(big.site, small.site)
+        # SysFont makes a Font, which is not counted again
+        self.assertEqual((sysfont.kind, sysfont.calls), ('font.SysFont', 5))
+        self.assertEqual((surface.kind, surface.steady), ('Surface', 0))
+
+        # One warning for each of the three call sites
+        self.assertEqual(len(logs.output), 3)
+        self.assertIn('transform.scale', monitor.format_report())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+import pygame
+
+from jtlgames.coroutines import Scheduler, WaitEvent, WaitFrames, WaitMs
+
+
+class TestScheduler(unittest.TestCase):
+    """Tests for the generator behaviour scheduler."""
+
+    def setUp(self):
+        self.scheduler = Scheduler()
+        self.log = []
+
+    def test_waits(self):
+        def script():
+            self.log.append(('start', self.scheduler.frame))
+            yield
+            self.log.append(('next', self.scheduler.frame))
+            yield WaitFrames(3)
+            self.log.append(('frames', self.scheduler.frame))
+            yield WaitMs(100)
+            self.log.append(('ms', self.scheduler.time))
+            event = yield WaitEvent(pygame.KEYDOWN, pygame.QUIT, test=lambda e: e.type == pygame.QUIT or e.key == 1)
+            self.log.append(('event', event.type))
+            return 'finished'
+
+        task = self.scheduler.start(script())
+        self.assertEqual(len(self.scheduler), 1)
+        for _ in range(12):
+            self.scheduler.update(16)
+        self.assertEqual(self.log[:3], [('start', 1), ('next', 2), ('frames', 5)])
+        self.assertEqual(self.log[3], ('ms', 192))
+
+        # The test filters events, and the task is woken once even if several match
+        self.scheduler.update(16, [pygame.event.Event(pygame.KEYDOWN, key=2)])
+        self.assertEqual(len(self.log), 4)
+        self.scheduler.update(16, [pygame.event.Event(pygame.KEYDOWN, key=1), pygame.event.Event(pygame.QUIT)])
+        self.assertEqual(self.log[4], ('event', pygame.KEYDOWN))
+        self.assertTrue(task.done)
+        self.assertEqual(task.result, 'finished')
+        self.assertEqual(len(self.scheduler), 0)
+
+        self.scheduler.start(x for x in [42])
+        with self.assertRaises(TypeError):
+            self.scheduler.update(16)
+
+    def test_many_and_cancel(self):
+        counts = [0] * 1000
+
+        def walker(i):
+            try:
+                while True:
+                    counts[i] += 1
+                    yield WaitFrames(1 + i % 4)
+            finally:
+                self.log.append(i)
+
+        tasks = [self.scheduler.start(walker(i)) for i in range(1000)]
+        for _ in range(12):
+            self.scheduler.update(16)
+        self.assertEqual(counts[:4], [12, 6, 4, 3])
+
+        for task in tasks[::2]:
+            task.cancel()
+        self.assertEqual(len(self.scheduler), 500)
+        self.assertEqual(len(self.log), 500)
+        for _ in range(12):
+            self.scheduler.update(16)
+        self.assertEqual(counts[:4], [12, 12, 4, 6])
+
+    def test_error_does_not_stop_others(self):
+        def broken():
+            yield
+            raise ValueError('broken')
+
+        def steady(name):
+            while True:
+                self.log.append((name, self.scheduler.frame))
+                yield
+
+        self.scheduler.start(steady('before'))
+        task = self.scheduler.start(broken())
+        self.scheduler.start(steady('after'))
+        self.scheduler.update(16)
+        with self.assertRaises(ValueError):
+            self.scheduler.update(16)
+
+        # Both siblings were resumed on the frame the error was raised, and keep going
+        self.assertIn(('after', 2), self.log)
+        self.assertTrue(task.done)
+        self.assertIsInstance(task.error, ValueError)
+        self.assertEqual(len(self.scheduler), 2)
+        self.scheduler.update(16)
+        self.assertEqual(self.log[-2:], [('before', 3), ('after', 3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
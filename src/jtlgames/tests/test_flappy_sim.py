@@ -0,0 +1,108 @@
+import random
+
+import numpy as np
+import pygame
+import pytest
+
+
+@pytest.fixture
+def sim(load_game):
+    return load_game('flappy_bird', 'sim')
+
+
+class ListRandom(random.Random):
+    """Hands out pipe sizes from a list, in order, for randint()."""
+
+    def __init__(self, sizes):
+        super().__init__()
+        self.sizes = list(sizes)
+
+    def randint(self, a, b):
+        return self.sizes.pop(0)
+
+
+def test_seeded_batches_are_the_same(sim):
+    flaps = np.random.default_rng(0).random((300, 16)) < 0.15
+
+    def run(seed):
+        batch = sim.FlappyBatch(16, seed)
+        trace = []
+        for flap in flaps:
+            obs, rewards, done, info = batch.step(flap)
+            trace.append((obs.copy(), done.copy(), info['score']))
+        return trace
+
+    first, second = run(5), run(5)
+    for (obs_a, done_a, score_a), (obs_b, done_b, score_b) in zip(first, second):
+        assert np.array_equal(obs_a, obs_b)
+        assert np.array_equal(done_a, done_b)
+        assert np.array_equal(score_a, score_b)
+    assert any(done.any() for _, done, _ in first)
+
+    other = run(6)
+    assert not all(np.array_equal(a[0], b[0]) for a, b in zip(first, other))
+
+
+@pytest.mark.parametrize('flap_every', [5, 7, 9, 'policy'])
+def test_crashes_where_the_game_does(load_game, monkeypatch, flap_every):
+    flappy = load_game('flappy_bird', 'flappy')
+    sim = load_game('flappy_bird', 'sim')
+    sizes = [int(v) for v in np.random.default_rng(3).integers(100, 301, 40)]
+
+    # The game and the simulation get the same pipes
+    monkeypatch.setattr(flappy, 'random', ListRandom(sizes))
+    flappy.assets = flappy.Assets(screen=pygame.Surface((flappy.SCREEN_WIDHT, flappy.SCREEN_HEIGHT)))
+    batch = sim.FlappyBatch(1)
+    batch.pipe_size[0] = sizes[:2]
+    rest = iter(sizes[2:])
+    batch._random_sizes = lambda shape: np.array([next(rest) for _ in range(int(np.prod(shape)))])
+
+    bird, bird_group, ground_group, pipe_group = flappy.new_game()
+    bird.bump()  # Leaves the start screen
+    obs = batch.observe()
+    for frame in range(1, 500):
+        if flap_every == 'policy':
+            flap = bool(sim.heuristic_policy(obs)[0])
+        else:
+            flap = frame % flap_every == 0
+        if flap:
+            bird.bump()
+        crashed = flappy.step(flappy.assets.screen, bird_group, ground_group, pipe_group)
+        obs, _, done, info = batch.step([flap])
+
+        assert bool(done[0]) == crashed, f"frame {frame}"
+        if crashed:
+            break
+        assert obs[0, sim.OBS_Y] == bird.rect.y
+    # The bot gets through every pipe, the fixed rhythms hit something
+    assert crashed != (flap_every == 'policy')
+    if not crashed:
+        assert info['score'][0] > 5
+
+
+def test_finished_games_restart(sim):
+    batch = sim.FlappyBatch(3, seed=1)
+    start = batch.observe()[0, sim.OBS_Y]
+    # The first bird never flaps and falls to the ground, the others flap to stay up
+    flap = np.array([False, True, True])
+    for frame in range(1, 100):
+        obs, rewards, done, info = batch.step(flap & (batch.speed > 0))
+        if done[0]:
+            break
+    assert done[0] and not done[1:].any()
+    assert rewards[0] == 0 and (rewards[1:] == 1).all()
+    assert info['steps'][0] == frame - 1
+    assert info['steps'][1] == frame
+
+    # The crashed game has started again, the others carry on
+    assert batch.steps[0] == 0 and (batch.steps[1:] == frame).all()
+    assert obs[0, sim.OBS_Y] == start
+    assert batch.speed[0] == -batch.s.SPEED
+
+    env = sim.FlappyEnv(seed=1)
+    env.reset()
+    while not env.step(False)[2]:
+        pass
+    with pytest.raises(RuntimeError):
+        env.step(False)
+    assert env.reset()[sim.OBS_Y] == start
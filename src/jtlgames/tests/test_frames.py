@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pygame
+
+from jtlgames.spritesheet import SpriteSheet
+
+
+class TestFrames(unittest.TestCase):
+    """Tests for trimmed, shared SpriteSheet frames."""
+
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((64, 64))
+
+        # Four 16x16 cells: a 4x6 sprite, the same sprite again, an empty cell and a full cell
+        sheet = pygame.Surface((64, 16), pygame.SRCALPHA)
+        sheet.fill((0, 0, 0, 0))
+        sheet.fill((255, 0, 0, 255), pygame.Rect(5, 2, 4, 6))
+        sheet.fill((255, 0, 0, 255), pygame.Rect(16 + 5, 2, 4, 6))
+        sheet.fill((0, 255, 0, 255), pygame.Rect(48, 0, 16, 16))
+        self.dir = tempfile.TemporaryDirectory()
+        filename = Path(self.dir.name) / 'sheet.png'
+        pygame.image.save(sheet, str(filename))
+        self.ss = SpriteSheet(filename, (16, 16))
+
+    def tearDown(self):
+        self.dir.cleanup()
+        pygame.quit()
+
+    def test_trim_and_share(self):
+        frames = self.ss.load_frames()
+        self.assertEqual(frames[0].image.get_size(), (4, 6))
+        self.assertEqual(frames[0].offset, (5, 2))
+        self.assertIs(frames[0].image, frames[1].image)
+        self.assertEqual(frames[2].image.get_size(), (0, 0))
+        self.assertIs(self.ss.frame_at(0), frames[0])
+
+        savings = self.ss.frame_savings()
+        self.assertEqual(savings['unique'], 3)
+        self.assertEqual(savings['empty'], 1)
+        self.assertEqual(savings['stored_pixels'], 24 + 256)
+        self.assertAlmostEqual(savings['saved'], 1 - 280 / 1024)
+
+    def test_draw(self):
+        screen = pygame.Surface((16, 16))
+        self.ss.frame_at(0).draw(screen, (0, 0))
+        self.assertEqual(screen.get_at((5, 2))[:3], (255, 0, 0))
+        self.assertEqual(screen.get_at((4, 2))[:3], (0, 0, 0))
+
+    def test_colorkey(self):
+        # Colorkeys that are not hashable still cache
+        frame = self.ss.frame_at(3, pygame.Color(0, 255, 0))
+        self.assertEqual(frame.image.get_size(), (0, 0))
+        self.assertIs(self.ss.frame_at(3, [0, 255, 0]), frame)
+        self.assertIs(self.ss.frame_at(3, (0, 255, 0)), frame)
+        self.assertEqual(self.ss.frame_at(0, [0, 0, 0]).image.get_size(), (4, 6))
+
+    def test_compose_horiz(self):
+        composed = self.ss.compose_horiz([0, 3], pygame.Color(0, 0, 0))
+        self.assertEqual(composed.get_size(), (32, 16))
+        self.assertEqual(composed.get_at((21, 2))[:3], (0, 255, 0))
+
+        # Made once, but each call gets a copy it can draw on
+        composed.fill((0, 0, 255))
+        again = self.ss.compose_horiz([0, 3], [0, 0, 0])
+        self.assertEqual(len(self.ss._composed), 1)
+        self.assertIsNot(again, composed)
+        self.assertEqual(again.get_at((5, 2))[:3], (255, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
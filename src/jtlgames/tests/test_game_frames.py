@@ -0,0 +1,189 @@
+"""The frame functions of the games play exactly as the main loops they came from.
+
+Each test runs a game twice from the same seed and the same scripted input:
+once with the body of the game's main loop as it was before it became a
+function, and once with the function. The game state must match every frame.
+"""
+
+import collections
+import random
+import sys
+
+import pygame
+import pytest
+
+
+class Script(object):
+    """Scripted input and time, one frame at a time, for games that read pygame's."""
+
+    def __init__(self, monkeypatch, events, held, ms_per_frame):
+        self.events = events
+        self.held = held
+        self.ms_per_frame = ms_per_frame
+        self.frame = 0
+        self.pending = []
+        monkeypatch.setattr(pygame.event, 'get', self.get)
+        monkeypatch.setattr(pygame.key, 'get_pressed', self.pressed)
+        monkeypatch.setattr(pygame.time, 'get_ticks', self.ticks)
+
+    def next_frame(self, frame):
+        self.frame = frame
+        self.pending = list(self.events.get(frame, []))
+
+    def get(self, *args, **kwargs):
+        events, self.pending = self.pending, []
+        return events
+
+    def pressed(self):
+        keys = collections.defaultdict(bool)
+        for k, frames in self.held.items():
+            keys[k] = self.frame in frames
+        return keys
+
+    def ticks(self):
+        return self.frame * self.ms_per_frame
+
+
+def rects(group):
+    return [tuple(s.rect) for s in group]
+
+
+def old_flappy_frame(flappy, screen, bird_group, ground_group, pipe_group):
+    """The playing loop of flappy.main() before step(), less the events and the display."""
+    screen.blit(flappy.assets.image('background-day.png', (flappy.SCREEN_WIDHT, flappy.SCREEN_HEIGHT),
+                                    alpha=False), (0, 0))
+
+    if flappy.is_off_screen(ground_group.sprites()[0]):
+        ground_group.remove(ground_group.sprites()[0])
+
+        new_ground = flappy.Ground(flappy.GROUND_WIDHT - 20)
+        ground_group.add(new_ground)
+
+    if flappy.is_off_screen(pipe_group.sprites()[0]):
+        pipe_group.remove(pipe_group.sprites()[0])
+        pipe_group.remove(pipe_group.sprites()[0])
+
+        pipes = flappy.get_random_pipes(flappy.SCREEN_WIDHT * 2)
+
+        pipe_group.add(pipes[0])
+        pipe_group.add(pipes[1])
+
+    bird_group.update()
+    ground_group.update()
+    pipe_group.update()
+
+    bird_group.draw(screen)
+    pipe_group.draw(screen)
+    ground_group.draw(screen)
+
+    return bool(pygame.sprite.groupcollide(bird_group, ground_group, False, False, pygame.sprite.collide_mask) or
+                pygame.sprite.groupcollide(bird_group, pipe_group, False, False, pygame.sprite.collide_mask))
+
+
+@pytest.mark.parametrize('flap_every', [6, 8])
+def test_flappy_step_plays_like_the_old_loop(load_game, flap_every):
+    flappy = load_game('flappy_bird', 'flappy')
+    flappy.assets = flappy.Assets(screen=pygame.Surface((flappy.SCREEN_WIDHT, flappy.SCREEN_HEIGHT)))
+
+    def play(frame_function):
+        random.seed(7)
+        bird, bird_group, ground_group, pipe_group = flappy.new_game()
+        trace = []
+        for frame in range(400):
+            if frame % flap_every == 0:
+                bird.bump()
+            crashed = frame_function(flappy.assets.screen, bird_group, ground_group, pipe_group)
+            trace.append((tuple(bird.rect), bird.speed, bird.current_image,
+                          rects(pipe_group), rects(ground_group), crashed))
+            if crashed:
+                break
+        return trace
+
+    old = play(lambda *groups: old_flappy_frame(flappy, *groups))
+    assert old[-1][-1], "The bird should crash, so the test covers a collision"
+    assert play(flappy.step) == old
+
+
+def old_space_invaders_frame(main, game):
+    """The body of SpaceInvaders.main() before step(), less the text that has no effect on play."""
+    time, event = main.time, main.event
+    if game.mainScreen:
+        game.create_main_menu()
+        for e in event.get():
+            if game.should_exit(e):
+                sys.exit()
+            if e.type == pygame.KEYUP:
+                # Only create blockers on a new game, not a new round
+                game.allBlockers = pygame.sprite.Group(
+                    game.make_blockers(0),
+                    game.make_blockers(1),
+                    game.make_blockers(2),
+                    game.make_blockers(3),
+                )
+                game.livesGroup.add(game.life1, game.life2, game.life3)
+                game.reset(0)
+                game.startGame = True
+                game.mainScreen = False
+
+    elif game.startGame:
+        if not game.enemies and not game.explosionsGroup:
+            currentTime = time.get_ticks()
+            if currentTime - game.gameTimer < 3000:
+                game.livesGroup.update()
+                game.check_input()
+            if currentTime - game.gameTimer > 3000:
+                # Move enemies closer to bottom
+                game.enemyPosition += main.ENEMY_MOVE_DOWN
+                game.reset(game.score)
+                game.gameTimer += 3000
+        else:
+            currentTime = time.get_ticks()
+            game.play_main_music(currentTime)
+            game.screen.blit(game.background, (0, 0))
+            game.allBlockers.update(game.screen)
+            game.check_input()
+            game.enemies.update(currentTime)
+            game.allSprites.update(game.keys, currentTime)
+            game.explosionsGroup.update(currentTime)
+            game.check_collisions()
+            game.create_new_ship(game.makeNewShip, currentTime)
+            game.make_enemies_shoot()
+
+    elif game.gameOver:
+        currentTime = time.get_ticks()
+        # Reset enemy starting position
+        game.enemyPosition = main.ENEMY_DEFAULT_POSITION
+        game.create_game_over(currentTime)
+
+
+def test_space_invaders_step_plays_like_the_old_loop(load_game, monkeypatch):
+    main = load_game('Space_Invaders_Classic', 'main')
+    main.assets = main.Assets(screen=pygame.Surface((800, 600)))
+
+    # Start, then move right and left, firing every 20 frames
+    fire = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)
+    events = {2: [pygame.event.Event(pygame.KEYUP, key=pygame.K_a)]}
+    events.update((frame, [fire]) for frame in range(30, 1200, 20))
+    held = {pygame.K_RIGHT: range(40, 160), pygame.K_LEFT: range(300, 500)}
+
+    def play(frame_function):
+        random.seed(11)
+        script = Script(monkeypatch, events, held, ms_per_frame=1000 // 60)
+        main.game = game = main.SpaceInvaders()
+        trace = []
+        for frame in range(1200):
+            script.next_frame(frame)
+            frame_function(game)
+            if game.mainScreen:
+                trace.append('menu')
+                continue
+            trace.append((game.startGame, game.gameOver, game.score, len(game.livesGroup),
+                          tuple(game.player.rect), game.player.alive(), sorted(rects(game.enemies)),
+                          rects(game.bullets), rects(game.enemyBullets), rects(game.mysteryGroup),
+                          len(game.explosionsGroup), len(game.allBlockers)))
+        return trace
+
+    old = play(lambda game: old_space_invaders_frame(main, game))
+    scores = [state[2] for state in old if state != 'menu']
+    assert scores[-1] > 0, "Enemies should be shot, so the test covers collisions"
+    assert play(main.SpaceInvaders.step) == old
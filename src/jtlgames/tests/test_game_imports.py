@@ -0,0 +1,31 @@
+import pygame
+import pytest
+
+
+@pytest.mark.parametrize('directory, name', [
+    ('Space_Invaders_Classic', 'main'),
+    ('flappy_bird', 'flappy'),
+    ('flappy_bird', 'sim'),
+    ('Mars-lander', 'sim'),
+    ('Mars-lander', 'game'),
+])
+def test_import_opens_and_loads_nothing(load_game, monkeypatch, directory, name):
+    calls = []
+
+    def record(what):
+        def called(*args, **kwargs):
+            calls.append((what, args))
+            raise AssertionError(f"{what} called on import")
+        return called
+
+    pygame.quit()
+    for module, attr in [(pygame.display, 'set_mode'), (pygame.image, 'load'),
+                         (pygame.font, 'Font'), (pygame.font, 'SysFont'),
+                         (pygame.mixer, 'Sound'), (pygame.mixer.music, 'load')]:
+        monkeypatch.setattr(module, attr, record(f"{module.__name__}.{attr}"))
+
+    game = load_game(directory, name)
+    assert calls == []
+    assert pygame.display.get_surface() is None
+    if hasattr(game, 'Assets'):
+        assert game.assets._screen is None and game.assets._images == {}
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+
+import pygame
+
+import jtlgames
+from jtlgames.images import COLORKEY, BlitAudit, is_display_format, to_display_format
+
+
+def rgba(alpha, color=(10, 20, 30)):
+    """A 4x4 RGBA surface, its top row with the given alpha."""
+    image = pygame.Surface((4, 4), pygame.SRCALPHA, 32)
+    image.fill(color + (255,))
+    image.fill(color + (alpha,), (0, 0, 4, 1))
+    return image
+
+
+class TestImages(unittest.TestCase):
+    """Tests for loading images in the display format, and the blit audit."""
+
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.display.set_mode((64, 64))
+
+    def test_to_display_format(self):
+        opaque = to_display_format(rgba(255))
+        self.assertTrue(is_display_format(opaque))
+        self.assertFalse(opaque.get_flags() & pygame.SRCALPHA)
+        self.assertIsNone(opaque.get_colorkey())
+
+        # Fully transparent pixels become a colorkey, and draw the same
+        keyed = to_display_format(rgba(0))
+        self.assertEqual(keyed.get_colorkey(), COLORKEY + (255,))
+        self.screen.fill((0, 0, 0))
+        self.screen.blit(keyed, (0, 0))
+        self.assertEqual(self.screen.get_at((0, 0)), (0, 0, 0, 255))
+        self.assertEqual(self.screen.get_at((0, 1)), (10, 20, 30, 255))
+
+        # Unless the key color is in the image, or there are partly transparent pixels
+        self.assertTrue(to_display_format(rgba(0, COLORKEY)).get_flags() & pygame.SRCALPHA)
+        blended = to_display_format(rgba(128))
+        self.assertTrue(blended.get_flags() & pygame.SRCALPHA)
+        self.assertTrue(is_display_format(blended))
+
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'image.png')
+            pygame.image.save(rgba(255), path)
+            self.assertTrue(is_display_format(jtlgames.load_image(path)))
+
+    def test_blit_audit(self):
+        image = pygame.Surface((4, 4), 0, 24)
+        image.fill((200, 0, 0))
+        converted = image.convert()
+        with BlitAudit() as audit:
+            screen = pygame.display.set_mode((64, 64))
+            self.assertIs(pygame.display.get_surface(), screen)
+            for _ in range(4):
+                screen.fill((0, 0, 0))
+                screen.blit(image, (0, 0))
+                screen.blits([(image, (8, 8)), (converted, (16, 16))])
+                pygame.display.flip()
+        self.assertIsNot(pygame.display.get_surface(), screen)
+
+        # What the game drew is on the real screen
+        self.assertEqual(pygame.display.get_surface().get_at((8, 9)), screen.get_at((8, 9)))
+        self.assertEqual(audit.frames, 4)
+        [stats] = audit.report()
+        self.assertEqual((stats.name, stats.blits), ('4x4 24 bit', 8))
+        self.assertIn('2.0', audit.format_report())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import pygame
+
+from jtlgames.layers import StaticLayers
+
+
+class TestStaticLayers(unittest.TestCase):
+    """Tests for the static layer compositor."""
+
+    def test_draws_changed_layers(self):
+        drawn = []
+        terrain = [(2, 2)]
+
+        def background(surface):
+            drawn.append('background')
+            surface.fill((0, 0, 200))
+
+        def rocks(surface):
+            drawn.append('rocks')
+            for pos in terrain:
+                surface.fill((200, 0, 0), (pos, (2, 2)))
+
+        layers = StaticLayers((8, 8))
+        layers.add('background', background)
+        layers.add('rocks', rocks)
+        screen = pygame.Surface((8, 8))
+
+        for _ in range(3):
+            layers.draw(screen)
+        self.assertEqual(drawn, ['background', 'rocks'])
+        self.assertEqual(screen.get_at((2, 2)), (200, 0, 0, 255))
+        self.assertEqual(screen.get_at((0, 0)), (0, 0, 200, 255))
+
+        # Only the changed layer is drawn again, on top of the kept layers below it
+        terrain[:] = [(5, 5)]
+        layers.invalidate('rocks')
+        layers.draw(screen)
+        self.assertEqual(drawn, ['background', 'rocks', 'rocks'])
+        self.assertEqual(screen.get_at((2, 2)), (0, 0, 200, 255))
+        self.assertEqual(screen.get_at((5, 5)), (200, 0, 0, 255))
+
+        layers.invalidate()
+        layers.draw(screen)
+        self.assertEqual(layers.redraws, 5)
+        with self.assertRaises(KeyError):
+            layers.invalidate('sky')
+
+    def test_no_layers(self):
+        layers = StaticLayers((8, 8), fill=(0, 100, 0))
+        screen = pygame.Surface((8, 8))
+        screen.fill((255, 255, 255))
+        layers.draw(screen)
+        self.assertEqual(screen.get_at((3, 3)), (0, 100, 0, 255))
+        self.assertEqual(layers.redraws, 0)
+
+        layers.add('dot', lambda surface: surface.fill((200, 0, 0), ((1, 1), (1, 1))))
+        layers.draw(screen)
+        self.assertEqual(screen.get_at((1, 1)), (200, 0, 0, 255))
+        self.assertEqual(screen.get_at((3, 3)), (0, 100, 0, 255))
+
+
+if __name__ == "__main__":
+    unittest.main()
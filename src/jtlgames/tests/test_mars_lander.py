@@ -0,0 +1,195 @@
+import random
+
+import pygame
+import pytest
+
+from jtlgames.churn import ChurnMonitor
+
+
+@pytest.fixture
+def placement(load_game):
+    return load_game('Mars-lander', 'placement')
+
+
+class CountingRandom(random.Random):
+    """A random.Random that counts the numbers drawn from it."""
+
+    draws = 0
+
+    def randrange(self, *args):
+        self.draws += 1
+        return super().randrange(*args)
+
+
+def rects(placed, sizes):
+    return [pygame.Rect(x - sizes[i][0] // 2, y - sizes[i][1] // 2, *sizes[i]) for i, (x, y) in placed]
+
+
+def test_placements_do_not_overlap(placement):
+    sizes = [(40, 20), (60, 30)]
+    for seed in range(50):
+        placed = placement.Placer(random.Random(seed)).place_many(12, sizes, (30, 15, 470, 385))
+        assert len(placed) == 12
+        placed_rects = rects(placed, sizes)
+        for i, rect in enumerate(placed_rects):
+            assert rect.collidelist(placed_rects[i + 1:]) == -1
+
+
+def test_too_many_sprites_raises_with_those_placed(placement):
+    sizes = [(50, 50)]
+    with pytest.raises(placement.PlacementError) as info:
+        placement.Placer(random.Random(1)).place_many(20, sizes, (25, 25, 126, 126))
+
+    placed = info.value.placed
+    assert 0 < len(placed) < 20
+    placed_rects = rects(placed, sizes)
+    for i, rect in enumerate(placed_rects):
+        assert rect.collidelist(placed_rects[i + 1:]) == -1
+
+
+def test_placement_draws_are_bounded(placement):
+    # Crowded enough that the random draws often miss, and the free positions are listed
+    sizes = [(30, 30), (20, 40)]
+    count, tries = 10, 5
+    # For each sprite: one draw to pick a size, then for each size tried, two draws per try and one from the free list
+    bound = count * (1 + len(sizes) * (2 * tries + 1))
+    for seed in range(20):
+        rng = CountingRandom(seed)
+        try:
+            placement.Placer(rng, tries=tries).place_many(count, sizes, (15, 20, 185, 80))
+        except placement.PlacementError:
+            pass
+        assert rng.draws <= bound
+
+
+def key(k):
+    return pygame.event.Event(pygame.KEYDOWN, key=k)
+
+
+def test_new_game_from_pause_menu_has_a_new_lander(load_game):
+    mars = load_game('Mars-lander', 'game')
+    game = mars.Game()
+    try:
+        game.new_game()
+        game.step([key(pygame.K_RETURN)])
+        for _ in range(40):
+            game.step([], {pygame.K_SPACE: True})
+        assert game.state == mars.PLAYING
+        old = game.lander
+        fresh = mars.Lander()
+        assert old.current_fuel() < fresh.current_fuel()
+        game.score = 100
+
+        # Pause, end the game, and start a new one
+        game.step([key(pygame.K_p)])
+        game.step([key(pygame.K_ESCAPE)])
+        assert game.state == mars.GAME_OVER
+        game.step([key(pygame.K_n)])
+
+        # Checked before Enter, whose frame is played, and a meteor can hit the lander
+        assert game.lander is not old
+        assert game.player_sprite.sprite is game.lander
+        assert game.lander.current_fuel() == fresh.current_fuel()
+        assert game.lander.current_damage() == 0
+        assert game.score == 0
+        assert game.lander_lives == mars.LANDER_LIVES_START
+        game.step([key(pygame.K_RETURN)])
+        assert game.state == mars.PLAYING
+    finally:
+        pygame.quit()
+
+
+def test_pause_and_continue(load_game):
+    mars = load_game('Mars-lander', 'game')
+    game = mars.Game()
+    try:
+        game.new_game()
+        assert game.state == mars.PAUSED
+        game.step([key(pygame.K_RETURN)])
+        for _ in range(10):
+            game.step([], {})
+        lander, ticks = game.lander, game.ticks
+
+        # Nothing moves while the pause menu is open, and other keys do nothing
+        game.step([key(pygame.K_p)])
+        assert game.state == mars.PAUSED
+        position = game.lander.rect.topleft
+        for _ in range(10):
+            game.step([key(pygame.K_SPACE)], {pygame.K_SPACE: True})
+        assert game.state == mars.PAUSED
+        assert (game.ticks, game.lander.rect.topleft) == (ticks, position)
+
+        # Enter carries on with the same mission, from the frame that closes the menu
+        game.step([key(pygame.K_RETURN)])
+        assert game.state == mars.PLAYING and game.menu is None
+        assert game.lander is lander
+        assert game.ticks == ticks + 1
+    finally:
+        pygame.quit()
+
+
+def test_last_crash_ends_the_game(load_game):
+    mars = load_game('Mars-lander', 'game')
+    game = mars.Game()
+    try:
+        game.new_game()
+        game.step([key(pygame.K_RETURN)])
+        game.score = 300
+        game.lander_lives = 1
+
+        # The crash pauses the game, and continuing from there ends it
+        game.lander._crashed = True
+        game.step([], {})
+        assert game.state == mars.PAUSED
+        assert game.lander_lives == 0
+        game.step([key(pygame.K_RETURN)])
+        assert game.state == mars.GAME_OVER and game.menu is game.game_over_menu
+
+        # N starts a new game, paused until Enter
+        game.step([key(pygame.K_n)])
+        assert game.state == mars.PAUSED
+        assert game.score == 0
+        assert game.lander_lives == mars.LANDER_LIVES_START
+        game.step([key(pygame.K_RETURN)])
+        assert game.state == mars.PLAYING
+        assert not game.lander.is_crashed()
+
+        # ESC in the game over menu stops the loop
+        game.end_game()
+        assert not game.step([key(pygame.K_ESCAPE)])
+    finally:
+        pygame.quit()
+
+
+def test_menus_are_drawn_once_and_reused(load_game):
+    mars = load_game('Mars-lander', 'game')
+    game = mars.Game()
+    try:
+        menus = game.pause_menu.surface, game.game_over_menu.surface
+
+        def round_of_menus():
+            game.new_game()
+            game.step([key(pygame.K_RETURN)])
+            game.step([], {})
+            game.step([key(pygame.K_p)])
+            for _ in range(5):
+                game.step([key(pygame.K_SPACE)], {})
+            game.step([key(pygame.K_ESCAPE)])
+            assert game.state == mars.GAME_OVER
+            for _ in range(5):
+                game.step([key(pygame.K_SPACE)], {})
+
+        # The first round makes the fonts for the texts that change, like the score
+        round_of_menus()
+        with ChurnMonitor(warmup=0, warn=False) as monitor:
+            for _ in range(3):
+                round_of_menus()
+
+        made = [s for s in monitor.report() if s.site.startswith('menus.py')
+                and (s.kind.startswith('font.') or s.kind == 'Surface')]
+        assert made == []
+        assert monitor.frames > 0
+        assert (game.pause_menu.surface, game.game_over_menu.surface) == menus
+        assert mars.get_font.cache_info().misses == mars.get_font.cache_info().currsize
+    finally:
+        pygame.quit()
@@ -0,0 +1,144 @@
+import sys
+
+import numpy as np
+import pytest
+
+# A mission with nothing in the way, and no random failures
+CLEAR_SKY = dict(MIN_OBSTACLES=0, MAX_OBSTACLES=0, MIN_METEORS=0, MAX_METEORS=0, FAILURE_CHANCE=0)
+
+
+@pytest.fixture
+def sim(load_game):
+    return load_game('Mars-lander', 'sim')
+
+
+def over_pad(batch, pad=0, height=200):
+    """Puts lander 0 still, centered over a pad and height pixels above it."""
+    left, top, w, h = batch.pads[0, pad]
+    lw, lh = batch.rect[0, 2:]
+    batch.rect[0, :2] = left + (w - lw) // 2, top - height - lh
+    batch.velocity[0] = 0
+    batch._acc[0] = 0
+
+
+def test_seeded_batches_are_the_same(sim):
+    def run(seed):
+        batch = sim.LanderBatch(8, seed)
+        obs = batch.observe()
+        trace = []
+        for _ in range(1500):
+            obs, rewards, done, info = batch.step(sim.autopilot(obs))
+            trace.append((obs, info['outcome']))
+        return trace
+
+    first, second = run(4), run(4)
+    for (obs_a, outcome_a), (obs_b, outcome_b) in zip(first, second):
+        assert np.array_equal(obs_a, obs_b)
+        assert np.array_equal(outcome_a, outcome_b)
+    assert any((outcome != sim.FLYING).any() for _, outcome in first)
+
+
+def test_flies_like_the_game(sim, load_game):
+    lander_module = load_game('Mars-lander', 'lander')
+    batch = sim.LanderBatch(1, seed=2, **CLEAR_SKY)
+    lander = lander_module.Lander()
+    lander._veloc_x, lander._veloc_y = batch.velocity[0]
+    # Low enough that it does not fly off the top, where the game picks a new speed with random
+    batch.rect[0, 1] = lander.rect.top = 300
+
+    # Fall, turn, thrust for a while and fall again, as Game.tick() does it
+    for tick in range(3000):
+        action = sim.THRUST if tick % 10 == 0 and 100 <= tick < 140 else 0
+        action |= sim.LEFT if tick < 20 else 0
+        lander.update()
+        if action & sim.LEFT:
+            lander.rotate_left()
+        if action & sim.THRUST:
+            lander.thrust()
+        pads = [tuple(pad) for pad in batch.pads[0]]  # A new mission replaces them
+        obs, _, done, info = batch.step([action])
+        if done[0]:
+            break
+        assert tuple(batch.rect[0, :2]) == lander.rect.topleft, f"tick {tick}"
+        assert batch.fuel[0] == lander.current_fuel()
+        assert batch.rotation[0] == lander.get_rotation()
+    assert lander.current_fuel() < 500
+
+    # The mission ends on the tick the game's lander crashes or touches a pad
+    assert done[0]
+    if info['outcome'][0] == sim.CRASHED:
+        assert lander.is_crashed()
+    else:
+        assert lander.rect.collidelist(pads) != -1
+
+
+def test_scripted_landing(sim):
+    env = sim.LanderSim(seed=3, **CLEAR_SKY)
+    env.reset()
+    over_pad(env.batch)
+    s = env.batch.s
+
+    for _ in range(2000):
+        # Keep the descent slower than the safe landing speed
+        action = sim.THRUST if env.batch.velocity[0, 1] > 0.5 else 0
+        obs, reward, done, info = env.step(action)
+        if done:
+            break
+    assert info['outcome'] == sim.LANDED
+    assert reward == 150  # 150 less the damage, which is 0
+    assert env.batch.score[0] == 150
+    assert env.batch.lives[0] == s.LANDER_LIVES_START
+    # A new mission has started, with a new lander
+    assert env.batch.fuel[0] == s.START_FUEL
+
+
+def test_crash_and_out_of_fuel(sim):
+    env = sim.LanderSim(seed=3, **CLEAR_SKY)
+    env.reset()
+    over_pad(env.batch, height=400)
+    batch = env.batch
+    batch.fuel[0] = batch.s.THRUST_COST - 1
+
+    # With too little fuel to thrust, the lander falls onto the pad too fast
+    for _ in range(2000):
+        vy = batch.velocity[0, 1]
+        obs, reward, done, info = env.step(sim.THRUST)
+        if done:
+            break
+        assert batch.fuel[0] == batch.s.THRUST_COST - 1
+        assert batch.velocity[0, 1] > vy
+    assert info['outcome'] == sim.BAD_LANDING
+    assert reward == 0
+    assert batch.lives[0] == batch.s.LANDER_LIVES_START - 1
+
+    # Off the pads, the lander falls to the bottom of the screen and crashes
+    pads = batch.pads[0]
+    gaps = [x for x in range(0, batch.s.WIDTH - 100, 10)
+            if all(x + 100 < p[0] or x > p[0] + p[2] for p in pads)]
+    batch.rect[0, 0] = gaps[0]
+    batch.velocity[0] = 0
+    for _ in range(2000):
+        obs, reward, done, info = env.step(0)
+        if done:
+            break
+    assert info['outcome'] == sim.CRASHED
+    assert batch.lives[0] == batch.s.LANDER_LIVES_START - 2
+    assert not info['game_over']
+
+    # Losing the last life ends the game
+    batch.rect[0, 0] = gaps[0]
+    while not env.step(0)[2]:
+        pass
+    assert env.game_over
+    with pytest.raises(RuntimeError):
+        env.step(0)
+
+
+def test_runs_without_jtlgames(load_game, monkeypatch):
+    # The game's sprites load their images with jtlgames, the simulation does not
+    monkeypatch.setitem(sys.modules, 'jtlgames', None)
+    monkeypatch.setitem(sys.modules, 'jtlgames.images', None)
+    sim = load_game('Mars-lander', 'sim')
+    batch = sim.LanderBatch(2, seed=1)
+    batch.step([0, sim.THRUST])
+    assert len(sim.sprite_sizes().obstacles) == len(batch.s.OBSTACLES_LIST)
@@ -0,0 +1,61 @@
+import unittest
+from collections import deque
+
+import numpy as np
+import pygame
+
+from jtlgames.maze import OPEN, PLAYER, WALL, MazeView, add_entrances, generate
+
+
+def reachable(grid, start):
+    """Returns a bool array of the cells that can be reached from start"""
+    seen = np.zeros(grid.shape, dtype=bool)
+    seen[start] = True
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nx < grid.shape[0] and 0 <= ny < grid.shape[1] and grid[nx, ny] != WALL and not seen[nx, ny]:
+                seen[nx, ny] = True
+                queue.append((nx, ny))
+    return seen
+
+
+class TestMaze(unittest.TestCase):
+    """Tests for the maze generator and view."""
+
+    def test_perfect_maze(self):
+        for cols, rows, seed in [(1, 1, 0), (1, 6, 1), (7, 1, 2), (30, 17, 3), (64, 64, 4)]:
+            grid = generate(cols, rows, seed)
+            self.assertEqual(grid.shape, (2 * cols + 1, 2 * rows + 1))
+            # A tree joining all the rooms has one opening fewer than there are rooms
+            openings = (grid[1:-1, 1:-1] == OPEN).sum() - cols * rows
+            self.assertEqual(openings, cols * rows - 1)
+            self.assertTrue(reachable(grid, (1, 1))[1::2, 1::2].all())
+            self.assertTrue((grid[0, :] == WALL).all() and (grid[:, -1] == WALL).all())
+
+        np.testing.assert_array_equal(generate(20, 20, seed=5), generate(20, 20, seed=5))
+
+    def test_entrances(self):
+        grid = generate(10, 8, seed=1)
+        start, end = add_entrances(grid)
+        self.assertEqual((start, end), ((1, 0), (19, 16)))
+        self.assertTrue(reachable(grid, start)[end])
+
+    def test_view(self):
+        pygame.init()
+        screen = pygame.display.set_mode((64, 64))
+        view = MazeView(generate(10, 10, seed=2), cell_size=4)
+        view.draw(screen)
+        self.assertEqual(screen.get_at((0, 0))[:3], (0, 0, 0))
+        self.assertEqual(screen.get_at((5, 5))[:3], (255, 255, 255))
+
+        view.set_cell(1, 1, PLAYER)
+        view.draw(screen)
+        self.assertEqual(screen.get_at((5, 5))[:3], (255, 255, 0))
+        self.assertEqual(view.grid[1, 1], PLAYER)
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+
+import numpy as np
+
+from jtlgames.pathfinding import SQRT2, PathFinder
+
+
+def path_cost(path):
+    return sum(SQRT2 if a[0] != b[0] and a[1] != b[1] else 1 for a, b in zip(path, path[1:]))
+
+
+class TestPathFinder(unittest.TestCase):
+    """Tests for the grid path finders."""
+
+    def setUp(self):
+        # A 30x20 room with a wall down the middle and a gap at the bottom
+        self.grid = np.zeros((30, 20), dtype=bool)
+        self.grid[15, :17] = True
+
+    def test_astar(self):
+        finder = PathFinder(self.grid)
+        path = finder.astar((0, 0), (29, 0))
+        self.assertEqual(path[0], (0, 0))
+        self.assertEqual(path[-1], (29, 0))
+        self.assertEqual(len(path) - 1, 29 + 2 * 17)
+        self.assertIn((15, 17), path)
+        self.assertIsNone(finder.astar((0, 0), (15, 0)))
+
+        self.grid[15, :] = True
+        self.assertIsNone(PathFinder(self.grid).astar((0, 0), (29, 0)))
+
+    def test_jps(self):
+        finder = PathFinder(self.grid, diagonal=True)
+        rng = np.random.default_rng(3)
+        for _ in range(50):
+            start, goal = (tuple(int(v) for v in rng.integers(0, (30, 20))) for _ in range(2))
+            a, j = finder.astar(start, goal), finder.jps(start, goal)
+            self.assertEqual(a is None, j is None)
+            if a is not None:
+                self.assertAlmostEqual(path_cost(a), path_cost(j))
+                self.assertEqual((j[0], j[-1]), (start, goal))
+
+        with self.assertRaises(ValueError):
+            PathFinder(self.grid).jps((0, 0), (1, 1))
+
+    def test_flow_field(self):
+        finder = PathFinder(self.grid)
+        field = finder.flow_field((29, 0))
+        self.assertEqual(field.distance[0, 0], 29 + 2 * 17)
+        self.assertEqual(field.distance[15, 0], -1)
+        self.assertEqual(field.path((0, 0)), finder.flow_field((29, 0)).path((0, 0)))
+        self.assertEqual(len(field.path((0, 0))), len(finder.astar((0, 0), (29, 0))))
+
+        steps = field.next_steps(np.array([[28, 0], [15, 0]]))
+        self.assertEqual(steps.tolist(), [[29, 0], [15, 0]])
+
+    def test_numpy_positions(self):
+        # Positions taken from arrays have NumPy ints in them
+        start, goal = np.array([0, 0]), np.array([29, 0])
+        diagonal = PathFinder(self.grid, diagonal=True)
+        expected = diagonal.jps((0, 0), (29, 0))
+        self.assertEqual(diagonal.jps(start, goal), expected)
+        self.assertEqual(diagonal.astar(start, goal), diagonal.astar((0, 0), (29, 0)))
+        self.assertEqual(diagonal.path(start, goal), expected)
+        self.assertIs(diagonal.path((0, 0), (29, 0)), diagonal.path(start, goal))
+        self.assertTrue(all(type(x) is int for cell in expected for x in cell))
+
+        field = PathFinder(self.grid).flow_field(goal)
+        self.assertEqual(field.path(start), field.path((0, 0)))
+
+    def test_cache(self):
+        finder = PathFinder(self.grid)
+        path = finder.path((0, 0), (5, 5))
+        expanded = finder.expanded
+        self.assertIs(finder.path((0, 0), (5, 5)), path)
+        self.assertEqual(finder.expanded, expanded)
+
+        # A change far from the search keeps the path, one on it drops it
+        finder.update((25, 10, 2, 2))
+        self.assertIs(finder.path((0, 0), (5, 5)), path)
+        finder.set_blocked(path[3])
+        new_path = finder.path((0, 0), (5, 5))
+        self.assertNotIn(path[3], new_path)
+
+        # Opening the wall gives a shorter way through
+        long_way = finder.path((14, 0), (16, 0))
+        finder.set_blocked((15, 0), False)
+        self.assertEqual(finder.path((14, 0), (16, 0)), [(14, 0), (15, 0), (16, 0)])
+        self.assertGreater(len(long_way), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+import pygame
+
+from jtlgames.pixelscreen import PixelScreen
+
+
+class TestPixelScreen(unittest.TestCase):
+    """Tests for the scaled low resolution screen."""
+
+    def setUp(self):
+        pygame.init()
+
+    def test_nearest(self):
+        pixels = PixelScreen((8, 6), scale=4)
+        self.assertEqual(pixels.surface.get_size(), (8, 6))
+        self.assertEqual(pixels.window.get_size(), (32, 24))
+
+        pixels.surface.fill((0, 0, 0))
+        pixels.surface.set_at((1, 2), (255, 0, 0))
+        pixels.present()
+
+        # The pixel became a 4 x 4 block
+        self.assertEqual(pixels.window.get_at((4, 8))[:3], (255, 0, 0))
+        self.assertEqual(pixels.window.get_at((7, 11))[:3], (255, 0, 0))
+        self.assertEqual(pixels.window.get_at((8, 11))[:3], (0, 0, 0))
+        self.assertEqual(pixels.window.get_at((3, 8))[:3], (0, 0, 0))
+
+        self.assertEqual(pixels.to_surface((7, 11)), (1, 2))
+
+    def test_scale2x(self):
+        pixels = PixelScreen((8, 6), scale=4, mode='scale2x')
+        self.assertEqual([s.get_size() for s in pixels._doubled], [(16, 12)])
+
+        pixels.surface.fill((0, 0, 0))
+        pixels.surface.fill((0, 255, 0), (2, 2, 3, 3))
+        pixels.present()
+
+        self.assertEqual(pixels.window.get_size(), (32, 24))
+        self.assertEqual(pixels.window.get_at((13, 13))[:3], (0, 255, 0))
+        self.assertEqual(pixels.window.get_at((2, 2))[:3], (0, 0, 0))
+
+        with self.assertRaises(ValueError):
+            PixelScreen((8, 6), scale=3, mode='scale2x')
+
+    def test_scaled(self):
+        pixels = PixelScreen((8, 6), scale=4, mode='scaled')
+        self.assertEqual(pixels.surface.get_size(), (8, 6))
+        pixels.present()
+        if pixels.mode == 'scaled':
+            self.assertIs(pixels.surface, pixels.window)
+            self.assertEqual(pixels.to_surface((3, 4)), (3, 4))
+        else:
+            # No renderer, as with the dummy video driver
+            self.assertEqual(pixels.mode, 'nearest')
+            self.assertEqual(pixels.window.get_size(), (32, 24))
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            PixelScreen((8, 6), mode='bilinear')
+        with self.assertRaises(ValueError):
+            PixelScreen((8, 6), scale=1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+from jtlgames.sheetinfo import analyze_sheet, audit, detect_axis
+
+
+class TestSheetInfo(unittest.TestCase):
+    """Tests for the headless spritesheet analysis."""
+
+    def setUp(self):
+        pygame.init()
+
+        # 5x3 cells of 16x16 starting at (2, 1), each holding a 10x10 sprite.
+        # Cells 3 and 7 are the same frame, cell 4 is empty.
+        sheet = pygame.Surface((2 + 5 * 16, 1 + 3 * 16), pygame.SRCALPHA)
+        sheet.fill((0, 0, 0, 0))
+        for index in range(15):
+            if index == 4:
+                continue
+            color = (200, 100, 0, 255) if index in (3, 7) else (index * 15, 255 - index * 15, 80, 255)
+            row, col = divmod(index, 5)
+            sheet.fill(color, pygame.Rect(2 + col * 16 + 3, 1 + row * 16 + 3, 10, 10))
+
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.dir.name)
+        (self.path / 'sub').mkdir()
+        self.filename = self.path / 'sub' / 'sheet.png'
+        pygame.image.save(sheet, str(self.filename))
+
+    def tearDown(self):
+        self.dir.cleanup()
+        pygame.quit()
+
+    def test_detect_axis(self):
+        filled = np.zeros(64, dtype=bool)
+        for start in (4, 20, 36, 52):
+            filled[start:start + 8] = True
+        self.assertEqual(detect_axis(filled), (16, 0))
+        self.assertEqual(detect_axis(np.ones(40, dtype=bool)), (40, 0))
+
+    def test_analyze(self):
+        info = analyze_sheet(self.filename)
+        self.assertEqual(info['cellsize'], [16, 16])
+        self.assertEqual(info['offset'], [2, 1])
+        self.assertEqual(info['grid'], [5, 3])
+        self.assertEqual(info['empty'], [4])
+        self.assertEqual(info['duplicates'], [[3, 7]])
+        self.assertIsNone(info['hashes'][4])
+        self.assertEqual(info['stored_pixels'], 13 * 10 * 10)
+        self.assertEqual(info['cell_pixels'], 15 * 16 * 16)
+
+        info = analyze_sheet(self.filename, cellsize=(16, 16))
+        self.assertEqual(info['offset'], [0, 0])
+        self.assertFalse(info['detected'])
+
+    def test_opaque_background(self):
+        # The same sheet, with an alpha channel that is opaque everywhere over a
+        # solid blue background, as many sheets are drawn
+        sheet = pygame.image.load(str(self.filename))
+        solid = pygame.Surface(sheet.get_size(), pygame.SRCALPHA)
+        solid.fill((0, 0, 139, 255))
+        solid.blit(sheet, (0, 0))
+        filename = self.path / 'solid.png'
+        pygame.image.save(solid, str(filename))
+
+        info = analyze_sheet(filename)
+        self.assertEqual(info['cellsize'], [16, 16])
+        self.assertEqual(info['offset'], [2, 1])
+        self.assertEqual(info['grid'], [5, 3])
+        self.assertEqual(info['empty'], [4])
+        self.assertEqual(info['duplicates'], [[3, 7]])
+
+    def test_audit(self):
+        (self.path / 'broken.png').write_text('not an image')
+        manifest_path = self.path / 'manifest.json'
+        audit(self.path, manifest_path, contact_dir=self.path / 'contact', workers=2)
+
+        manifest = json.loads(manifest_path.read_text())
+        sheets = {s['file']: s for s in manifest['sheets']}
+        self.assertIn('error', sheets['broken.png'])
+        self.assertEqual(sheets['sub/sheet.png']['duplicates'], [[3, 7]])
+        self.assertTrue(Path(sheets['sub/sheet.png']['contact_sheet']).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pygame
+
+from jtlgames.show import SpriteShow
+
+
+class TestSpriteShow(unittest.TestCase):
+    """Tests for the SpriteShow viewer."""
+
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.display.set_mode((600, 600))
+
+        # 10 x 100 cells of 16x16
+        self.dir = tempfile.TemporaryDirectory()
+        filename = Path(self.dir.name) / 'sheet.png'
+        pygame.image.save(pygame.Surface((160, 1600)), str(filename))
+        self.show = SpriteShow(self.screen, filename, (16, 16))
+
+    def tearDown(self):
+        self.dir.cleanup()
+        pygame.quit()
+
+    def key(self, key):
+        return self.show.handle_event(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+    def test_draws_one_page(self):
+        show = self.show
+        self.assertEqual(show.cols, 11)
+        self.assertEqual(show.page_rows, 11)
+        show.draw()
+        self.assertEqual(len(show._cells), 121)
+        self.assertEqual(list(show.visible_indices())[-1], 120)
+
+    def test_scroll(self):
+        show = self.show
+        self.key(pygame.K_PAGEDOWN)
+        self.assertEqual(show.top_row, 11)
+        self.assertEqual(show.sprite_pos(11 * 11), (20, 20))
+        self.key(pygame.K_END)
+        self.assertEqual(show.top_row, show.total_rows - show.page_rows)
+        self.assertEqual(list(show.visible_indices())[-1], 999)
+        self.key(pygame.K_HOME)
+        self.assertEqual(show.top_row, 0)
+        show.handle_event(pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-2))
+        self.assertEqual(show.top_row, 2)
+
+    def test_cache_is_bounded(self):
+        show = self.show
+        page = show.page_rows * show.cols
+        for _ in range(show.total_rows):
+            show.draw()
+            self.assertLessEqual(len(show._cells), 3 * page)
+            self.assertLessEqual(len(show._labels), 3 * page)
+            self.key(pygame.K_DOWN)
+
+        # Scrolling back a little uses the cells still cached
+        show.draw()
+        self.key(pygame.K_UP)
+        cached = dict(show._cells)
+        show.draw()
+        self.assertEqual(show._cells, cached)
+
+    def test_zoom(self):
+        show = self.show
+        show.draw()
+        self.key(pygame.K_MINUS)
+        self.assertEqual(show.zoom, 1)
+        self.assertEqual(show._cells, {})
+        show.draw()
+        self.assertEqual(show.cell_image(0).get_size(), (16, 16))
+        self.key(pygame.K_MINUS)
+        self.assertEqual(show.zoom, 1)
+
+    def test_quit(self):
+        self.assertFalse(self.key(pygame.K_ESCAPE))
+        self.assertFalse(self.show.handle_event(pygame.event.Event(pygame.QUIT)))
+
+
+if __name__ == "__main__":
+    unittest.main()
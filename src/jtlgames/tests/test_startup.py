@@ -0,0 +1,59 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from jtlgames.startup import benchmark, compare, parse_importtime
+
+IMPORTTIME = '''import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        420 | io
+import time:      1500 |       2500 | pygame
+'''
+
+GAME = '''
+import pygame
+
+def main():
+    screen = pygame.display.set_mode((64, 64))
+    pygame.display.flip()
+
+if __name__ == "__main__":
+    main()
+'''
+
+
+class TestStartup(unittest.TestCase):
+    """Tests for the startup benchmark."""
+
+    def test_parse_and_compare(self):
+        total, top = parse_importtime(IMPORTTIME)
+        self.assertEqual(total, 2.92)
+        self.assertEqual(top, [('pygame', 2.5), ('io', 0.42)])
+
+        baseline = {'game.py': {'import_ms': 200, 'first_frame_ms': 300, 'importtime_ms': 150}}
+        results = {'game.py': {'import_ms': 215, 'first_frame_ms': 400, 'importtime_ms': None},
+                   'new.py': {'import_ms': 900, 'first_frame_ms': None, 'importtime_ms': 800}}
+        self.assertEqual(compare(results, baseline, threshold=0.25), [('game.py', 'first_frame_ms', 300, 400)])
+        self.assertEqual(compare(results, baseline, threshold=0.25, min_ms=200), [])
+
+    def test_benchmark(self):
+        with tempfile.TemporaryDirectory() as d:
+            (Path(d) / 'lessons').mkdir()
+            (Path(d) / 'lessons' / 'game.py').write_text(GAME)
+            (Path(d) / 'lessons' / 'eager.py').write_text(GAME.replace('if __name__ == "__main__":\n', 'if True:\n'))
+
+            result = benchmark('lessons/game.py', root=d, repeat=1)
+            self.assertFalse(result['draws_on_import'])
+            # They come from separate runs of the script, so which one is faster is noise
+            self.assertIsInstance(result['import_ms'], float)
+            self.assertIsInstance(result['first_frame_ms'], float)
+            self.assertIn('pygame', [name for name, _ in result['slowest_imports']])
+            self.assertTrue(benchmark('lessons/eager.py', root=d, repeat=1)['draws_on_import'])
+
+        result = benchmark('json', repeat=1)
+        self.assertGreater(result['import_ms'], 0)
+        self.assertIsNone(result['first_frame_ms'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import csv
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from jtlgames.sweep import load_session, parameter_sets, parse_grid, parse_ranges, sweep
+
+SESSION = '''
+def sweep_session(params, seed):
+    return {'score': params['SPEED'] * 10 + seed, 'steps': seed}
+'''
+
+
+class TestSweep(unittest.TestCase):
+    """Tests for the parameter sweep runner."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.dir.name)
+        (self.path / 'game_sim.py').write_text(SESSION)
+        self.target = f"{self.path / 'game_sim.py'}:sweep_session"
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_parse(self):
+        self.assertEqual(parse_grid(['A=1,2', 'B=0.5']), {'A': [1, 2], 'B': [0.5]})
+        self.assertEqual(parse_ranges(['A=1:5']), {'A': (1, 5)})
+        with self.assertRaises(ValueError):
+            parse_ranges(['A=1'])
+
+    def test_parameter_sets(self):
+        sets = parameter_sets({'A': [1, 2], 'B': [3, 4]})
+        self.assertEqual(len(sets), 4)
+        self.assertIn({'A': 2, 'B': 3}, sets)
+
+        sets = parameter_sets({'A': [1]}, {'C': (0, 10)}, samples=5, seed=3)
+        self.assertEqual(len(sets), 5)
+        self.assertTrue(all(isinstance(s['C'], int) and 0 <= s['C'] <= 10 for s in sets))
+        self.assertEqual(sets, parameter_sets({'A': [1]}, {'C': (0, 10)}, samples=5, seed=3))
+
+    def test_sweep_and_resume(self):
+        runs = self.path / 'runs.csv'
+        sets = parameter_sets({'SPEED': [1, 2]})
+        summary = sweep(self.target, sets, [0, 1], runs, workers=1)
+
+        by_speed = {row['SPEED']: row for row in summary}
+        self.assertEqual(by_speed['1']['runs'], 2)
+        self.assertEqual(by_speed['1']['score_mean'], 10.5)
+        self.assertEqual(by_speed['2']['score_max'], 21.0)
+        self.assertTrue((self.path / 'runs_summary.csv').exists())
+
+        # Running again with more seeds only runs the new ones
+        sweep(self.target, sets, [0, 1, 2], runs, workers=1)
+        with runs.open() as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(len({(r['SPEED'], r['seed']) for r in rows}), 6)
+
+    def test_resume_after_half_written_row(self):
+        runs = self.path / 'runs.csv'
+        sets = parameter_sets({'SPEED': [1]})
+        sweep(self.target, sets, [0, 1, 2], runs, workers=1)
+        # Cut the last row off in the middle, as if the sweep had been killed while writing it
+        text = runs.read_text()
+        runs.write_text(text[:text.rstrip().rfind('\n') + 4])
+
+        summary = sweep(self.target, sets, [0, 1, 2], runs, workers=1)
+        self.assertEqual(summary[0]['runs'], 3)
+        self.assertEqual(summary[0]['score_max'], 12.0)
+        with runs.open() as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(sorted(r['seed'] for r in rows), ['0', '1', '2'])
+
+    def test_load_session_restores_path(self):
+        (self.path / 'config.py').write_text('SPEED = 3\n')
+        (self.path / 'uses_config.py').write_text(
+            'import config\n\ndef sweep_session(params, seed):\n    return {"speed": config.SPEED}\n')
+        path = list(sys.path)
+        session = load_session(f"{self.path / 'uses_config.py'}:sweep_session")
+        self.assertEqual(sys.path, path)
+        self.assertNotIn('config', sys.modules)
+        self.assertEqual(session({}, 0), {'speed': 3})
+
+    def test_mismatched_runs_file(self):
+        runs = self.path / 'runs.csv'
+        sweep(self.target, parameter_sets({'SPEED': [1]}), [0], runs, workers=1)
+        with self.assertRaises(ValueError):
+            sweep(self.target, [{'OTHER': 1}], [0], runs, workers=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pygame
+
+from jtlgames.spritesheet import SpriteSheet
+from jtlgames.tilemap import TileMap
+
+
+class TestTileMap(unittest.TestCase):
+    """Tests for the TileMap class."""
+
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((64, 64))
+
+        # A 4x1 sheet of 8x8 tiles, each a different colour
+        self.colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)]
+        sheet = pygame.Surface((32, 8))
+        for i, color in enumerate(self.colors):
+            sheet.fill(color, pygame.Rect(i * 8, 0, 8, 8))
+        self.dir = tempfile.TemporaryDirectory()
+        filename = Path(self.dir.name) / 'tiles.png'
+        pygame.image.save(sheet, str(filename))
+
+        self.ss = SpriteSheet(filename, (8, 8))
+        self.tiles = [[(col + row) % 4 for col in range(100)] for row in range(60)]
+        self.map = TileMap(self.ss, self.tiles, chunk_size=(4, 4), cache_size=8)
+
+    def tearDown(self):
+        self.dir.cleanup()
+        pygame.quit()
+
+    def test_size(self):
+        self.assertEqual(self.map.size, (800, 480))
+        self.assertEqual(self.map.chunk_pixels, (32, 32))
+
+    def test_draw(self):
+        screen = pygame.Surface((64, 64))
+        self.map.draw(screen, pygame.Rect(8, 16, 64, 64))
+        # World pixel (8, 16) is tile (1, 2)
+        self.assertEqual(screen.get_at((0, 0))[:3], self.colors[3])
+        self.assertEqual(screen.get_at((63, 63))[:3], self.colors[(8 + 9) % 4])
+
+    def test_visible_chunks(self):
+        self.assertEqual(len(self.map.visible_chunks(pygame.Rect(0, 0, 64, 64))), 4)
+        self.assertEqual(len(self.map.visible_chunks(pygame.Rect(16, 16, 64, 64))), 9)
+        self.assertEqual(self.map.visible_chunks(pygame.Rect(-100, -100, 50, 50)), [])
+
+    def test_cache(self):
+        screen = pygame.Surface((64, 64))
+        camera = pygame.Rect(0, 0, 64, 64)
+        self.map.draw(screen, camera)
+        self.map.draw(screen, camera)
+        self.assertEqual(self.map.chunks_rendered, 4)
+
+        # Scrolling across the whole map keeps the cache bounded
+        for x in range(0, 800, 16):
+            self.map.draw(screen, camera.move(x, 0))
+        self.assertLessEqual(len(self.map._chunks), 8)
+
+    def test_set_tile(self):
+        screen = pygame.Surface((64, 64))
+        camera = pygame.Rect(0, 0, 64, 64)
+        self.map.draw(screen, camera)
+        self.map.set_tile(0, 0, 2)
+        self.map.draw(screen, camera)
+        self.assertEqual(screen.get_at((0, 0))[:3], self.colors[2])
+        self.assertEqual(self.map.chunks_rendered, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import random
+import unittest
+
+from jtlgames.timers import SimulatedClock, TimerWheel
+
+
+class TestTimerWheel(unittest.TestCase):
+    """Tests for the timer wheel."""
+
+    def setUp(self):
+        self.clock = SimulatedClock()
+        self.timers = TimerWheel(self.clock)
+        self.calls = []
+
+    def call(self, name):
+        self.calls.append((name, self.timers.time))
+
+    def test_after_and_every(self):
+        self.timers.after(400, self.call, 'boom')
+        shoot = self.timers.every(700, self.call, 'shoot')
+        self.timers.after(700, self.call, 'later')
+        self.assertEqual(len(self.timers), 3)
+
+        self.clock.advance(399)
+        self.assertEqual(self.timers.update(), 0)
+        self.clock.advance(1)
+        self.assertEqual(self.timers.update(), 1)
+
+        # Both timers due at 700 are called, in the order they were added
+        self.clock.advance(1100)
+        self.timers.update()
+        self.assertEqual(self.calls, [('boom', 400), ('shoot', 700), ('later', 700), ('shoot', 1400)])
+
+        # A cancelled timer is not called again, and changing the interval applies from the next call
+        shoot.interval = 100
+        self.clock.advance(700)
+        self.timers.update()
+        self.assertEqual(self.calls[-2:], [('shoot', 2100), ('shoot', 2200)])
+        shoot.cancel()
+        self.clock.advance(1000)
+        self.assertEqual(self.timers.update(), 0)
+        self.assertEqual(len(self.timers), 0)
+
+        with self.assertRaises(ValueError):
+            self.timers.every(0, self.call, 'never')
+
+    def test_callbacks_add_timers(self):
+        def chain(n):
+            self.call(n)
+            if n < 3:
+                self.timers.after(n * 10, chain, n + 1)
+
+        self.timers.after(5, chain, 0)
+        self.clock.advance(100)
+        self.timers.update()
+        # The delay of 0 is called in the same update; the others count from their caller's time
+        self.assertEqual(self.calls, [(0, 5), (1, 5), (2, 15), (3, 35)])
+
+    def test_matches_polling(self):
+        # Timers from milliseconds to days, checked against sorting every call
+        rng = random.Random(3)
+        expected = []
+        timers = []
+        for i in range(2000):
+            delay = rng.choice([rng.randrange(0, 300), rng.randrange(0, 100000), rng.randrange(0, 10 ** 10)])
+            timers.append(self.timers.after(delay, self.call, i))
+            expected.append((delay, i))
+        cancelled = set(rng.sample(range(2000), 200))
+        for i in cancelled:
+            timers[i].cancel()
+
+        now = 0
+        while len(self.timers):
+            now += rng.choice([16, 17, 5000, 10 ** 8])
+            self.timers.update(now)
+        self.assertEqual(self.calls, [(i, delay) for delay, i in sorted(expected) if i not in cancelled])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+import pygame
+
+from jtlgames import vector20
+from jtlgames.vector20 import Vector20Factory
+
+
+class TestVector20(unittest.TestCase):
+    """Tests for the Vector20Factory drawing functions."""
+
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.display.set_mode((400, 300))
+        self.Vector20, self.drawv20, self.draw_grid = Vector20Factory(400, 300, 20)
+
+    def tearDown(self):
+        vector20.clear_caches()
+        pygame.quit()
+
+    def test_draw_grid(self):
+        self.draw_grid(self.screen)
+        self.assertEqual(self.screen.get_at((200, 10))[:3], vector20.GRAY)
+        self.assertEqual(self.screen.get_at((10, 10))[:3], vector20.WHITE)
+
+        # The second call reuses the cached grid and draws the same thing
+        before = pygame.image.tobytes(self.screen, 'RGB')
+        self.screen.fill((0, 0, 0))
+        self.draw_grid(self.screen)
+        self.assertEqual(len(vector20._grids), 1)
+        self.assertEqual(pygame.image.tobytes(self.screen, 'RGB'), before)
+
+    def test_drawv20(self):
+        v = self.Vector20(3, 2)
+        end = self.drawv20(self.screen, self.Vector20(0, 0), v)
+        self.assertEqual(end, pygame.math.Vector2(60, -40))
+
+        self.drawv20(self.screen, self.Vector20(1, 1), v)
+        self.assertEqual(len(vector20._fonts), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()